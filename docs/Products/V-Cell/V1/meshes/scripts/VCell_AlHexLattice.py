@@ -1,11 +1,22 @@
 # ============================================================================
 # VCell_AlHexLattice.py — Standalone Al hexagonal lattice substrate display
-# Multi-body assembly: flat Al slab + hexagonal honeycomb cell array punched
-# through + peripheral frame + tab stub
+# Multi-body assembly: hexagonal honeycomb slab (generated directly, or a flat
+# slab with the cell array punched through) + peripheral frame + tab stub
 # Patent ref: US9929432B2 (structured current collector)
 # Dimensions: 150mm × 80mm × 0.1mm (100μm, display scale 10x Z)
+#
+# Benchmark: blender --background --python VCell_AlHexLattice.py -- --bench
 # ============================================================================
-import bpy, bmesh, math, os
+import os, sys, time
+import numpy as np
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.honeycomb import honeycomb_centers, honeycomb_object
+from voltec_mesh.primitives import cylinder_arrays, mesh_object
+from voltec_mesh.build import (clean_scene, library_material, add_box,
+                               add_hex_prism, bool_op, polish, verify, export,
+                               report)
 
 # --- Dimensions (meters, Z scaled 10x for visual clarity) ---
 L       = 0.150      # Display length (half cell)
@@ -17,10 +28,15 @@ TAB_W   = 0.006
 TAB_T   = T
 
 # Honeycomb parameters (visually accurate hex grid)
-HEX_R    = 0.006     # Hex cell inner radius
+HEX_R    = 0.006     # Hex cell radius
 HEX_WALL = 0.0008    # Wall between cells
-HEX_SP_X = (HEX_R + HEX_WALL) * 2.0
-HEX_SP_Y = (HEX_R + HEX_WALL) * math.sqrt(3)
+
+# Punch mode: "ANALYTIC" generates the perforated slab topology directly,
+# "BATCH" subtracts every cell in one EXACT boolean pass, "SERIAL" runs one
+# boolean per cell (legacy, quadratic in cell count)
+PUNCH_MODE  = "ANALYTIC"
+BENCH_HEX_R = (0.012, 0.006, 0.003, 0.002, 0.001, 0.0005, 0.00025, 0.0001)
+BENCH_LIMIT = 60.0   # s — a mode is dropped from the sweep once it exceeds this
 
 # --- PBR Material: brushed aluminum lattice ---
 MAT_COLOR = (0.78, 0.80, 0.82, 1.0)
@@ -28,134 +44,90 @@ MAT_METAL = 0.95
 MAT_ROUGH = 0.22
 
 # --- Output ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUT_DIR    = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
 OUT_FILE   = os.path.join(OUT_DIR, "VCell_AlHexLattice.glb")
 OBJ_NAME   = "VCell_AlHexLattice"
 
 # ============================================================================
-def clean_scene():
-    bpy.ops.wm.read_factory_settings(use_empty=True)
-    bpy.context.scene.name = "Scene0"
-
-def make_material(name, color, metal, rough):
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Metallic"].default_value   = metal
-    bsdf.inputs["Roughness"].default_value  = rough
-    return mat
-
-def add_box(name, sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def add_hex_prism(name, r, depth, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=r, depth=depth, vertices=6, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
-
-def bool_op(target, cutter, operation="DIFFERENCE"):
-    mod = target.modifiers.new(name="Bool", type="BOOLEAN")
-    mod.operation = operation
-    mod.object    = cutter
-    mod.solver    = "EXACT"
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=mod.name)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
-def join_objects(objs):
-    bpy.ops.object.select_all(action="DESELECT")
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    return bpy.context.active_object
-
-def create_geometry(mat):
-    # --- Main slab ---
-    slab = add_box("hex_slab", L, W, T, loc=(0, 0, 0))
-
-    # --- Punch hexagonal array ---
-    rows = int((W - FRAME_T * 2) / HEX_SP_Y) + 1
-    cols = int((L - FRAME_T * 2) / HEX_SP_X) + 1
-    cutters = []
-    for row in range(rows):
-        for col in range(cols):
-            cx = -L/2 + FRAME_T + col * HEX_SP_X + (row % 2) * (HEX_SP_X / 2)
-            cy = -W/2 + FRAME_T + row * HEX_SP_Y
-            if (abs(cx) < L/2 - FRAME_T - HEX_R and
-                    abs(cy) < W/2 - FRAME_T - HEX_R):
-                cell = add_hex_prism(f"hex_{row}_{col}",
-                                     HEX_R, T * 3,
-                                     loc=(cx, cy, 0))
-                # Rotate 30° so flat sides face up/down
-                cell.rotation_euler[2] = math.radians(30)
-                bpy.ops.object.transform_apply(rotation=True)
-                cutters.append(cell)
-
-    # Apply all boolean cuts
-    for c in cutters:
-        bool_op(slab, c, "DIFFERENCE")
+def hex_centers(hex_r, hex_wall):
+    """Hole centres of the analytic slab, so every punch mode cuts the same
+    lattice"""
+    return honeycomb_centers(L, W, hex_r, hex_wall, FRAME_T)
+
+def add_hex_array(name, centers, r, depth):
+    """All cutter cells as one mesh object, built without operator calls.
+    Pointy-top like the analytic holes (a 6-vertex cylinder starts on +Y)."""
+    verts, (corners, sizes) = cylinder_arrays(r, depth, 6)
+    offsets = np.zeros((len(centers), 1, 3))
+    offsets[:, 0, :2] = centers
+    corners = corners + len(verts) * np.arange(len(centers))[:, None]
+    return mesh_object(name, (verts + offsets).reshape(-1, 3),
+                       (corners.ravel(), np.tile(sizes, len(centers))))
+
+def punch_array(slab, centers, hex_r, mode=PUNCH_MODE):
+    if not len(centers):
+        return
+    if mode == "BATCH":
+        bool_op(slab, add_hex_array("hex_cutters", centers, hex_r, T * 3),
+                "DIFFERENCE")
+        return
+    for i, (cx, cy) in enumerate(centers):
+        cell = add_hex_prism(f"hex_{i}", hex_r, T * 3, loc=(cx, cy, 0))
+        bool_op(slab, cell, "DIFFERENCE")
+
+def hex_slab(hex_r, hex_wall, mode=PUNCH_MODE):
+    if mode == "ANALYTIC":
+        return honeycomb_object("hex_slab", L, W, T, hex_r, hex_wall, FRAME_T)
+    slab = add_box("hex_slab", L, W, T)
+    punch_array(slab, hex_centers(hex_r, hex_wall), hex_r, mode)
+    return slab
+
+def cell_count(hex_r, hex_wall):
+    return len(hex_centers(hex_r, hex_wall))
+
+def create_geometry(mat, hex_r=HEX_R, hex_wall=HEX_WALL, mode=PUNCH_MODE):
+    # --- Hex lattice slab with peripheral frame ---
+    slab = hex_slab(hex_r, hex_wall, mode)
 
     # --- Current collector tab ---
-    tab = add_box("hex_tab", TAB_L, TAB_W, TAB_T,
-                  loc=(L/2 - TAB_L/2, 0, 0))
-    bool_op(slab, tab, "UNION")
+    tab = add_box("hex_tab", TAB_L, TAB_W, TAB_T, loc=(L/2 - TAB_L/2, 0, 0))
+    bool_op(slab, tab)
 
     slab.name = OBJ_NAME
     slab.data.materials.append(mat)
     return slab
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.uv.smart_project(angle_limit=66.0)
-    bpy.ops.object.mode_set(mode="OBJECT")
-    bpy.ops.object.shade_smooth()
-    try:
-        bpy.ops.object.shade_auto_smooth(angle=30.0)
-    except Exception:
-        pass
-
-def verify(obj):
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.verts.ensure_lookup_table()
-    verts = len(bm.verts)
-    faces = len(bm.faces)
-    quads = sum(1 for f in bm.faces if len(f.verts) == 4)
-    nm    = [e for e in bm.edges if not e.is_manifold]
-    bm.free()
-    print(f"[VCell_AlHexLattice] Verts={verts} Faces={faces} "
-          f"Quads={quads/faces*100:.0f}% NM={len(nm)}")
-
-def export_glb(obj):
-    bpy.ops.object.select_all(action="DESELECT")
-    obj.select_set(True)
-    bpy.ops.export_scene.gltf(
-        filepath=OUT_FILE,
-        use_selection=True,
-        export_format="GLB",
-        export_draco_mesh_compression_enable=True,
-    )
-    kb = os.path.getsize(OUT_FILE) / 1024
-    print(f"[VCell_AlHexLattice] Exported → {OUT_FILE} ({kb:.1f} KiB)")
+def bench():
+    """Wall time of the lattice slab vs. cell count for every punch mode.
+    A mode drops out of the sweep once it passes BENCH_LIMIT."""
+    print(f"[VCell_AlHexLattice] {'HEX_R mm':>8} {'mode':>8} {'cells':>7} "
+          f"{'time s':>8} {'faces':>8}")
+    modes = ["ANALYTIC", "BATCH", "SERIAL"]
+    for hex_r in BENCH_HEX_R:
+        wall = hex_r * HEX_WALL / HEX_R
+        for mode in list(modes):
+            clean_scene()
+            t0 = time.perf_counter()
+            slab = hex_slab(hex_r, wall, mode)
+            dt = time.perf_counter() - t0
+            print(f"[VCell_AlHexLattice] {hex_r*1e3:8.2f} {mode:>8} "
+                  f"{cell_count(hex_r, wall):7d} {dt:8.2f} "
+                  f"{len(slab.data.polygons):8d}")
+            if dt > BENCH_LIMIT:
+                modes.remove(mode)
+
+def script_args():
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
 
 # ============================================================================
 if __name__ == "__main__":
+    if "--bench" in script_args():
+        bench()
+        sys.exit(0)
     clean_scene()
-    mat = make_material("MAT_VCell_AlHexLattice", MAT_COLOR, MAT_METAL, MAT_ROUGH)
+    mat = library_material(OUT_FILE, "MAT_VCell_AlHexLattice", MAT_COLOR, MAT_METAL, MAT_ROUGH)
     obj = create_geometry(mat)
     polish(obj)
     verify(obj)
-    export_glb(obj)
+    export(obj, OUT_FILE)
+    report(OBJ_NAME)
@@ -5,7 +5,13 @@
 # Patent ref: US9929432B2 (Na metal anode), US20090068548A1 (tab geometry)
 # Dimensions: 296mm × 96mm × 0.15mm (Na 50μm + Al hex lattice 100μm)
 # ============================================================================
-import bpy, bmesh, math, os
+import os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.honeycomb import honeycomb_object
+from voltec_mesh.build import (clean_scene, alloy_material, add_box,
+                               join_objects, polish, verify, export, report)
 
 # --- Dimensions (meters) ---
 L      = 0.296      # Active area length (housing minus wall*2)
@@ -16,6 +22,9 @@ TAB_L  = 0.012      # Current collector tab length
 TAB_W  = 0.008      # Tab width
 TAB_T  = 0.0002     # Tab thickness
 HEX_A  = 0.00005    # Hex cell edge 50μm (visual representation)
+HEX_R    = 0.006    # Visual hex cell radius (scaled for mesh detail)
+HEX_WALL = 0.0012   # Wall between cells
+FRAME_T  = 0.008    # Solid border around the honeycomb
 
 # --- PBR Materials ---
 NA_COLOR   = (0.85, 0.88, 0.90, 1.0)   # Silvery sodium metal
@@ -26,76 +35,17 @@ AL_METAL   = 0.95
 AL_ROUGH   = 0.20
 
 # --- Output ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUT_DIR    = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
 OUT_FILE   = os.path.join(OUT_DIR, "VCell_Anode.glb")
 OBJ_NAME   = "VCell_Anode"
 
 # ============================================================================
-def clean_scene():
-    bpy.ops.wm.read_factory_settings(use_empty=True)
-    bpy.context.scene.name = "Scene0"
-
-def make_material(name, color, metal, rough):
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Metallic"].default_value   = metal
-    bsdf.inputs["Roughness"].default_value  = rough
-    return mat
-
-def add_box(name, sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def bool_op(target, cutter, operation="DIFFERENCE"):
-    mod = target.modifiers.new(name="Bool", type="BOOLEAN")
-    mod.operation = operation
-    mod.object    = cutter
-    mod.solver    = "EXACT"
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=mod.name)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
-def join_objects(objs):
-    bpy.ops.object.select_all(action="DESELECT")
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    return bpy.context.active_object
-
 def create_geometry(mat_na, mat_al):
     base_z = 0.0
 
-    # --- Al hex lattice substrate ---
-    al_base = add_box("al_lattice", L, W, AL_T,
-                      loc=(0, 0, base_z + AL_T/2))
-
-    # --- Honeycomb texture: punch rows of hexagonal cutouts ---
-    # Represent hex cells as closely-packed cylinders removed from the slab
-    # 5 rows × 8 cols at coarse visual scale (50μm scaled to visible geometry)
-    HEX_R = 0.008   # Visual hex cell radius (scaled for mesh detail)
-    HEX_SP_X = HEX_R * 2.1
-    HEX_SP_Y = HEX_R * 1.82
-    cutters = []
-    rows, cols = 5, 10
-    for row in range(rows):
-        for col in range(cols):
-            cx = -L/2 + 0.02 + col * HEX_SP_X + (row % 2) * HEX_R
-            cy = -W/2 + 0.02 + row * HEX_SP_Y
-            if abs(cx) < L/2 - 0.01 and abs(cy) < W/2 - 0.01:
-                c = add_box(f"hc_{row}_{col}",
-                            HEX_R * 1.2, HEX_R * 1.2, AL_T * 2,
-                            loc=(cx, cy, base_z + AL_T/2))
-                cutters.append(c)
-    for c in cutters:
-        bool_op(al_base, c, "DIFFERENCE")
+    # --- Al hex lattice substrate (honeycomb generated directly) ---
+    al_base = honeycomb_object("al_lattice", L, W, AL_T, HEX_R, HEX_WALL,
+                               FRAME_T, loc=(0, 0, base_z + AL_T/2))
     al_base.data.materials.append(mat_al)
 
     # --- Sodium metal layer on top of lattice ---
@@ -113,49 +63,13 @@ def create_geometry(mat_na, mat_al):
     assembled.name = OBJ_NAME
     return assembled
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.uv.smart_project(angle_limit=66.0)
-    bpy.ops.object.mode_set(mode="OBJECT")
-    bpy.ops.object.shade_smooth()
-    try:
-        bpy.ops.object.shade_auto_smooth(angle=30.0)
-    except Exception:
-        pass
-
-def verify(obj):
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.verts.ensure_lookup_table()
-    verts = len(bm.verts)
-    faces = len(bm.faces)
-    quads = sum(1 for f in bm.faces if len(f.verts) == 4)
-    nm    = [e for e in bm.edges if not e.is_manifold]
-    bm.free()
-    print(f"[VCell_Anode] Verts={verts} Faces={faces} "
-          f"Quads={quads/faces*100:.0f}% NM={len(nm)}")
-
-def export_glb(obj):
-    bpy.ops.object.select_all(action="DESELECT")
-    obj.select_set(True)
-    bpy.ops.export_scene.gltf(
-        filepath=OUT_FILE,
-        use_selection=True,
-        export_format="GLB",
-        export_draco_mesh_compression_enable=True,
-    )
-    kb = os.path.getsize(OUT_FILE) / 1024
-    print(f"[VCell_Anode] Exported → {OUT_FILE} ({kb:.1f} KiB)")
-
 # ============================================================================
 if __name__ == "__main__":
     clean_scene()
-    mat_na = make_material("MAT_VCell_Na", NA_COLOR, NA_METAL, NA_ROUGH)
-    mat_al = make_material("MAT_VCell_AlHex", AL_COLOR, AL_METAL, AL_ROUGH)
+    mat_na = alloy_material("Sodium", "MAT_VCell_Na", NA_COLOR, NA_METAL, NA_ROUGH)
+    mat_al = alloy_material("Aluminum 6061-T6", "MAT_VCell_AlHex", AL_COLOR, AL_METAL, AL_ROUGH)
     obj = create_geometry(mat_na, mat_al)
     polish(obj)
     verify(obj)
-    export_glb(obj)
+    export(obj, OUT_FILE)
+    report(OBJ_NAME)
@@ -6,7 +6,13 @@
 #             US20120171568A1 (cell header + end plate assembly)
 # Dimensions: 310mm × 110mm × 20mm end plates, 4x M8 tie rods
 # ============================================================================
-import bpy, bmesh, math, os
+import os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.build import (clean_scene, alloy_material, add_cyl, add_box,
+                               add_hex_prism, bool_op, join_objects, polish,
+                               verify, export, report)
 
 # --- Dimensions (meters) ---
 PLATE_L   = 0.310    # End plate length (housing + clearance)
@@ -31,64 +37,11 @@ ROD_METAL = 1.0
 ROD_ROUGH = 0.35
 
 # --- Output ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUT_DIR    = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
 OUT_FILE   = os.path.join(OUT_DIR, "VCell_CompressionFrame.glb")
 OBJ_NAME   = "VCell_CompressionFrame"
 
 # ============================================================================
-def clean_scene():
-    bpy.ops.wm.read_factory_settings(use_empty=True)
-    bpy.context.scene.name = "Scene0"
-
-def make_material(name, color, metal, rough):
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Metallic"].default_value   = metal
-    bsdf.inputs["Roughness"].default_value  = rough
-    return mat
-
-def add_box(name, sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def add_cylinder(name, r, depth, loc=(0,0,0), rot=(0,0,0), segs=24):
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=r, depth=depth, vertices=segs, location=loc, rotation=rot)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
-
-def add_hex_prism(name, r, depth, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=r, depth=depth, vertices=6, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
-
-def bool_op(target, cutter, operation="DIFFERENCE"):
-    mod = target.modifiers.new(name="Bool", type="BOOLEAN")
-    mod.operation = operation
-    mod.object    = cutter
-    mod.solver    = "EXACT"
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=mod.name)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
-def join_objects(objs):
-    bpy.ops.object.select_all(action="DESELECT")
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    return bpy.context.active_object
-
 ROD_POS = [
     ( ROD_OFFSET_X,  ROD_OFFSET_Y),
     ( ROD_OFFSET_X, -ROD_OFFSET_Y),
@@ -101,17 +54,18 @@ def make_end_plate(name, z_loc, mat_al):
 
     # Counterbored holes for tie rods + bosses
     for i, (rx, ry) in enumerate(ROD_POS):
-        hole = add_cylinder(f"rod_hole_{name}_{i}", ROD_R, PLATE_T * 2,
-                            loc=(rx, ry, z_loc))
+        hole = add_cyl(f"rod_hole_{name}_{i}", ROD_R, PLATE_T * 2,
+                       loc=(rx, ry, z_loc), segs=24)
         bool_op(plate, hole, "DIFFERENCE")
-        boss = add_cylinder(f"boss_{name}_{i}", BOSS_R, PLATE_T * 0.3,
-                            loc=(rx, ry, z_loc + PLATE_T/2 * (1 if "top" in name else -1)))
-        bool_op(plate, boss, "UNION")
+        boss = add_cyl(f"boss_{name}_{i}", BOSS_R, PLATE_T * 0.3,
+                       loc=(rx, ry, z_loc + PLATE_T/2 * (1 if "top" in name else -1)),
+                       segs=24)
+        bool_op(plate, boss)
 
     # Alignment pin holes
     for i, (px, py) in enumerate([(0.12, 0), (-0.12, 0)]):
-        pin_hole = add_cylinder(f"pin_hole_{name}_{i}", PIN_R, PLATE_T * 2,
-                                loc=(px, py, z_loc))
+        pin_hole = add_cyl(f"pin_hole_{name}_{i}", PIN_R, PLATE_T * 2,
+                           loc=(px, py, z_loc), segs=24)
         bool_op(plate, pin_hole, "DIFFERENCE")
 
     # Lightening pockets (rectangular cutouts for mass reduction)
@@ -136,8 +90,8 @@ def create_geometry(mat_al, mat_rod):
 
     # Tie rods
     for i, (rx, ry) in enumerate(ROD_POS):
-        rod = add_cylinder(f"tie_rod_{i}", ROD_R * 0.85, STACK_GAP + PLATE_T * 2,
-                           loc=(rx, ry, 0))
+        rod = add_cyl(f"tie_rod_{i}", ROD_R * 0.85, STACK_GAP + PLATE_T * 2,
+                      loc=(rx, ry, 0), segs=24)
         rod.data.materials.append(mat_rod)
         all_objs.append(rod)
 
@@ -151,8 +105,8 @@ def create_geometry(mat_al, mat_rod):
 
     # Alignment pins protruding from top plate
     for i, (px, py) in enumerate([(0.12, 0), (-0.12, 0)]):
-        pin = add_cylinder(f"align_pin_{i}", PIN_R, PIN_H,
-                           loc=(px, py, top_z + PLATE_T/2 + PIN_H/2))
+        pin = add_cyl(f"align_pin_{i}", PIN_R, PIN_H,
+                      loc=(px, py, top_z + PLATE_T/2 + PIN_H/2), segs=24)
         pin.data.materials.append(mat_al)
         all_objs.append(pin)
 
@@ -160,53 +114,13 @@ def create_geometry(mat_al, mat_rod):
     assembled.name = OBJ_NAME
     return assembled
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.uv.smart_project(angle_limit=66.0)
-    bpy.ops.object.mode_set(mode="OBJECT")
-    bpy.ops.object.shade_smooth()
-    try:
-        bpy.ops.object.shade_auto_smooth(angle=30.0)
-    except Exception:
-        pass
-    mod = obj.modifiers.new("Bevel", "BEVEL")
-    mod.width    = 0.0005
-    mod.segments = 2
-    bpy.ops.object.modifier_apply(modifier=mod.name)
-
-def verify(obj):
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.verts.ensure_lookup_table()
-    verts = len(bm.verts)
-    faces = len(bm.faces)
-    quads = sum(1 for f in bm.faces if len(f.verts) == 4)
-    nm    = [e for e in bm.edges if not e.is_manifold]
-    bm.free()
-    print(f"[VCell_CompressionFrame] Verts={verts} Faces={faces} "
-          f"Quads={quads/faces*100:.0f}% NM={len(nm)}")
-
-def export_glb(obj):
-    bpy.ops.object.select_all(action="DESELECT")
-    obj.select_set(True)
-    bpy.ops.export_scene.gltf(
-        filepath=OUT_FILE,
-        use_selection=True,
-        export_format="GLB",
-        export_draco_mesh_compression_enable=True,
-    )
-    kb = os.path.getsize(OUT_FILE) / 1024
-    print(f"[VCell_CompressionFrame] Exported → {OUT_FILE} ({kb:.1f} KiB)")
-
 # ============================================================================
 if __name__ == "__main__":
     clean_scene()
-    mat_al  = make_material("MAT_VCell_FrameAl", AL_COLOR, AL_METAL, AL_ROUGH)
-    mat_rod = make_material("MAT_VCell_FrameRod", ROD_COLOR, ROD_METAL, ROD_ROUGH)
+    mat_al  = alloy_material("Aluminum 6061-T6", "MAT_VCell_FrameAl", AL_COLOR, AL_METAL, AL_ROUGH)
+    mat_rod = alloy_material("316L Stainless Steel", "MAT_VCell_FrameRod", ROD_COLOR, ROD_METAL, ROD_ROUGH)
     obj = create_geometry(mat_al, mat_rod)
-    polish(obj)
+    polish(obj, bevel=0.0005)
     verify(obj)
-    export_glb(obj)
+    export(obj, OUT_FILE)
+    report(OBJ_NAME)
@@ -4,7 +4,13 @@
 # PCB substrate stub + solder pads
 # Patent ref: US20090068548A1 (cell header components)
 # ============================================================================
-import bpy, bmesh, math, os
+import bpy, os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.build import (clean_scene, make_material, add_cyl, add_box,
+                               add_sphere, bool_op, join_objects, polish,
+                               verify, export, report)
 
 # --- Dimensions (meters) ---
 BEZEL_R    = 0.004    # Bezel outer radius
@@ -32,74 +38,21 @@ PAD_METAL   = 0.80
 PAD_ROUGH   = 0.25
 
 # --- Output ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 OUT_DIR    = os.path.normpath(os.path.join(SCRIPT_DIR, ".."))
 OUT_FILE   = os.path.join(OUT_DIR, "VCell_StatusLED.glb")
 OBJ_NAME   = "VCell_StatusLED"
 
 # ============================================================================
-def clean_scene():
-    bpy.ops.wm.read_factory_settings(use_empty=True)
-    bpy.context.scene.name = "Scene0"
-
-def make_material(name, color, metal, rough):
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Metallic"].default_value   = metal
-    bsdf.inputs["Roughness"].default_value  = rough
-    return mat
-
-def add_box(name, sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def add_cylinder(name, r, depth, loc=(0,0,0), segs=24):
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius=r, depth=depth, vertices=segs, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
-
-def add_sphere(name, r, loc=(0,0,0), segs=16):
-    bpy.ops.mesh.primitive_uv_sphere_add(
-        radius=r, segments=segs, ring_count=segs//2, location=loc)
-    obj = bpy.context.active_object
-    obj.name = name
-    return obj
-
-def bool_op(target, cutter, operation="DIFFERENCE"):
-    mod = target.modifiers.new(name="Bool", type="BOOLEAN")
-    mod.operation = operation
-    mod.object    = cutter
-    mod.solver    = "EXACT"
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=mod.name)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
-def join_objects(objs):
-    bpy.ops.object.select_all(action="DESELECT")
-    for o in objs:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objs[0]
-    bpy.ops.object.join()
-    return bpy.context.active_object
-
 def create_geometry(mat_bezel, mat_lens, mat_pcb, mat_pad):
     # --- PCB substrate ---
-    pcb = add_box("led_pcb", PCB_L, PCB_W, PCB_T, loc=(0, 0, 0))
+    pcb = add_box("led_pcb", PCB_L, PCB_W, PCB_T)
     pcb.data.materials.append(mat_pcb)
 
     # --- Bezel ring (cylinder with hollow center) ---
-    bezel_outer = add_cylinder("bezel_outer", BEZEL_R, BEZEL_T,
-                               loc=(0, 0, PCB_T/2 + BEZEL_T/2))
-    inner_cut = add_cylinder("bezel_inner_cut", LENS_R + 0.0002, BEZEL_T * 2,
-                             loc=(0, 0, PCB_T/2 + BEZEL_T/2))
+    bezel_outer = add_cyl("bezel_outer", BEZEL_R, BEZEL_T,
+                          loc=(0, 0, PCB_T/2 + BEZEL_T/2), segs=24)
+    inner_cut = add_cyl("bezel_inner_cut", LENS_R + 0.0002, BEZEL_T * 2,
+                        loc=(0, 0, PCB_T/2 + BEZEL_T/2), segs=24)
     bool_op(bezel_outer, inner_cut, "DIFFERENCE")
     bezel_outer.data.materials.append(mat_bezel)
 
@@ -113,8 +66,8 @@ def create_geometry(mat_bezel, mat_lens, mat_pcb, mat_pad):
 
     # --- 2 solder pads on PCB surface ---
     for sign in [-1, +1]:
-        pad = add_cylinder(f"solder_pad_{sign}", PAD_R, PAD_T,
-                           loc=(sign * 0.003, 0, PCB_T/2 + PAD_T/2))
+        pad = add_cyl(f"solder_pad_{sign}", PAD_R, PAD_T,
+                      loc=(sign * 0.003, 0, PCB_T/2 + PAD_T/2), segs=24)
         pad.data.materials.append(mat_pad)
 
     all_objs = [pcb, bezel_outer, dome] + [
@@ -123,43 +76,6 @@ def create_geometry(mat_bezel, mat_lens, mat_pcb, mat_pad):
     assembled.name = OBJ_NAME
     return assembled
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.mode_set(mode="EDIT")
-    bpy.ops.mesh.select_all(action="SELECT")
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.uv.smart_project(angle_limit=66.0)
-    bpy.ops.object.mode_set(mode="OBJECT")
-    bpy.ops.object.shade_smooth()
-    try:
-        bpy.ops.object.shade_auto_smooth(angle=30.0)
-    except Exception:
-        pass
-
-def verify(obj):
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.verts.ensure_lookup_table()
-    verts = len(bm.verts)
-    faces = len(bm.faces)
-    quads = sum(1 for f in bm.faces if len(f.verts) == 4)
-    nm    = [e for e in bm.edges if not e.is_manifold]
-    bm.free()
-    print(f"[VCell_StatusLED] Verts={verts} Faces={faces} "
-          f"Quads={quads/faces*100:.0f}% NM={len(nm)}")
-
-def export_glb(obj):
-    bpy.ops.object.select_all(action="DESELECT")
-    obj.select_set(True)
-    bpy.ops.export_scene.gltf(
-        filepath=OUT_FILE,
-        use_selection=True,
-        export_format="GLB",
-        export_draco_mesh_compression_enable=True,
-    )
-    kb = os.path.getsize(OUT_FILE) / 1024
-    print(f"[VCell_StatusLED] Exported → {OUT_FILE} ({kb:.1f} KiB)")
-
 # ============================================================================
 if __name__ == "__main__":
     clean_scene()
@@ -170,4 +86,5 @@ if __name__ == "__main__":
     obj = create_geometry(mat_bezel, mat_lens, mat_pcb, mat_pad)
     polish(obj)
     verify(obj)
-    export_glb(obj)
+    export(obj, OUT_FILE)
+    report(OBJ_NAME)
@@ -8,7 +8,13 @@ access inspection port, support frame legs.
 
 Run: blender --background --python this_script.py
 """
-import bpy, bmesh, math, os
+import bpy, math, os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.build import (clean_scene, library_material, add_cyl, add_cone,
+                               add_box, bool_op, polish, verify, export,
+                               report)
 
 PRODUCT   = "VIncinerator"
 COMPONENT = "AshHopper"
@@ -43,62 +49,12 @@ PBR = {
     "emission_strength": 0.0,
 }
 
-def clean_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for b in bpy.data.meshes:
-        if b.users == 0: bpy.data.meshes.remove(b)
-    for b in bpy.data.materials:
-        if b.users == 0: bpy.data.materials.remove(b)
-
-def setup_scene():
-    bpy.context.scene.name = "Scene0"
-    bpy.context.scene.unit_settings.system = 'METRIC'
-    bpy.context.scene.unit_settings.scale_length = 1.0
-
-def create_material():
-    mat = bpy.data.materials.new(name=f"MAT_{PRODUCT}_{MATERIAL}")
-    mat.use_nodes = True; mat.use_backface_culling = True
-    nodes = mat.node_tree.nodes; links = mat.node_tree.links; nodes.clear()
-    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-    bsdf.inputs['Base Color'].default_value = PBR["base_color"]
-    bsdf.inputs['Metallic'].default_value = PBR["metallic"]
-    bsdf.inputs['Roughness'].default_value = PBR["roughness"]
-    bsdf.inputs['Alpha'].default_value = PBR["alpha"]
-    bsdf.inputs['Emission Color'].default_value = PBR["emission"]
-    bsdf.inputs['Emission Strength'].default_value = PBR["emission_strength"]
-    out = nodes.new('ShaderNodeOutputMaterial'); out.location = (300, 0)
-    links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
-    return mat
-
-def add_cube(sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=loc)
-    obj = bpy.context.active_object; obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def add_cyl(r, d, v=32, loc=(0,0,0), rot=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(vertices=v, radius=r, depth=d,
-                                        location=loc, rotation=rot)
-    return bpy.context.active_object
-
-def add_cone(r1, r2, d, v=32, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cone_add(vertices=v, radius1=r1, radius2=r2,
-                                     depth=d, location=loc)
-    return bpy.context.active_object
-
-def bool_op(target, cutter, op='UNION'):
-    mod = target.modifiers.new(op, 'BOOLEAN')
-    mod.operation = op; mod.object = cutter; mod.solver = 'EXACT'
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=op)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
 def create_geometry():
     """Ash hopper with taper, gate valve, vibrator bracket, legs."""
 
     # 1) Upper rectangular section — hollow box
-    upper = add_cube(TOP_W, TOP_D, TOP_H, (0, 0, TAPER_H/2 + TOP_H/2))
+    upper = add_box("upper", TOP_W, TOP_D, TOP_H,
+                    loc=(0, 0, TAPER_H/2 + TOP_H/2))
     sol = upper.modifiers.new("Hollow", 'SOLIDIFY')
     sol.thickness = WALL; sol.offset = -1
     bpy.context.view_layer.objects.active = upper
@@ -106,109 +62,82 @@ def create_geometry():
 
     # 2) Tapered section — cone from rectangular-ish to circular discharge
     # Approximate with a cone (wider base → narrow top mapped to wider top → narrow bottom)
-    taper = add_cone(max(TOP_W, TOP_D)/2, BOT_R, TAPER_H, 32, (0, 0, 0))
+    taper = add_cone("taper", max(TOP_W, TOP_D)/2, BOT_R, TAPER_H, segs=32)
     sol2 = taper.modifiers.new("Hollow", 'SOLIDIFY')
     sol2.thickness = WALL; sol2.offset = -1
     bpy.context.view_layer.objects.active = taper
     bpy.ops.object.modifier_apply(modifier="Hollow")
-    bool_op(upper, taper, 'UNION')
+    bool_op(upper, taper)
 
     # 3) Top flange
-    flange = add_cube(FLANGE_W, FLANGE_D, FLANGE_H,
-                       (0, 0, TAPER_H/2 + TOP_H + FLANGE_H/2))
-    fl_hole = add_cube(TOP_W - 0.02, TOP_D - 0.02, FLANGE_H + 0.01,
-                        (0, 0, TAPER_H/2 + TOP_H + FLANGE_H/2))
+    flange = add_box("flange", FLANGE_W, FLANGE_D, FLANGE_H,
+                     loc=(0, 0, TAPER_H/2 + TOP_H + FLANGE_H/2))
+    fl_hole = add_box("fl_hole", TOP_W - 0.02, TOP_D - 0.02, FLANGE_H + 0.01,
+                      loc=(0, 0, TAPER_H/2 + TOP_H + FLANGE_H/2))
     bool_op(flange, fl_hole, 'DIFFERENCE')
-    bool_op(upper, flange, 'UNION')
+    bool_op(upper, flange)
 
     # 4) Discharge nozzle at bottom
-    discharge = add_cyl(BOT_R, 0.12, 24, (0, 0, -TAPER_H/2 - 0.06))
-    d_col = add_cyl(BOT_R + 0.03, 0.02, 24, (0, 0, -TAPER_H/2 - 0.12))
-    bool_op(discharge, d_col, 'UNION')
-    bool_op(upper, discharge, 'UNION')
+    discharge = add_cyl("discharge", BOT_R, 0.12,
+                        loc=(0, 0, -TAPER_H/2 - 0.06), segs=24)
+    d_col = add_cyl("d_col", BOT_R + 0.03, 0.02, loc=(0, 0, -TAPER_H/2 - 0.12),
+                    segs=24)
+    bool_op(discharge, d_col)
+    bool_op(upper, discharge)
 
     # 5) Slide gate valve housing at discharge
-    gate = add_cube(GATE_W, GATE_D, GATE_H,
-                     (0, BOT_R + GATE_D/2, -TAPER_H/2 - 0.06))
-    bool_op(upper, gate, 'UNION')
+    gate = add_box("gate", GATE_W, GATE_D, GATE_H,
+                   loc=(0, BOT_R + GATE_D/2, -TAPER_H/2 - 0.06))
+    bool_op(upper, gate)
 
     # 6) Vibrator motor bracket (on taper wall)
-    vibr = add_cube(VIBR_W, VIBR_D, VIBR_H,
-                     (TOP_W/3, TOP_D/3 + VIBR_D/2, TAPER_H/4))
-    bool_op(upper, vibr, 'UNION')
+    vibr = add_box("vibr", VIBR_W, VIBR_D, VIBR_H,
+                   loc=(TOP_W/3, TOP_D/3 + VIBR_D/2, TAPER_H/4))
+    bool_op(upper, vibr)
 
     # 7) Inspection port (side of upper section)
-    insp = add_cyl(0.08, 0.06, 24,
-                    (TOP_W/2 + 0.03, 0, TAPER_H/2 + TOP_H/2),
-                    (0, math.pi/2, 0))
-    insp_col = add_cyl(0.10, 0.015, 24,
-                        (TOP_W/2 + 0.06, 0, TAPER_H/2 + TOP_H/2),
-                        (0, math.pi/2, 0))
-    bool_op(insp, insp_col, 'UNION')
-    bool_op(upper, insp, 'UNION')
+    insp = add_cyl("insp", 0.08, 0.06,
+                   loc=(TOP_W/2 + 0.03, 0, TAPER_H/2 + TOP_H/2),
+                   rot=(0, math.pi/2, 0), segs=24)
+    insp_col = add_cyl("insp_col", 0.10, 0.015,
+                       loc=(TOP_W/2 + 0.06, 0, TAPER_H/2 + TOP_H/2),
+                       rot=(0, math.pi/2, 0), segs=24)
+    bool_op(insp, insp_col)
+    bool_op(upper, insp)
 
     # 8) Support frame legs (4 at corners)
     total_h = TAPER_H + TOP_H
     for cx in [-TOP_W/2 + LEG_SZ, TOP_W/2 - LEG_SZ]:
         for cy in [-TOP_D/2 + LEG_SZ, TOP_D/2 - LEG_SZ]:
-            leg = add_cube(LEG_SZ, LEG_SZ, LEG_H,
-                           (cx, cy, -TAPER_H/2 - 0.12 - LEG_H/2))
+            leg = add_box("leg", LEG_SZ, LEG_SZ, LEG_H,
+                          loc=(cx, cy, -TAPER_H/2 - 0.12 - LEG_H/2))
             # Foot pad
-            pad = add_cube(LEG_SZ * 2, LEG_SZ * 2, 0.015,
-                           (cx, cy, -TAPER_H/2 - 0.12 - LEG_H))
-            bool_op(leg, pad, 'UNION')
-            bool_op(upper, leg, 'UNION')
+            pad = add_box("pad", LEG_SZ * 2, LEG_SZ * 2, 0.015,
+                          loc=(cx, cy, -TAPER_H/2 - 0.12 - LEG_H))
+            bool_op(leg, pad)
+            bool_op(upper, leg)
 
     # 9) Cross braces between legs
     brace_z = -TAPER_H/2 - 0.12 - LEG_H * 0.6
     for cy in [-TOP_D/2 + LEG_SZ, TOP_D/2 - LEG_SZ]:
-        brace = add_cube(TOP_W - LEG_SZ * 2, 0.03, 0.03, (0, cy, brace_z))
-        bool_op(upper, brace, 'UNION')
+        brace = add_box("brace", TOP_W - LEG_SZ * 2, 0.03, 0.03,
+                        loc=(0, cy, brace_z))
+        bool_op(upper, brace)
 
     upper.name = f"{PRODUCT}_{COMPONENT}"
     upper.data.name = f"{PRODUCT}_{COMPONENT}_mesh"
     return upper
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.shade_auto_smooth()
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.uv.smart_project(angle_limit=math.radians(66), island_margin=0.02)
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-
-def verify(obj):
-    bm = bmesh.new(); bm.from_mesh(obj.data)
-    f = len(bm.faces); q = sum(1 for face in bm.faces if len(face.verts) == 4)
-    nm = sum(1 for e in bm.edges if not e.is_manifold)
-    print(f"\n  MESH: {obj.name}  |  V:{len(bm.verts)} E:{len(bm.edges)} F:{f}")
-    print(f"  Quads: {q}/{f} ({100*q/max(f,1):.0f}%)  |  Non-manifold: {nm}  |  Watertight: {'YES' if nm==0 else 'NO'}")
-    bm.free()
-
-def export(obj):
-    os.makedirs(OUT_DIR, exist_ok=True)
-    path = os.path.join(OUT_DIR, OUT_FILE)
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True); bpy.context.view_layer.objects.active = obj
-    bpy.ops.export_scene.gltf(
-        filepath=path, export_format='GLB', use_selection=True,
-        export_apply=True, export_normals=True, export_materials='EXPORT',
-        export_cameras=False, export_lights=False,
-        export_animations=False, export_yup=True,
-        export_draco_mesh_compression_enable=True,
-        export_draco_mesh_compression_level=6)
-    print(f"  EXPORTED: {path} ({os.path.getsize(path)/1024:.1f} KB)\n")
-
 def main():
-    clean_scene(); setup_scene()
-    mat = create_material()
+    clean_scene()
+    mat = library_material(os.path.join(OUT_DIR, OUT_FILE),
+                           f"MAT_{PRODUCT}_{MATERIAL}", **PBR,
+                           backface_culling=True)
     obj = create_geometry()
     obj.data.materials.append(mat)
-    polish(obj); verify(obj); export(obj)
+    polish(obj, merge=0.0001, center_origin=True); verify(obj)
+    export(obj, os.path.join(OUT_DIR, OUT_FILE))
+    report(f"{PRODUCT}_{COMPONENT}")
     print(f"DONE: {PRODUCT}_{COMPONENT}")
 
 if __name__ == "__main__":
@@ -7,7 +7,12 @@ inlet/outlet flanges, viewport port, support saddles.
 
 Run: blender --background --python this_script.py
 """
-import bpy, bmesh, math, os
+import bpy, math, os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.build import (clean_scene, library_material, add_cyl, add_box,
+                               bool_op, polish, verify, export, report)
 
 PRODUCT   = "VIncinerator"
 COMPONENT = "CombustionChamber"
@@ -37,73 +42,35 @@ PBR = {
     "emission_strength": 0.0,
 }
 
-def clean_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for b in bpy.data.meshes:
-        if b.users == 0: bpy.data.meshes.remove(b)
-    for b in bpy.data.materials:
-        if b.users == 0: bpy.data.materials.remove(b)
-
-def setup_scene():
-    bpy.context.scene.name = "Scene0"
-    bpy.context.scene.unit_settings.system = 'METRIC'
-    bpy.context.scene.unit_settings.scale_length = 1.0
-
-def create_material():
-    mat = bpy.data.materials.new(name=f"MAT_{PRODUCT}_{MATERIAL}")
-    mat.use_nodes = True; mat.use_backface_culling = True
-    nodes = mat.node_tree.nodes; links = mat.node_tree.links; nodes.clear()
-    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-    bsdf.inputs['Base Color'].default_value = PBR["base_color"]
-    bsdf.inputs['Metallic'].default_value = PBR["metallic"]
-    bsdf.inputs['Roughness'].default_value = PBR["roughness"]
-    bsdf.inputs['Alpha'].default_value = PBR["alpha"]
-    bsdf.inputs['Emission Color'].default_value = PBR["emission"]
-    bsdf.inputs['Emission Strength'].default_value = PBR["emission_strength"]
-    out = nodes.new('ShaderNodeOutputMaterial'); out.location = (300, 0)
-    links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
-    return mat
-
-def add_cyl(r, d, v=64, loc=(0,0,0), rot=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(vertices=v, radius=r, depth=d,
-                                        location=loc, rotation=rot)
-    return bpy.context.active_object
-
-def add_cube(sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=loc)
-    obj = bpy.context.active_object; obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def bool_op(target, cutter, op='UNION'):
-    mod = target.modifiers.new(op, 'BOOLEAN')
-    mod.operation = op; mod.object = cutter; mod.solver = 'EXACT'
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=op)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
 def create_geometry():
     """Horizontal combustion chamber with nozzles, flanges, saddles."""
 
     # 1) Main vessel — horizontal thick-walled cylinder (along X axis)
-    vessel = add_cyl(OUTER_R, LENGTH, 64, (0,0,0), (0, math.pi/2, 0))
+    vessel = add_cyl("vessel", OUTER_R, LENGTH, rot=(0, math.pi/2, 0), segs=64)
     sol = vessel.modifiers.new("Hollow", 'SOLIDIFY')
     sol.thickness = WALL; sol.offset = -1
     bpy.context.view_layer.objects.active = vessel
     bpy.ops.object.modifier_apply(modifier="Hollow")
 
     # 2) Inlet flange (left end, -X)
-    fl_in = add_cyl(FLANGE_R, FLANGE_H, 64, (-LENGTH/2 - FLANGE_H/2, 0, 0), (0, math.pi/2, 0))
-    hole = add_cyl(INNER_R, FLANGE_H+0.01, 64, (-LENGTH/2 - FLANGE_H/2, 0, 0), (0, math.pi/2, 0))
+    fl_in = add_cyl("fl_in", FLANGE_R, FLANGE_H,
+                    loc=(-LENGTH/2 - FLANGE_H/2, 0, 0), rot=(0, math.pi/2, 0),
+                    segs=64)
+    hole = add_cyl("hole", INNER_R, FLANGE_H+0.01,
+                   loc=(-LENGTH/2 - FLANGE_H/2, 0, 0), rot=(0, math.pi/2, 0),
+                   segs=64)
     bool_op(fl_in, hole, 'DIFFERENCE')
-    bool_op(vessel, fl_in, 'UNION')
+    bool_op(vessel, fl_in)
 
     # 3) Outlet flange (right end, +X)
-    fl_out = add_cyl(FLANGE_R, FLANGE_H, 64, (LENGTH/2 + FLANGE_H/2, 0, 0), (0, math.pi/2, 0))
-    hole2 = add_cyl(INNER_R, FLANGE_H+0.01, 64, (LENGTH/2 + FLANGE_H/2, 0, 0), (0, math.pi/2, 0))
+    fl_out = add_cyl("fl_out", FLANGE_R, FLANGE_H,
+                     loc=(LENGTH/2 + FLANGE_H/2, 0, 0), rot=(0, math.pi/2, 0),
+                     segs=64)
+    hole2 = add_cyl("hole2", INNER_R, FLANGE_H+0.01,
+                    loc=(LENGTH/2 + FLANGE_H/2, 0, 0), rot=(0, math.pi/2, 0),
+                    segs=64)
     bool_op(fl_out, hole2, 'DIFFERENCE')
-    bool_op(vessel, fl_out, 'UNION')
+    bool_op(vessel, fl_out)
 
     # 4) Six secondary air nozzle stubs along top (3 per side, spaced along length)
     for i in range(6):
@@ -111,70 +78,42 @@ def create_geometry():
         angle = math.radians(30 if i < 3 else -30)  # angled slightly
         ny = (OUTER_R + NOZZLE_L/2) * math.sin(math.pi/2 + angle)
         nz = (OUTER_R + NOZZLE_L/2) * math.cos(math.pi/2 + angle)
-        stub = add_cyl(NOZZLE_R, NOZZLE_L, 24, (x_pos, ny * (1 if i<3 else -1), nz))
+        stub = add_cyl("stub", NOZZLE_R, NOZZLE_L,
+                       loc=(x_pos, ny * (1 if i<3 else -1), nz), segs=24)
         # Collar at end
         cny = (OUTER_R + NOZZLE_L) * math.sin(math.pi/2 + angle)
         cnz = (OUTER_R + NOZZLE_L) * math.cos(math.pi/2 + angle)
-        collar = add_cyl(NOZZLE_R + 0.02, 0.015, 24, (x_pos, cny * (1 if i<3 else -1), cnz))
-        bool_op(stub, collar, 'UNION')
-        bool_op(vessel, stub, 'UNION')
+        collar = add_cyl("collar", NOZZLE_R + 0.02, 0.015,
+                         loc=(x_pos, cny * (1 if i<3 else -1), cnz), segs=24)
+        bool_op(stub, collar)
+        bool_op(vessel, stub)
 
     # 5) Viewport port (top center) — small cylinder + flange
-    vp = add_cyl(0.06, 0.10, 24, (0, 0, OUTER_R + 0.05))
-    vp_col = add_cyl(0.09, 0.02, 24, (0, 0, OUTER_R + 0.10))
-    bool_op(vp, vp_col, 'UNION')
-    bool_op(vessel, vp, 'UNION')
+    vp = add_cyl("vp", 0.06, 0.10, loc=(0, 0, OUTER_R + 0.05), segs=24)
+    vp_col = add_cyl("vp_col", 0.09, 0.02, loc=(0, 0, OUTER_R + 0.10), segs=24)
+    bool_op(vp, vp_col)
+    bool_op(vessel, vp)
 
     # 6) Two support saddles (bottom)
     for x_off in [-LENGTH/3, LENGTH/3]:
-        saddle = add_cube(SADDLE_D, SADDLE_W, SADDLE_H,
-                          (x_off, 0, -(OUTER_R + SADDLE_H/2)))
-        bool_op(vessel, saddle, 'UNION')
+        saddle = add_box("saddle", SADDLE_D, SADDLE_W, SADDLE_H,
+                         loc=(x_off, 0, -(OUTER_R + SADDLE_H/2)))
+        bool_op(vessel, saddle)
 
     vessel.name = f"{PRODUCT}_{COMPONENT}"
     vessel.data.name = f"{PRODUCT}_{COMPONENT}_mesh"
     return vessel
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.shade_auto_smooth()
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.uv.smart_project(angle_limit=math.radians(66), island_margin=0.02)
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-
-def verify(obj):
-    bm = bmesh.new(); bm.from_mesh(obj.data)
-    f = len(bm.faces); q = sum(1 for face in bm.faces if len(face.verts) == 4)
-    nm = sum(1 for e in bm.edges if not e.is_manifold)
-    print(f"\n  MESH: {obj.name}  |  V:{len(bm.verts)} E:{len(bm.edges)} F:{f}")
-    print(f"  Quads: {q}/{f} ({100*q/max(f,1):.0f}%)  |  Non-manifold: {nm}  |  Watertight: {'YES' if nm==0 else 'NO'}")
-    bm.free()
-
-def export(obj):
-    os.makedirs(OUT_DIR, exist_ok=True)
-    path = os.path.join(OUT_DIR, OUT_FILE)
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True); bpy.context.view_layer.objects.active = obj
-    bpy.ops.export_scene.gltf(
-        filepath=path, export_format='GLB', use_selection=True,
-        export_apply=True, export_normals=True, export_materials='EXPORT',
-        export_cameras=False, export_lights=False,
-        export_animations=False, export_yup=True,
-        export_draco_mesh_compression_enable=True,
-        export_draco_mesh_compression_level=6)
-    print(f"  EXPORTED: {path} ({os.path.getsize(path)/1024:.1f} KB)\n")
-
 def main():
-    clean_scene(); setup_scene()
-    mat = create_material()
+    clean_scene()
+    mat = library_material(os.path.join(OUT_DIR, OUT_FILE),
+                           f"MAT_{PRODUCT}_{MATERIAL}", **PBR,
+                           backface_culling=True)
     obj = create_geometry()
     obj.data.materials.append(mat)
-    polish(obj); verify(obj); export(obj)
+    polish(obj, merge=0.0001, center_origin=True); verify(obj)
+    export(obj, os.path.join(OUT_DIR, OUT_FILE))
+    report(f"{PRODUCT}_{COMPONENT}")
     print(f"DONE: {PRODUCT}_{COMPONENT}")
 
 if __name__ == "__main__":
@@ -7,7 +7,12 @@ Inlet/outlet nozzles on shell + end bonnets + support saddles.
 
 Run: blender --background --python this_script.py
 """
-import bpy, bmesh, math, os
+import bpy, math, os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.build import (clean_scene, library_material, add_cyl, add_box,
+                               bool_op, polish, verify, export, report)
 
 PRODUCT   = "VIncinerator"
 COMPONENT = "HeatExchanger"
@@ -40,57 +45,11 @@ PBR = {
     "emission_strength": 0.0,
 }
 
-def clean_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for b in bpy.data.meshes:
-        if b.users == 0: bpy.data.meshes.remove(b)
-    for b in bpy.data.materials:
-        if b.users == 0: bpy.data.materials.remove(b)
-
-def setup_scene():
-    bpy.context.scene.name = "Scene0"
-    bpy.context.scene.unit_settings.system = 'METRIC'
-    bpy.context.scene.unit_settings.scale_length = 1.0
-
-def create_material():
-    mat = bpy.data.materials.new(name=f"MAT_{PRODUCT}_{MATERIAL}")
-    mat.use_nodes = True; mat.use_backface_culling = True
-    nodes = mat.node_tree.nodes; links = mat.node_tree.links; nodes.clear()
-    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-    bsdf.inputs['Base Color'].default_value = PBR["base_color"]
-    bsdf.inputs['Metallic'].default_value = PBR["metallic"]
-    bsdf.inputs['Roughness'].default_value = PBR["roughness"]
-    bsdf.inputs['Alpha'].default_value = PBR["alpha"]
-    bsdf.inputs['Emission Color'].default_value = PBR["emission"]
-    bsdf.inputs['Emission Strength'].default_value = PBR["emission_strength"]
-    out = nodes.new('ShaderNodeOutputMaterial'); out.location = (300, 0)
-    links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
-    return mat
-
-def add_cyl(r, d, v=64, loc=(0,0,0), rot=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(vertices=v, radius=r, depth=d,
-                                        location=loc, rotation=rot)
-    return bpy.context.active_object
-
-def add_cube(sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=loc)
-    obj = bpy.context.active_object; obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def bool_op(target, cutter, op='UNION'):
-    mod = target.modifiers.new(op, 'BOOLEAN')
-    mod.operation = op; mod.object = cutter; mod.solver = 'EXACT'
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=op)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
 def create_geometry():
     """Shell-and-tube heat exchanger with nozzles, tube sheets, bonnets, saddles."""
 
     # 1) Main shell — horizontal thick-walled cylinder (along X)
-    shell = add_cyl(SHELL_R, LENGTH, 64, (0,0,0), (0, math.pi/2, 0))
+    shell = add_cyl("shell", SHELL_R, LENGTH, rot=(0, math.pi/2, 0), segs=64)
     sol = shell.modifiers.new("Hollow", 'SOLIDIFY')
     sol.thickness = WALL; sol.offset = -1
     bpy.context.view_layer.objects.active = shell
@@ -98,97 +57,76 @@ def create_geometry():
 
     # 2) Tube sheets at each end (solid discs visible inside)
     for xoff in [-LENGTH/2 + TUBE_SHEET_T/2, LENGTH/2 - TUBE_SHEET_T/2]:
-        ts = add_cyl(INNER_R - 0.002, TUBE_SHEET_T, 64, (xoff, 0, 0), (0, math.pi/2, 0))
-        bool_op(shell, ts, 'UNION')
+        ts = add_cyl("ts", INNER_R - 0.002, TUBE_SHEET_T, loc=(xoff, 0, 0),
+                     rot=(0, math.pi/2, 0), segs=64)
+        bool_op(shell, ts)
 
     # 3) End bonnets — semi-elliptical caps (approximated as short cylinders with domed look)
     for xoff, xdir in [(-LENGTH/2 - BONNET_H/2, -1), (LENGTH/2 + BONNET_H/2, 1)]:
-        bonnet = add_cyl(SHELL_R, BONNET_H, 64, (xoff, 0, 0), (0, math.pi/2, 0))
+        bonnet = add_cyl("bonnet", SHELL_R, BONNET_H, loc=(xoff, 0, 0),
+                         rot=(0, math.pi/2, 0), segs=64)
         # Hollow the bonnet
         bh = bonnet.modifiers.new("Hollow", 'SOLIDIFY')
         bh.thickness = WALL; bh.offset = -1
         bpy.context.view_layer.objects.active = bonnet
         bpy.ops.object.modifier_apply(modifier="Hollow")
         # Flange ring between shell and bonnet
-        fl = add_cyl(FLANGE_R, FLANGE_H, 64,
-                     (xdir * (LENGTH/2 + FLANGE_H/2), 0, 0), (0, math.pi/2, 0))
-        fl_hole = add_cyl(INNER_R, FLANGE_H+0.01, 64,
-                          (xdir * (LENGTH/2 + FLANGE_H/2), 0, 0), (0, math.pi/2, 0))
+        fl = add_cyl("fl", FLANGE_R, FLANGE_H,
+                     loc=(xdir * (LENGTH/2 + FLANGE_H/2), 0, 0),
+                     rot=(0, math.pi/2, 0), segs=64)
+        fl_hole = add_cyl("fl_hole", INNER_R, FLANGE_H+0.01,
+                          loc=(xdir * (LENGTH/2 + FLANGE_H/2), 0, 0),
+                          rot=(0, math.pi/2, 0), segs=64)
         bool_op(fl, fl_hole, 'DIFFERENCE')
-        bool_op(bonnet, fl, 'UNION')
-        bool_op(shell, bonnet, 'UNION')
+        bool_op(bonnet, fl)
+        bool_op(shell, bonnet)
 
     # 4) Shell-side inlet nozzle (top, near left end)
-    n_in = add_cyl(NOZZLE_R, NOZZLE_L, 32, (-LENGTH/4, 0, SHELL_R + NOZZLE_L/2))
-    n_in_col = add_cyl(NOZZLE_R + 0.03, 0.02, 32, (-LENGTH/4, 0, SHELL_R + NOZZLE_L))
-    bool_op(n_in, n_in_col, 'UNION')
-    bool_op(shell, n_in, 'UNION')
+    n_in = add_cyl("n_in", NOZZLE_R, NOZZLE_L,
+                   loc=(-LENGTH/4, 0, SHELL_R + NOZZLE_L/2), segs=32)
+    n_in_col = add_cyl("n_in_col", NOZZLE_R + 0.03, 0.02,
+                       loc=(-LENGTH/4, 0, SHELL_R + NOZZLE_L), segs=32)
+    bool_op(n_in, n_in_col)
+    bool_op(shell, n_in)
 
     # 5) Shell-side outlet nozzle (bottom, near right end)
-    n_out = add_cyl(NOZZLE_R, NOZZLE_L, 32, (LENGTH/4, 0, -(SHELL_R + NOZZLE_L/2)))
-    n_out_col = add_cyl(NOZZLE_R + 0.03, 0.02, 32, (LENGTH/4, 0, -(SHELL_R + NOZZLE_L)))
-    bool_op(n_out, n_out_col, 'UNION')
-    bool_op(shell, n_out, 'UNION')
+    n_out = add_cyl("n_out", NOZZLE_R, NOZZLE_L,
+                    loc=(LENGTH/4, 0, -(SHELL_R + NOZZLE_L/2)), segs=32)
+    n_out_col = add_cyl("n_out_col", NOZZLE_R + 0.03, 0.02,
+                        loc=(LENGTH/4, 0, -(SHELL_R + NOZZLE_L)), segs=32)
+    bool_op(n_out, n_out_col)
+    bool_op(shell, n_out)
 
     # 6) Tube-side nozzles (on each bonnet end cap)
     for xoff in [-LENGTH/2 - BONNET_H, LENGTH/2 + BONNET_H]:
-        tn = add_cyl(0.08, 0.14, 32, (xoff, 0, 0), (0, math.pi/2, 0))
-        tn_col = add_cyl(0.11, 0.02, 32,
-                         (xoff + (0.14 if xoff > 0 else -0.14)/2, 0, 0),
-                         (0, math.pi/2, 0))
-        bool_op(tn, tn_col, 'UNION')
-        bool_op(shell, tn, 'UNION')
+        tn = add_cyl("tn", 0.08, 0.14, loc=(xoff, 0, 0), rot=(0, math.pi/2, 0),
+                     segs=32)
+        tn_col = add_cyl("tn_col", 0.11, 0.02,
+                         loc=(xoff + (0.14 if xoff > 0 else -0.14)/2, 0, 0),
+                         rot=(0, math.pi/2, 0), segs=32)
+        bool_op(tn, tn_col)
+        bool_op(shell, tn)
 
     # 7) Support saddles
     for xoff in [-LENGTH/3, LENGTH/3]:
-        saddle = add_cube(SADDLE_D, SADDLE_W, SADDLE_H,
-                          (xoff, 0, -(SHELL_R + SADDLE_H/2)))
-        bool_op(shell, saddle, 'UNION')
+        saddle = add_box("saddle", SADDLE_D, SADDLE_W, SADDLE_H,
+                         loc=(xoff, 0, -(SHELL_R + SADDLE_H/2)))
+        bool_op(shell, saddle)
 
     shell.name = f"{PRODUCT}_{COMPONENT}"
     shell.data.name = f"{PRODUCT}_{COMPONENT}_mesh"
     return shell
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.shade_auto_smooth()
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.uv.smart_project(angle_limit=math.radians(66), island_margin=0.02)
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-
-def verify(obj):
-    bm = bmesh.new(); bm.from_mesh(obj.data)
-    f = len(bm.faces); q = sum(1 for face in bm.faces if len(face.verts) == 4)
-    nm = sum(1 for e in bm.edges if not e.is_manifold)
-    print(f"\n  MESH: {obj.name}  |  V:{len(bm.verts)} E:{len(bm.edges)} F:{f}")
-    print(f"  Quads: {q}/{f} ({100*q/max(f,1):.0f}%)  |  Non-manifold: {nm}  |  Watertight: {'YES' if nm==0 else 'NO'}")
-    bm.free()
-
-def export(obj):
-    os.makedirs(OUT_DIR, exist_ok=True)
-    path = os.path.join(OUT_DIR, OUT_FILE)
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True); bpy.context.view_layer.objects.active = obj
-    bpy.ops.export_scene.gltf(
-        filepath=path, export_format='GLB', use_selection=True,
-        export_apply=True, export_normals=True, export_materials='EXPORT',
-        export_cameras=False, export_lights=False,
-        export_animations=False, export_yup=True,
-        export_draco_mesh_compression_enable=True,
-        export_draco_mesh_compression_level=6)
-    print(f"  EXPORTED: {path} ({os.path.getsize(path)/1024:.1f} KB)\n")
-
 def main():
-    clean_scene(); setup_scene()
-    mat = create_material()
+    clean_scene()
+    mat = library_material(os.path.join(OUT_DIR, OUT_FILE),
+                           f"MAT_{PRODUCT}_{MATERIAL}", **PBR,
+                           backface_culling=True)
     obj = create_geometry()
     obj.data.materials.append(mat)
-    polish(obj); verify(obj); export(obj)
+    polish(obj, merge=0.0001, center_origin=True); verify(obj)
+    export(obj, os.path.join(OUT_DIR, OUT_FILE))
+    report(f"{PRODUCT}_{COMPONENT}")
     print(f"DONE: {PRODUCT}_{COMPONENT}")
 
 if __name__ == "__main__":
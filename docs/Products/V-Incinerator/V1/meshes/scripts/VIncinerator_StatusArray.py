@@ -7,7 +7,13 @@ mounting bracket tabs on back, cable entry grommet.
 
 Run: blender --background --python this_script.py
 """
-import bpy, bmesh, math, os
+import math, os, sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+from voltec_mesh.build import (clean_scene, library_material, add_cyl, add_box,
+                               add_sphere, bool_op, polish, verify, export,
+                               report)
 
 PRODUCT   = "VIncinerator"
 COMPONENT = "StatusArray"
@@ -39,66 +45,16 @@ PBR = {
     "emission_strength": 0.5,
 }
 
-def clean_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for b in bpy.data.meshes:
-        if b.users == 0: bpy.data.meshes.remove(b)
-    for b in bpy.data.materials:
-        if b.users == 0: bpy.data.materials.remove(b)
-
-def setup_scene():
-    bpy.context.scene.name = "Scene0"
-    bpy.context.scene.unit_settings.system = 'METRIC'
-    bpy.context.scene.unit_settings.scale_length = 1.0
-
-def create_material():
-    mat = bpy.data.materials.new(name=f"MAT_{PRODUCT}_{MATERIAL}")
-    mat.use_nodes = True; mat.use_backface_culling = True
-    nodes = mat.node_tree.nodes; links = mat.node_tree.links; nodes.clear()
-    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-    bsdf.inputs['Base Color'].default_value = PBR["base_color"]
-    bsdf.inputs['Metallic'].default_value = PBR["metallic"]
-    bsdf.inputs['Roughness'].default_value = PBR["roughness"]
-    bsdf.inputs['Alpha'].default_value = PBR["alpha"]
-    bsdf.inputs['Emission Color'].default_value = PBR["emission"]
-    bsdf.inputs['Emission Strength'].default_value = PBR["emission_strength"]
-    out = nodes.new('ShaderNodeOutputMaterial'); out.location = (300, 0)
-    links.new(bsdf.outputs['BSDF'], out.inputs['Surface'])
-    return mat
-
-def add_cube(sx, sy, sz, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_cube_add(size=1.0, location=loc)
-    obj = bpy.context.active_object; obj.scale = (sx, sy, sz)
-    bpy.ops.object.transform_apply(scale=True)
-    return obj
-
-def add_cyl(r, d, v=16, loc=(0,0,0), rot=(0,0,0)):
-    bpy.ops.mesh.primitive_cylinder_add(vertices=v, radius=r, depth=d,
-                                        location=loc, rotation=rot)
-    return bpy.context.active_object
-
-def add_sphere(r, loc=(0,0,0)):
-    bpy.ops.mesh.primitive_uv_sphere_add(segments=16, ring_count=12,
-                                          radius=r, location=loc)
-    return bpy.context.active_object
-
-def bool_op(target, cutter, op='UNION'):
-    mod = target.modifiers.new(op, 'BOOLEAN')
-    mod.operation = op; mod.object = cutter; mod.solver = 'EXACT'
-    bpy.context.view_layer.objects.active = target
-    bpy.ops.object.modifier_apply(modifier=op)
-    bpy.data.objects.remove(cutter, do_unlink=True)
-
 def create_geometry():
     """Status LED array panel with dome lenses, bezel, mounting tabs."""
 
     # 1) Main panel body
-    panel = add_cube(PANEL_W, PANEL_D, PANEL_H)
+    panel = add_box("panel", PANEL_W, PANEL_D, PANEL_H)
 
     # 2) Front bezel (raised frame around LED area)
-    bezel = add_cube(BEZEL_W, BEZEL_D, BEZEL_H, (0, PANEL_D/2 + BEZEL_D/2, 0))
-    bool_op(panel, bezel, 'UNION')
+    bezel = add_box("bezel", BEZEL_W, BEZEL_D, BEZEL_H,
+                    loc=(0, PANEL_D/2 + BEZEL_D/2, 0))
+    bool_op(panel, bezel)
 
     # 3) LED dome lenses (5 hemispheres on front face)
     spacing = PANEL_W * 0.8 / (LED_COUNT - 1)
@@ -106,79 +62,51 @@ def create_geometry():
     for i in range(LED_COUNT):
         x = start_x + i * spacing
         # LED dome
-        dome = add_sphere(LED_R, (x, PANEL_D/2 + BEZEL_D + LED_R * 0.3, 0))
-        bool_op(panel, dome, 'UNION')
+        dome = add_sphere("dome", LED_R,
+                          loc=(x, PANEL_D/2 + BEZEL_D + LED_R * 0.3, 0),
+                          rings=12)
+        bool_op(panel, dome)
         # LED bezel ring
-        ring = add_cyl(LED_R + 0.003, 0.003, 12,
-                        (x, PANEL_D/2 + BEZEL_D/2, 0),
-                        (math.pi/2, 0, 0))
-        bool_op(panel, ring, 'UNION')
+        ring = add_cyl("ring", LED_R + 0.003, 0.003,
+                       loc=(x, PANEL_D/2 + BEZEL_D/2, 0),
+                       rot=(math.pi/2, 0, 0), segs=12)
+        bool_op(panel, ring)
 
     # 4) Mounting tabs on back (2 tabs with screw holes)
     for x_off in [-PANEL_W/3, PANEL_W/3]:
-        tab = add_cube(TAB_W, TAB_D, TAB_H,
-                        (x_off, -PANEL_D/2 - TAB_D/2, 0))
+        tab = add_box("tab", TAB_W, TAB_D, TAB_H,
+                      loc=(x_off, -PANEL_D/2 - TAB_D/2, 0))
         # Screw hole
-        hole = add_cyl(0.002, TAB_D + 0.01, 8,
-                        (x_off, -PANEL_D/2 - TAB_D/2, TAB_H/4),
-                        (math.pi/2, 0, 0))
+        hole = add_cyl("hole", 0.002, TAB_D + 0.01,
+                       loc=(x_off, -PANEL_D/2 - TAB_D/2, TAB_H/4),
+                       rot=(math.pi/2, 0, 0), segs=8)
         bool_op(tab, hole, 'DIFFERENCE')
-        bool_op(panel, tab, 'UNION')
+        bool_op(panel, tab)
 
     # 5) Cable entry grommet (bottom center)
-    grommet = add_cyl(GROMMET_R, GROMMET_L, 12,
-                       (0, 0, -PANEL_H/2 - GROMMET_L/2))
-    bool_op(panel, grommet, 'UNION')
+    grommet = add_cyl("grommet", GROMMET_R, GROMMET_L,
+                      loc=(0, 0, -PANEL_H/2 - GROMMET_L/2), segs=12)
+    bool_op(panel, grommet)
 
     # 6) Label area (small raised rectangle below LEDs)
-    label = add_cube(PANEL_W * 0.6, 0.002, PANEL_H * 0.15,
-                      (0, PANEL_D/2 + BEZEL_D + 0.001, -PANEL_H/4))
-    bool_op(panel, label, 'UNION')
+    label = add_box("label", PANEL_W * 0.6, 0.002, PANEL_H * 0.15,
+                    loc=(0, PANEL_D/2 + BEZEL_D + 0.001, -PANEL_H/4))
+    bool_op(panel, label)
 
     panel.name = f"{PRODUCT}_{COMPONENT}"
     panel.data.name = f"{PRODUCT}_{COMPONENT}_mesh"
     return panel
 
-def polish(obj):
-    bpy.context.view_layer.objects.active = obj
-    bpy.ops.object.shade_auto_smooth()
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.uv.smart_project(angle_limit=math.radians(66), island_margin=0.02)
-    bpy.ops.mesh.normals_make_consistent(inside=False)
-    bpy.ops.mesh.remove_doubles(threshold=0.0001)
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-
-def verify(obj):
-    bm = bmesh.new(); bm.from_mesh(obj.data)
-    f = len(bm.faces); q = sum(1 for face in bm.faces if len(face.verts) == 4)
-    nm = sum(1 for e in bm.edges if not e.is_manifold)
-    print(f"\n  MESH: {obj.name}  |  V:{len(bm.verts)} E:{len(bm.edges)} F:{f}")
-    print(f"  Quads: {q}/{f} ({100*q/max(f,1):.0f}%)  |  Non-manifold: {nm}  |  Watertight: {'YES' if nm==0 else 'NO'}")
-    bm.free()
-
-def export(obj):
-    os.makedirs(OUT_DIR, exist_ok=True)
-    path = os.path.join(OUT_DIR, OUT_FILE)
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True); bpy.context.view_layer.objects.active = obj
-    bpy.ops.export_scene.gltf(
-        filepath=path, export_format='GLB', use_selection=True,
-        export_apply=True, export_normals=True, export_materials='EXPORT',
-        export_cameras=False, export_lights=False,
-        export_animations=False, export_yup=True,
-        export_draco_mesh_compression_enable=True,
-        export_draco_mesh_compression_level=6)
-    print(f"  EXPORTED: {path} ({os.path.getsize(path)/1024:.1f} KB)\n")
-
 def main():
-    clean_scene(); setup_scene()
-    mat = create_material()
+    clean_scene()
+    mat = library_material(os.path.join(OUT_DIR, OUT_FILE),
+                           f"MAT_{PRODUCT}_{MATERIAL}", **PBR,
+                           backface_culling=True)
     obj = create_geometry()
     obj.data.materials.append(mat)
-    polish(obj); verify(obj); export(obj)
+    polish(obj, merge=0.0001, center_origin=True); verify(obj)
+    export(obj, os.path.join(OUT_DIR, OUT_FILE))
+    report(f"{PRODUCT}_{COMPONENT}")
     print(f"DONE: {PRODUCT}_{COMPONENT}")
 
 if __name__ == "__main__":
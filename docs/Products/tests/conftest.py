@@ -0,0 +1,67 @@
+# Shared fixtures for the voltec_mesh tests. Run from docs/Products:
+#   python -m pytest -q
+# The plain-Python modules are tested directly; bpy is not needed.
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from voltec_mesh import primitives  # noqa: E402
+from voltec_mesh.glb import Glb  # noqa: E402
+
+
+@pytest.fixture
+def unit_ring(monkeypatch):
+    """primitives.ring() outside Blender: the same circle, first point on +Y
+    and clockwise, from NumPy instead of bmesh's cone builder (which agrees
+    to float32 rounding)."""
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        def ring(segs):
+            a = 2 * np.pi * np.arange(segs) / segs
+            return np.column_stack([np.sin(a), np.cos(a)]).astype(np.float32)
+        monkeypatch.setattr(primitives, "_unit_ring", ring)
+
+
+@pytest.fixture
+def fan():
+    """Triangles of (corners, sizes) polygons, each fanned from its first
+    corner (the generators only emit convex faces)."""
+    def triangulate(faces):
+        corners, sizes = faces
+        start = np.cumsum(sizes) - sizes
+        tris = [np.column_stack([np.full(n - 2, s), s + np.arange(1, n - 1),
+                                 s + np.arange(2, n)])
+                for s, n in zip(start, sizes)]
+        return corners[np.vstack(tris)]
+    return triangulate
+
+
+@pytest.fixture
+def make_glb():
+    """Plain (uncompressed) one-node Glb of flat-shaded triangles: every
+    corner is its own vertex with the face normal."""
+    def build(verts, tris, translation=(0.0, 0.0, 0.0)):
+        corners = np.asarray(verts, dtype=np.float64)[tris]
+        normal = np.cross(corners[:, 1] - corners[:, 0],
+                          corners[:, 2] - corners[:, 0])
+        normal /= np.linalg.norm(normal, axis=1, keepdims=True)
+        doc = Glb({"asset": {"version": "2.0"}, "scene": 0,
+                   "scenes": [{"nodes": [0]}],
+                   "nodes": [{"name": "part", "mesh": 0,
+                              "translation": list(translation)}]})
+        attributes = {
+            "POSITION": doc.add_accessor(
+                corners.reshape(-1, 3).astype(np.float32), 34962,
+                bounds=True),
+            "NORMAL": doc.add_accessor(
+                np.repeat(normal, 3, axis=0).astype(np.float32), 34962)}
+        indices = doc.add_accessor(
+            np.arange(3 * len(tris), dtype=np.uint32), 34963)
+        doc.gltf["meshes"] = [{"primitives": [
+            {"attributes": attributes, "indices": indices}]}]
+        return doc
+    return build
@@ -0,0 +1,48 @@
+import math
+
+import numpy as np
+import pytest
+
+from voltec_mesh.honeycomb import (honeycomb_arrays, honeycomb_centers,
+                                   honeycomb_layout)
+from voltec_mesh.massprops import closed
+from voltec_mesh.meshdata import inside, volume
+
+# VCell_AlHexLattice at its shipped cell size
+L, W, T, R, WALL, FRAME = 0.150, 0.080, 0.001, 0.006, 0.0008, 0.003
+
+
+def triangles(quads):
+    return np.vstack([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+
+
+def test_volume_is_slab_minus_holes():
+    verts, quads = honeycomb_arrays(L, W, T, R, WALL, FRAME)
+    rows, cols, _, _ = honeycomb_layout(L, W, R, WALL, FRAME)
+    hole = 1.5 * math.sqrt(3) * R ** 2
+    expected = (L * W - rows * cols * hole) * T
+    assert volume(verts, triangles(quads)) == pytest.approx(expected,
+                                                            rel=1e-9)
+
+
+def test_watertight_and_centered():
+    verts, quads = honeycomb_arrays(L, W, T, R, WALL, FRAME)
+    assert closed(verts, triangles(quads))
+    np.testing.assert_allclose(verts.min(0), [-L / 2, -W / 2, -T / 2])
+    np.testing.assert_allclose(verts.max(0), [L / 2, W / 2, T / 2])
+
+
+def test_centers_sit_in_the_holes():
+    verts, quads = honeycomb_arrays(L, W, T, R, WALL, FRAME)
+    rows, cols, _, _ = honeycomb_layout(L, W, R, WALL, FRAME)
+    centers = honeycomb_centers(L, W, R, WALL, FRAME)
+    assert centers.shape == (rows * cols, 2)
+    points = np.column_stack([centers, np.zeros(len(centers))])
+    assert not inside(points, verts, triangles(quads)).any()
+    frame = np.array([[L / 2 - FRAME / 2, 0.0, 0.0]])
+    assert inside(frame, verts, triangles(quads)).all()
+
+
+def test_rejects_a_slab_too_small_for_one_cell():
+    with pytest.raises(ValueError):
+        honeycomb_layout(0.01, 0.01, R, WALL, FRAME)
@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+import pytest
+
+from voltec_mesh.lathe import lathe_arrays
+from voltec_mesh.massprops import closed
+from voltec_mesh.meshdata import volume
+
+SEGS = 48
+# Area of the SEGS-gon inscribed in the unit circle
+K = SEGS / 2 * math.sin(2 * math.pi / SEGS)
+
+
+@pytest.fixture
+def revolve(unit_ring, fan):
+    def solid(profile, segs=SEGS):
+        verts, faces = lathe_arrays(profile, segs)
+        return np.asarray(verts, dtype=np.float64), fan(faces)
+    return solid
+
+
+def test_tube_volume(revolve):
+    verts, tris = revolve([(0.10, 0.0), (0.12, 0.0), (0.12, 0.5),
+                           (0.10, 0.5)])
+    assert closed(verts, tris)
+    assert volume(verts, tris) == pytest.approx(
+        K * (0.12 ** 2 - 0.10 ** 2) * 0.5, rel=1e-6)
+
+
+def test_outline_direction_does_not_matter(revolve):
+    outline = [(0.0, 0.0), (0.2, 0.0), (0.2, 0.3), (0.0, 0.3)]
+    forward = volume(*revolve(outline))
+    assert forward == pytest.approx(volume(*revolve(outline[::-1])))
+    assert forward == pytest.approx(K * 0.2 ** 2 * 0.3, rel=1e-6)
+
+
+def test_sealed_vessel_encloses_only_its_wall(revolve):
+    r, h, wall = 0.56, 0.70, 0.008
+    verts, tris = revolve([(0, -h), (r + wall, -h), (r + wall, h), (0, h),
+                           (0, h - wall), (r, h - wall), (r, -h + wall),
+                           (0, -h + wall)])
+    assert closed(verts, tris)
+    expected = K * ((r + wall) ** 2 * 2 * h - r ** 2 * 2 * (h - wall))
+    assert volume(verts, tris) == pytest.approx(expected, rel=1e-5)
+
+
+def test_cone_apex_is_a_single_vertex(revolve):
+    verts, tris = revolve([(0.0, 0.0), (0.1, 0.0), (0.0, 0.2)])
+    assert closed(verts, tris)
+    assert (verts[:, 2] == 0.2).sum() == 1
+    assert volume(verts, tris) == pytest.approx(K * 0.1 ** 2 * 0.2 / 3,
+                                                rel=1e-6)
+
+
+def test_rejects_negative_radius(unit_ring):
+    with pytest.raises(ValueError):
+        lathe_arrays([(-0.1, 0.0), (0.1, 0.0), (0.1, 0.1)])
@@ -0,0 +1,61 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("meshoptimizer")
+pytest.importorskip("scipy")
+
+from voltec_mesh import geomdiff, lod  # noqa: E402
+from voltec_mesh.lathe import lathe_arrays  # noqa: E402
+
+
+@pytest.fixture
+def sphere_glb(tmp_path, unit_ring, fan, make_glb):
+    angles = np.linspace(0.0, math.pi, 33)
+    outline = np.column_stack([np.sin(angles), np.cos(angles)])
+    outline[[0, -1], 0] = 0.0
+    verts, faces = lathe_arrays(outline, 48)
+    path = str(tmp_path / "part.glb")
+    make_glb(verts, fan(faces)).write(path)
+    return path
+
+
+def test_thresholds_fall_strictly(sphere_glb):
+    full, levels = lod.chain(sphere_glb)
+    assert levels
+    assert [lv["level"] for lv in levels] == list(range(1, len(levels) + 1))
+    sizes = [lv["screen_size"] for lv in levels]
+    assert all(b < a for a, b in zip(sizes, sizes[1:]))
+    triangles = [full] + [lv["triangles"] for lv in levels]
+    assert all(b < a for a, b in zip(triangles, triangles[1:]))
+
+
+def test_error_is_the_measured_deviation(sphere_glb):
+    _, levels = lod.chain(sphere_glb)
+    base = geomdiff.load(sphere_glb)
+    for lv in levels:
+        measured = geomdiff.compare(base, lv["path"])["hausdorff"]
+        assert lv["error"] == pytest.approx(measured, rel=1e-2)
+        diameter = 2 * math.sqrt(3)  # bounding-box diagonal of the sphere
+        assert lv["screen_size"] == pytest.approx(
+            lod.screen_size(measured, diameter), abs=1e-3)
+
+
+def test_levels_with_an_equal_threshold_are_dropped(sphere_glb, monkeypatch):
+    stale = lod.lod_path(sphere_glb, 3)
+    open(stale, "wb").close()
+    monkeypatch.setattr(lod, "screen_size", lambda error, diameter: 1.0)
+    _, levels = lod.chain(sphere_glb)
+    assert [lv["level"] for lv in levels] == [1]
+    assert os.path.exists(lod.lod_path(sphere_glb, 1))
+    assert not os.path.exists(lod.lod_path(sphere_glb, 2))
+    assert not os.path.exists(stale)
+
+
+def test_screen_size_is_clamped():
+    assert lod.screen_size(0.0, 1.0) == 1.0
+    assert lod.screen_size(1e-9, 1.0) == 1.0
+    assert lod.screen_size(0.01, 1.0) == pytest.approx(
+        lod.PIXEL_ERROR / (0.01 * lod.SCREEN_HEIGHT_PX))
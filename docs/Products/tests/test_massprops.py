@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from voltec_mesh.massprops import closed, integrals, properties
+
+# Corner i of a box is (x, y, z) = bits (1, 2, 4) of i; quads wind outward
+QUADS = np.array([[0, 2, 3, 1], [4, 5, 7, 6], [0, 1, 5, 4],
+                  [2, 6, 7, 3], [0, 4, 6, 2], [1, 3, 7, 5]])
+TRIS = np.vstack([QUADS[:, [0, 1, 2]], QUADS[:, [0, 2, 3]]])
+
+
+def box(lo, hi):
+    i = np.arange(8)
+    bits = np.column_stack([i & 1, (i >> 1) & 1, (i >> 2) & 1])
+    return np.where(bits, hi, lo).astype(np.float64), TRIS.copy()
+
+
+def test_box_integrals():
+    verts, tris = box([1.0, 2.0, 3.0], [3.0, 3.0, 7.0])
+    vol, first, second = integrals(verts, tris)
+    assert vol == pytest.approx(8.0)
+    np.testing.assert_allclose(first / vol, [2.0, 2.5, 5.0])
+    # ∫x xᵀ dV of a box is diagonal about its centre
+    cov = second / vol - np.outer(first, first) / vol ** 2
+    np.testing.assert_allclose(cov, np.diag([4.0, 1.0, 16.0]) / 12,
+                               atol=1e-12)
+
+
+def test_box_inertia_and_flipped_winding():
+    verts, tris = box([0.0, 0.0, 0.0], [2.0, 1.0, 4.0])
+    row = properties(verts, tris[:, ::-1], density=1000.0)
+    mass = 8000.0
+    assert row["volume"] == pytest.approx(8.0)
+    assert row["mass"] == pytest.approx(mass)
+    np.testing.assert_allclose(row["center_of_mass"], [1.0, 0.5, 2.0])
+    np.testing.assert_allclose(
+        row["inertia"],
+        np.diag([1 + 16, 4 + 16, 4 + 1]) * mass / 12, atol=1e-9)
+    assert row["closed"]
+
+
+def test_closed_welds_split_vertices():
+    verts, tris = box([0.0] * 3, [1.0] * 3)
+    split = verts[tris].reshape(-1, 3)
+    assert closed(split, np.arange(len(split)).reshape(-1, 3))
+
+
+def test_open_and_misoriented_meshes():
+    verts, tris = box([0.0] * 3, [1.0] * 3)
+    assert not closed(verts, tris[1:])
+    flipped = tris.copy()
+    flipped[0] = flipped[0, ::-1]
+    assert not closed(verts, flipped)
+
+
+def test_collapsed_slivers_are_ignored():
+    verts, tris = box([0.0] * 3, [1.0] * 3)
+    # A quantized sliver: its first two corners weld into one vertex
+    verts = np.vstack([verts, verts[0]])
+    sliver = np.array([[0, 8, 7]])
+    assert closed(verts, np.vstack([tris, sliver]))
+
+
+def test_shells_sharing_an_edge_are_closed():
+    va, ta = box([0.0, 0.0, 0.0], [1.0, 1.0, 1.0])
+    vb, tb = box([1.0, 1.0, 0.0], [2.0, 2.0, 1.0])
+    verts = np.vstack([va, vb])
+    assert closed(verts, np.vstack([ta, tb + len(va)]))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("meshoptimizer")
+
+from voltec_mesh.glb import MESHOPT, Glb  # noqa: E402
+from voltec_mesh.honeycomb import honeycomb_arrays  # noqa: E402
+from voltec_mesh.meshdata import volume  # noqa: E402
+from voltec_mesh.meshopt import POSITION_BITS, encode  # noqa: E402
+
+SHIFT = (0.5, -1.0, 2.0)
+
+
+@pytest.fixture
+def slab(make_glb):
+    verts, quads = honeycomb_arrays(0.06, 0.04, 0.002, 0.006, 0.0008, 0.003)
+    tris = np.vstack([quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]])
+    return make_glb(verts, tris, translation=SHIFT)
+
+
+def roundtrip(doc):
+    return Glb.from_bytes(encode(doc).to_bytes())
+
+
+def matched(v0, t0, v1, t1):
+    """Index into t1 of each triangle of t0 (meshopt reorders them), by
+    nearest centroid, and that distance."""
+    c0, c1 = v0[t0].mean(axis=1), v1[t1].mean(axis=1)
+    dist = np.linalg.norm(c0[:, None] - c1[None], axis=2)
+    return dist.argmin(axis=1), dist.min(axis=1)
+
+
+def test_declares_meshopt(slab):
+    gltf = roundtrip(slab).gltf
+    assert MESHOPT in gltf["extensionsRequired"]
+    assert all(MESHOPT in bv.get("extensions", {})
+               for bv in gltf["bufferViews"])
+
+
+def test_world_triangles_within_the_position_grid(slab):
+    v0, t0 = slab.world_triangles()
+    v1, t1 = roundtrip(slab).world_triangles()
+    assert len(t1) == len(t0)
+    step = np.ptp(v0, axis=0).max() / ((1 << POSITION_BITS) - 1)
+    match, dist = matched(v0, t0, v1, t1)
+    assert len(np.unique(match)) == len(t0)
+    assert dist.max() <= step
+    assert volume(v1, t1) == pytest.approx(volume(v0, t0), rel=1e-3)
+    np.testing.assert_allclose(v1.min(0), v0.min(0), atol=step)
+
+
+def test_normals_survive_byte_quantization(slab):
+    decoded = roundtrip(slab)
+    match, _ = matched(*slab.world_triangles(), *decoded.world_triangles())
+    before, after = slab.primitive(0, 0), decoded.primitive(0, 0)
+    n0 = before["NORMAL"][before["indices"]]
+    n1 = after["NORMAL"][after["indices"]][match]
+    # byte normals are good to ~1/127 per component
+    assert np.abs(n1 - n0).max() < 0.01
@@ -0,0 +1,5 @@
+# ============================================================================
+# voltec_mesh — shared mesh generation helpers for the Blender scripts under
+# docs/Products/*/V1/meshes/scripts. Scripts put docs/Products on sys.path and
+# import the submodules they need; bpy is only imported where it is used.
+# ============================================================================
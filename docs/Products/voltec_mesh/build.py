@@ -0,0 +1,534 @@
+# ============================================================================
+# build.py — Shared Blender build helpers for the product mesh scripts
+# Scene reset, PBR materials (shared library: materials.py), primitives,
+# booleans, join, polish, verify and GLB export. Cylinders, cones, boxes,
+# hex prisms, tori and lathed (r, z) profiles are written through the data
+# API (primitives.py, lathe.py) rather than bpy.ops. Every helper is
+# instrumented through instrument.measure(); call report(OBJ_NAME) at the end
+# of a script to print the per-helper timings.
+#
+# Usage from docs/Products/<Product>/V1/meshes/scripts/<Script>.py:
+#   sys.path.insert(0, os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "..", "..")))
+#   from voltec_mesh.build import clean_scene, add_cyl, bool_op, ...
+# ============================================================================
+import math
+import os
+import time
+
+import bpy
+import bmesh  # after bpy: the standalone bpy module registers bmesh on import
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from . import draco_bench, lathe, materials, meshdata, meshopt, primitives
+from .instrument import measure, report  # noqa: F401 (report re-exported)
+
+SCENE_NAME   = "Scene0"
+SMOOTH_ANGLE = math.radians(30)
+UV_ANGLE     = math.radians(66)
+# UNIONs whose operands stay farther apart than DISJOINT_GAP (m) are joined
+# as plain meshes instead of going through the EXACT solver
+ROUTE_DISJOINT = True
+DISJOINT_GAP   = 1e-5
+# 'ADAPTIVE' tries the FAST solver on convex cutters (up to FAST_MAX_TRIS
+# triangles) and keeps its result if its volume agrees to VOLUME_TOL with
+# the overlap meshdata.convex_overlap_volume() computes;
+# 'EXACT' always uses the EXACT solver
+SOLVER_POLICY  = 'ADAPTIVE'
+FAST_OPS       = {'DIFFERENCE', 'INTERSECT'}
+FAST_MAX_TRIS  = 2048
+VOLUME_TOL     = 1e-4
+SNAP_ULPS      = 16
+# verify() counts faces at or below this area (m²) as degenerate
+DEGENERATE_AREA = 1e-12
+
+# settings each material of the current scene was made with (make_material)
+_MATERIALS = {}
+
+
+# --- Scene -----------------------------------------------------------------
+def clean_scene():
+    with measure("clean_scene"):
+        bpy.ops.wm.read_factory_settings(use_empty=True)
+        scene = bpy.context.scene
+        scene.name = SCENE_NAME
+        scene.unit_settings.system = 'METRIC'
+        scene.unit_settings.scale_length = 1.0
+
+
+def make_material(name, base_color, metallic, roughness, alpha=1.0,
+                  emission=(0.0, 0.0, 0.0, 1.0), emission_strength=0.0,
+                  backface_culling=False):
+    """Principled BSDF material. Keyword names match the PBR dicts used by the
+    scripts, so `make_material(name, **PBR)` works. The node tree is built
+    once per build: a second call with the same name and settings returns
+    the material made by the first."""
+    settings = (tuple(base_color), metallic, roughness, alpha,
+                tuple(emission), emission_strength, backface_culling)
+    mat = bpy.data.materials.get(name)
+    if mat is not None and _MATERIALS.get(name) == settings:
+        return mat
+    with measure("make_material"):
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        mat.use_backface_culling = backface_culling
+        bsdf = mat.node_tree.nodes.get("Principled BSDF")
+        bsdf.inputs["Base Color"].default_value = base_color
+        bsdf.inputs["Metallic"].default_value = metallic
+        bsdf.inputs["Roughness"].default_value = roughness
+        bsdf.inputs["Alpha"].default_value = alpha
+        bsdf.inputs["Emission Color"].default_value = emission
+        bsdf.inputs["Emission Strength"].default_value = emission_strength
+        if alpha < 1.0:
+            mat.blend_method = 'BLEND'
+    _MATERIALS[mat.name] = settings
+    return mat
+
+
+def library_material(out_file, name, base_color, metallic, roughness,
+                     alpha=1.0, **kwargs):
+    """make_material() for the component exported to `out_file`, taking its
+    name, base colour and alpha ([properties].color) and metallic and
+    roughness (ALLOYS) from the shared library (materials.py). The
+    arguments stand in where the library has none; `name` also keys a
+    sidecar that gives no material name."""
+    entry = materials.component(out_file, hint=name)
+    if entry is not None:
+        name = entry["name"] or name
+        base_color, alpha = entry["base_color"], entry["alpha"]
+        if entry["metallic"] is not None:
+            metallic, roughness = entry["metallic"], entry["roughness"]
+    return make_material(name, base_color, metallic, roughness, alpha,
+                         **kwargs)
+
+
+def alloy_material(key, name, base_color, metallic, roughness, alpha=1.0,
+                   **kwargs):
+    """make_material() for materials.ALLOYS entry `key`, for the further
+    materials of a multi-material part: the library name and ALLOYS
+    metallic/roughness for `base_color`; an unknown key keeps the
+    arguments as they are."""
+    if materials.alloy_key(key) is None:
+        return make_material(name, base_color, metallic, roughness, alpha,
+                             **kwargs)
+    entry = materials.describe(key, (tuple(base_color), alpha))
+    return make_material(entry["name"], entry["base_color"], entry["metallic"],
+                         entry["roughness"], alpha, **kwargs)
+
+
+# --- Primitives ------------------------------------------------------------
+def _mesh(helper, name, arrays, loc, rot):
+    with measure(helper) as call:
+        verts, faces = arrays
+        obj = primitives.mesh_object(name, verts, faces, loc, rot)
+        call.output(obj)
+    return obj
+
+
+def _primitive(helper, name, add, **kwargs):
+    with measure(helper) as call:
+        add(**kwargs)
+        obj = bpy.context.active_object
+        obj.name = name
+        call.output(obj)
+    return obj
+
+
+def add_cyl(name, r, depth, loc=(0, 0, 0), rot=(0, 0, 0), segs=48):
+    return _mesh("add_cyl", name, primitives.cylinder_arrays(r, depth, segs),
+                 loc, rot)
+
+
+def add_cone(name, r1, r2, depth, loc=(0, 0, 0), rot=(0, 0, 0), segs=48):
+    return _mesh("add_cone", name,
+                 primitives.cone_arrays(r1, r2, depth, segs), loc, rot)
+
+
+def add_box(name, sx, sy, sz, loc=(0, 0, 0), rot=(0, 0, 0)):
+    """Box with full dimensions sx × sy × sz."""
+    return _mesh("add_box", name, primitives.box_arrays(sx, sy, sz), loc, rot)
+
+
+def add_hex_prism(name, r, depth, loc=(0, 0, 0), rot=(0, 0, 0)):
+    return _mesh("add_hex_prism", name,
+                 primitives.cylinder_arrays(r, depth, 6), loc, rot)
+
+
+def add_sphere(name, r, loc=(0, 0, 0), segs=16, rings=8):
+    return _primitive("add_sphere", name, bpy.ops.mesh.primitive_uv_sphere_add,
+                      radius=r, segments=segs, ring_count=rings, location=loc)
+
+
+def add_torus(name, major_r, minor_r, loc=(0, 0, 0), rot=(0, 0, 0),
+              major_segs=48, minor_segs=12):
+    return _mesh("add_torus", name,
+                 primitives.torus_arrays(major_r, minor_r, major_segs,
+                                         minor_segs), loc, rot)
+
+
+def add_lathe(name, profile, loc=(0, 0, 0), rot=(0, 0, 0), segs=48):
+    """Solid of revolution about local Z from one closed (r, z) outline or a
+    list of them (see lathe.py)."""
+    return _mesh("add_lathe", name, lathe.lathe_arrays(profile, segs),
+                 loc, rot)
+
+
+# --- Combining -------------------------------------------------------------
+def _tree(verts, tris):
+    return BVHTree.FromPolygons(verts.tolist(), tris.tolist(),
+                                all_triangles=True)
+
+
+def _inside(tree, points):
+    """True if any of `points` lies inside the closed surface in `tree`."""
+    for p in points:
+        loc, nrm, _, _ = tree.find_nearest(p)
+        if loc is not None and nrm.dot(p - np.array(loc)) < 0:
+            return True
+    return False
+
+
+def _disjoint(target, cutter):
+    """True if the two meshes neither touch nor nest, so their union is both
+    surfaces side by side. The cutter is inflated by DISJOINT_GAP so that
+    coplanar contact, which the triangle overlap test misses, counts."""
+    va, ta = meshdata.world_tris(target)
+    vb, tb = meshdata.world_tris(cutter, inflate=DISJOINT_GAP)
+    if not len(ta) or not len(tb):
+        return False
+    lo_a, hi_a, lo_b, hi_b = va.min(0), va.max(0), vb.min(0), vb.max(0)
+    if (lo_b > hi_a).any() or (lo_a > hi_b).any():
+        return True
+    tree_a, tree_b = _tree(va, ta), _tree(vb, tb)
+    if tree_a.overlap(tree_b):
+        return False
+    # No crossing surfaces: only nesting is left, and it needs nested bounds
+    if (lo_a <= lo_b).all() and (hi_b <= hi_a).all() and _inside(tree_a, vb):
+        return False
+    if (lo_b <= lo_a).all() and (hi_a <= hi_b).all() and _inside(tree_b, va):
+        return False
+    return True
+
+
+def _join_mesh(target, cutter):
+    """Append the cutter's faces to the target mesh, in target space."""
+    mesh = cutter.data.copy()
+    mesh.transform(target.matrix_basis.inverted() @ cutter.matrix_basis)
+    bm = bmesh.new()
+    bm.from_mesh(target.data)
+    bm.from_mesh(mesh)
+    bm.to_mesh(target.data)
+    bm.free()
+    bpy.data.meshes.remove(mesh)
+
+
+def _evaluate(target, cutter, op, solver):
+    """New mesh of `target` with a `solver` boolean of `cutter` applied; the
+    target keeps its own mesh and modifier stack."""
+    mod = target.modifiers.new(name=op, type='BOOLEAN')
+    mod.operation = op
+    mod.solver = solver
+    mod.object = cutter
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(target.evaluated_get(depsgraph))
+    target.modifiers.remove(mod)
+    return mesh
+
+
+def _snap_to_planes(mesh, target, cutter):
+    """Snap FAST's float intersection points back onto the operands' axis
+    planes: every coordinate within a few ulps of an input coordinate on
+    the same axis takes that value, as the EXACT solver's output would. Cap
+    and face contacts that later EXACT booleans meet head-on stay coplanar."""
+    ref = np.vstack([meshdata.vertices(target.data), meshdata.to_world(
+        meshdata.vertices(cutter.data),
+        target.matrix_basis.inverted() @ cutter.matrix_basis)])
+    ref = ref.astype(np.float32).astype(np.float64)
+    co = meshdata.vertices(mesh)
+    tol = SNAP_ULPS * np.spacing(np.float32(np.abs(ref).max(initial=1.0)))
+    for k in range(3):
+        vals = np.unique(ref[:, k])
+        i = np.clip(np.searchsorted(vals, co[:, k]), 1, max(len(vals) - 1, 1))
+        lo, hi = vals[i - 1], vals[np.minimum(i, len(vals) - 1)]
+        near = np.where(co[:, k] - lo < hi - co[:, k], lo, hi)
+        co[:, k] = np.where(np.abs(co[:, k] - near) <= tol, near, co[:, k])
+    mesh.vertices.foreach_set("co", co.astype(np.float32).ravel())
+    mesh.update()
+
+
+def _fast_boolean(target, cutter, op):
+    """FAST solver result of `op` as a new mesh and None, or None and the
+    reason the policy skipped FAST or its check rejected the result.
+
+    The check needs a manifold result whose volume matches the one the
+    operands imply: V(A ∩ B) from meshdata.convex_overlap_volume(), which
+    clips the target's triangles to the convex cutter without any boolean
+    solver, and V(A − B) = V(A) − V(A ∩ B)."""
+    vb, tb = meshdata.world_tris(cutter)
+    if len(tb) > FAST_MAX_TRIS or not meshdata.is_convex(vb, tb):
+        return None, "cutter not convex"
+    if (meshdata.non_manifold_edges(target.data)
+            or meshdata.non_manifold_edges(cutter.data)):
+        return None, "operand not manifold"
+    va, ta = meshdata.world_tris(target)
+    result = _evaluate(target, cutter, op, 'FAST')
+    _snap_to_planes(result, target, cutter)
+    vol_a, vol_b = meshdata.volume(va, ta), meshdata.volume(vb, tb)
+    vol_i = meshdata.convex_overlap_volume(va, ta, vb, tb)
+    vol_r = meshdata.volume(*meshdata.world_tris(target, result))
+    expected = vol_i if op == 'INTERSECT' else vol_a - vol_i
+    tol = VOLUME_TOL * (abs(vol_a) + abs(vol_b))
+    reason = None
+    if meshdata.non_manifold_edges(result):
+        reason = "non-manifold result"
+    elif abs(vol_r - expected) > tol:
+        reason = "volume mismatch"
+    if reason:
+        bpy.data.meshes.remove(result)
+        return None, reason
+    return result, None
+
+
+def _replace_mesh(obj, mesh):
+    old = obj.data
+    name = old.name
+    if not mesh.materials:
+        for mat in old.materials:
+            mesh.materials.append(mat)
+    obj.data = mesh
+    bpy.data.meshes.remove(old)
+    mesh.name = name
+
+
+def bool_op(target, cutter, op='UNION'):
+    """Boolean of `cutter` onto `target`, then delete cutter.
+
+    A UNION of operands that do not touch is routed to a plain mesh join.
+    Under the ADAPTIVE solver policy a convex cutter goes through the FAST
+    solver first and its result is kept only if it passes the volume check
+    in `_fast_boolean()`; everything else uses EXACT. The route, and why
+    FAST was passed over, is noted on the call's record."""
+    with measure("bool_op", target, cutter, op=op) as call:
+        plain = not target.modifiers and not cutter.modifiers
+        if (op == 'UNION' and ROUTE_DISJOINT and plain
+                and _disjoint(target, cutter)):
+            _join_mesh(target, cutter)
+            call.note(route='JOIN')
+        else:
+            mesh = None
+            if SOLVER_POLICY == 'ADAPTIVE' and plain and op in FAST_OPS:
+                t0 = time.perf_counter()
+                mesh, reason = _fast_boolean(target, cutter, op)
+                call.note(fast_seconds=time.perf_counter() - t0)
+                if reason:
+                    call.note(fallback=reason)
+            if mesh is not None:
+                _replace_mesh(target, mesh)
+                call.note(route='FAST')
+            else:
+                mod = target.modifiers.new(name=op, type='BOOLEAN')
+                mod.operation = op
+                mod.solver = 'EXACT'
+                mod.object = cutter
+                bpy.context.view_layer.objects.active = target
+                bpy.ops.object.modifier_apply(modifier=mod.name)
+                call.note(route='EXACT')
+        bpy.data.objects.remove(cutter, do_unlink=True)
+        call.output(target)
+
+
+def join_objects(objs):
+    """Join `objs` into objs[0] (materials are kept per face)."""
+    with measure("join_objects", *objs) as call:
+        bpy.ops.object.select_all(action='DESELECT')
+        for o in objs:
+            o.select_set(True)
+        bpy.context.view_layer.objects.active = objs[0]
+        bpy.ops.object.join()
+        obj = bpy.context.active_object
+        call.output(obj)
+    return obj
+
+
+# --- Finishing -------------------------------------------------------------
+def _islands(tris, n):
+    """(n,) label of the edge-connected island every vertex belongs to: the
+    lowest vertex index in it, by label propagation with pointer jumping."""
+    label = np.arange(n)
+    a, b = np.concatenate([tris[:, :2], tris[:, 1:]]).T
+    while True:
+        low = np.minimum(label[a], label[b])
+        new = label.copy()
+        np.minimum.at(new, a, low)
+        np.minimum.at(new, b, low)
+        new = new[new]
+        if (new == label).all():
+            return label
+        label = new
+
+
+def _orient_cavities(bm):
+    """normals_make_consistent turns every island outward, sealed cavities
+    included. Reverse each island whose winding disagrees with its nesting:
+    one wholly inside an odd number of other islands bounds a void and must
+    enclose negative volume. Returns the number of islands reversed."""
+    bm.verts.index_update()
+    loops = bm.calc_loop_triangles()
+    if not loops:
+        return 0
+    verts = np.array([v.co[:] for v in bm.verts])
+    tris = np.array([[l.vert.index for l in lt] for lt in loops])
+    label = _islands(tris, len(verts))
+    roots, tri_island = np.unique(label[tris[:, 0]], return_inverse=True)
+    if len(roots) < 2:
+        return 0
+    vert_island = np.searchsorted(roots, label)
+    depth = np.zeros(len(roots), dtype=int)
+    for j in range(len(roots)):
+        hit = meshdata.inside(verts, verts, tris[tri_island == j])
+        hit[vert_island == j] = True
+        enclosed = np.bincount(vert_island, hit, len(roots)) == \
+            np.bincount(vert_island, minlength=len(roots))
+        enclosed[j] = False
+        depth += enclosed
+    vol = np.array([meshdata.volume(verts, tris[tri_island == i])
+                    for i in range(len(roots))])
+    flip = np.nonzero((vol > 0) == (depth % 2 == 1))[0]
+    flip = flip[vol[flip] != 0]
+    if len(flip):
+        reverse = set(roots[flip].tolist())
+        bmesh.ops.reverse_faces(bm, faces=[
+            f for f in bm.faces if label[f.verts[0].index] in reverse])
+    return len(flip)
+
+
+def _smooth_by_angle(obj):
+    try:
+        bpy.ops.object.shade_smooth_by_angle(angle=SMOOTH_ANGLE)
+    except AttributeError:
+        # Blender < 4.1
+        bpy.ops.object.shade_smooth()
+        obj.data.use_auto_smooth = True
+        obj.data.auto_smooth_angle = SMOOTH_ANGLE
+
+
+def polish(obj, bevel=0.0, segments=2, merge=0.0, center_origin=False):
+    """Bevel (if `bevel` > 0) → consistent normals, sealed cavities facing in
+    → optional merge by distance → smart UV → smooth by 30° → apply
+    rotation/scale. `center_origin` also bakes the location and moves the
+    origin to the bounds center."""
+    with measure("polish", obj) as call:
+        bpy.ops.object.select_all(action='DESELECT')
+        obj.select_set(True)
+        bpy.context.view_layer.objects.active = obj
+        if bevel > 0.0:
+            mod = obj.modifiers.new(name="Bevel", type='BEVEL')
+            mod.width = bevel
+            mod.segments = segments
+            mod.limit_method = 'ANGLE'
+            mod.angle_limit = SMOOTH_ANGLE
+            bpy.ops.object.modifier_apply(modifier=mod.name)
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        bpy.ops.mesh.normals_make_consistent(inside=False)
+        bm = bmesh.from_edit_mesh(obj.data)
+        if _orient_cavities(bm):
+            bmesh.update_edit_mesh(obj.data)
+        if merge > 0.0:
+            bpy.ops.mesh.remove_doubles(threshold=merge)
+        bpy.ops.uv.smart_project(angle_limit=UV_ANGLE, island_margin=0.02)
+        bpy.ops.object.mode_set(mode='OBJECT')
+        _smooth_by_angle(obj)
+        bpy.ops.object.transform_apply(location=center_origin, rotation=True,
+                                       scale=True)
+        if center_origin:
+            bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
+        call.output(obj)
+
+
+def verify(obj):
+    """Measure `obj` in one NumPy pass over its mesh arrays, print the summary
+    line and return the stats dict: vertex/edge/face, quad, non-manifold and
+    degenerate-face (area ≤ DEGENERATE_AREA) counts, watertight flag, closed
+    volume (m³), surface area (m²) and world bounding box."""
+    with measure("verify", obj) as call:
+        mesh = obj.data
+        sizes = meshdata.face_sizes(mesh)
+        verts = meshdata.to_world(meshdata.vertices(mesh), obj.matrix_world)
+        tris, poly = meshdata.triangle_polygons(mesh)
+        face_area = np.bincount(poly, meshdata.triangle_areas(verts, tris),
+                                minlength=len(sizes))
+        lo, hi = (verts.min(0), verts.max(0)) if len(verts) else \
+            (np.zeros(3), np.zeros(3))
+        stats = {
+            "verts": len(mesh.vertices),
+            "edges": len(mesh.edges),
+            "faces": len(sizes),
+            "quads": int(np.count_nonzero(sizes == 4)),
+            "non_manifold": meshdata.non_manifold_edges(mesh),
+            "degenerate": int(np.count_nonzero(face_area <= DEGENERATE_AREA)),
+            "volume": meshdata.volume(verts, tris),
+            "area": float(face_area.sum()),
+            "bbox_min": lo.tolist(),
+            "bbox_max": hi.tolist(),
+        }
+        stats["watertight"] = stats["non_manifold"] == 0
+        call.output(obj)
+        call.note(stats=stats)
+    f = stats["faces"]
+    size = " x ".join(f"{d*1000:.1f}" for d in hi - lo)
+    print(f"[{obj.name}] V:{stats['verts']} E:{stats['edges']} F:{f} "
+          f"Quads:{stats['quads']}/{f} ({100*stats['quads']/max(f,1):.0f}%) "
+          f"NM:{stats['non_manifold']} "
+          f"Watertight:{'YES' if stats['watertight'] else 'NO'} "
+          f"Degenerate:{stats['degenerate']} "
+          f"Vol:{stats['volume']*1e6:.3f}cm3 Area:{stats['area']*1e4:.2f}cm2 "
+          f"BBox:{size}mm")
+    return stats
+
+
+def _write_glb(path, draco=None):
+    """Export the selection as Y-up GLB at `path`. `draco` is None for an
+    uncompressed file, or a dict of level and position/normal/texcoord
+    quantization bits (missing keys keep the exporter defaults)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    options = {}
+    if draco is not None:
+        options["export_draco_mesh_compression_level"] = draco["level"]
+        for attr in ("position", "normal", "texcoord"):
+            if attr in draco:
+                options[f"export_draco_{attr}_quantization"] = draco[attr]
+    bpy.ops.export_scene.gltf(
+        filepath=path, export_format='GLB', use_selection=True,
+        export_apply=True, export_normals=True, export_materials='EXPORT',
+        export_cameras=False, export_lights=False,
+        export_animations=False, export_yup=True,
+        export_draco_mesh_compression_enable=draco is not None, **options)
+
+
+def export(obj, path):
+    """Export `obj` alone as Draco-compressed, Y-up GLB at `path`, with the
+    level and quantization recorded in its sidecar's [asset].draco
+    (draco_bench.shipped()). With VOLTEC_MESH_RAW=<dir> set, also write it
+    uncompressed to <dir>/<obj name>.glb for the meshopt path; with
+    VOLTEC_MESH_DRACO_BENCH=<dir>, the draco_bench grid of variants under
+    <dir>/<obj name>/."""
+    draco = draco_bench.shipped(path)
+    with measure("export", obj) as call:
+        bpy.ops.object.select_all(action='DESELECT')
+        obj.select_set(True)
+        bpy.context.view_layer.objects.active = obj
+        _write_glb(path, draco)
+        call.output(obj)
+        call.note(bytes=os.path.getsize(path), draco=draco)
+    print(f"[{obj.name}] Exported: {path} "
+          f"({os.path.getsize(path)/1024:.1f} KB)")
+    raw_dir = os.environ.get(meshopt.RAW_ENV)
+    if raw_dir:
+        with measure("export_raw", obj):
+            _write_glb(os.path.join(raw_dir, f"{obj.name}.glb"))
+    bench_dir = os.environ.get(draco_bench.BENCH_ENV)
+    if bench_dir:
+        with measure("draco_bench", obj):
+            draco_bench.export_grid(os.path.join(bench_dir, obj.name),
+                                    _write_glb, draco)
@@ -0,0 +1,237 @@
+# ============================================================================
+# bundle.py — One GLB per product from its component GLBs and sidecars
+# A product page loads every component GLB listed by the .glb.toml files in
+# <Product>/V1 — one request and one parse per part. bundle() merges them
+# into <Product>/V1/meshes/<Prefix>_V1.glb (VCell_V1.glb, VPump_V1.glb …):
+#   - one root node per sidecar, named like it (VCell_Housing for
+#     VCell_Housing.glb.toml), carrying the sidecar's [transform] as its
+#     translation / rotation / scale and the sidecar file in its extras;
+#     the component's own nodes hang below it
+#   - one BIN chunk: the component buffers are appended as stored, so Draco
+#     and meshopt compressed views are copied without re-encoding
+#   - materials de-duplicated by content (everything but the name), so
+#     components on one shared library material (materials.py) reference
+#     a single copy by index
+#   - extensionsUsed / extensionsRequired merged
+# Textures, skins and animations are not used by the catalogue and are
+# rejected rather than silently dropped.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.bundle                  # every product
+#   python -m voltec_mesh.bundle V-Cell -o /tmp   # one product elsewhere
+# ============================================================================
+import argparse
+import copy
+import json
+import os
+import sys
+
+from . import sidecar
+from .glb import DRACO, INSTANCING, MESHOPT, Glb
+
+UNSUPPORTED = ("textures", "images", "samplers", "skins", "animations",
+               "cameras")
+
+
+def bundle_name(sidecars):
+    """<Prefix>_V1.glb from the sidecars' common name prefix ("VCell")."""
+    prefixes = {sidecar.name(p).split("_", 1)[0] for p in sidecars}
+    if len(prefixes) != 1:
+        raise ValueError(f"sidecars do not share a prefix: {sorted(prefixes)}")
+    return f"{prefixes.pop()}_V1.glb"
+
+
+def _material_key(material):
+    return json.dumps({k: v for k, v in material.items() if k != "name"},
+                      sort_keys=True)
+
+
+class _Bundle:
+    """Glb being assembled, with the index maps of the part added last."""
+
+    def __init__(self, name):
+        self.doc = Glb({"asset": {"version": "2.0",
+                                  "generator": "voltec_mesh.bundle"},
+                        "scene": 0, "scenes": [{"name": name, "nodes": []}],
+                        "nodes": [], "meshes": [], "materials": [],
+                        "accessors": [], "bufferViews": [],
+                        "buffers": [{"byteLength": 0}]})
+        self.bin = bytearray()
+        self.materials = {}
+        self.used, self.required = [], []
+
+    def _buffers(self, part):
+        """New index of each buffer of `part`; buffer 0 (the BIN chunk) is
+        appended to the bundle's, others (meshopt fallbacks) are copied."""
+        gltf = self.doc.gltf
+        self.bin += b"\0" * (-len(self.bin) % 4)
+        offset = len(self.bin)
+        self.bin += part.bin
+        index = [0]
+        for buf in part.gltf.get("buffers", [])[1:]:
+            if "uri" in buf:
+                raise ValueError("external buffers cannot be bundled")
+            gltf["buffers"].append(copy.deepcopy(buf))
+            index.append(len(gltf["buffers"]) - 1)
+        return index, offset
+
+    def add(self, name, part, transform, extras):
+        """Add the default scene of `part` under a root node `name`."""
+        gltf, src = self.doc.gltf, part.gltf
+        for key in UNSUPPORTED:
+            if src.get(key):
+                raise ValueError(f"{name}: bundling {key} is not supported")
+        buffers, offset = self._buffers(part)
+        views = len(gltf["bufferViews"])
+        for bv in src.get("bufferViews", []):
+            bv = copy.deepcopy(bv)
+            if bv["buffer"] == 0:
+                bv["byteOffset"] = bv.get("byteOffset", 0) + offset
+            bv["buffer"] = buffers[bv["buffer"]]
+            ext = bv.get("extensions", {}).get(MESHOPT)
+            if ext is not None:
+                if ext["buffer"] == 0:
+                    ext["byteOffset"] = ext.get("byteOffset", 0) + offset
+                ext["buffer"] = buffers[ext["buffer"]]
+            gltf["bufferViews"].append(bv)
+        accessors = len(gltf["accessors"])
+        for acc in src.get("accessors", []):
+            acc = copy.deepcopy(acc)
+            if "bufferView" in acc:
+                acc["bufferView"] += views
+            gltf["accessors"].append(acc)
+        materials = []
+        for mat in src.get("materials", []):
+            key = _material_key(mat)
+            if key not in self.materials:
+                gltf["materials"].append(copy.deepcopy(mat))
+                self.materials[key] = len(gltf["materials"]) - 1
+            materials.append(self.materials[key])
+        meshes = len(gltf["meshes"])
+        for mesh in src.get("meshes", []):
+            mesh = copy.deepcopy(mesh)
+            for prim in mesh["primitives"]:
+                prim["attributes"] = {k: v + accessors
+                                      for k, v in prim["attributes"].items()}
+                if "indices" in prim:
+                    prim["indices"] += accessors
+                if "material" in prim:
+                    prim["material"] = materials[prim["material"]]
+                for target in prim.get("targets", []):
+                    for k in target:
+                        target[k] += accessors
+                draco = prim.get("extensions", {}).get(DRACO)
+                if draco is not None:
+                    draco["bufferView"] += views
+            gltf["meshes"].append(mesh)
+        nodes = len(gltf["nodes"])
+        for node in src.get("nodes", []):
+            node = copy.deepcopy(node)
+            if "mesh" in node:
+                node["mesh"] += meshes
+            if "children" in node:
+                node["children"] = [c + nodes for c in node["children"]]
+            inst = node.get("extensions", {}).get(INSTANCING)
+            if inst is not None:
+                inst["attributes"] = {k: v + accessors
+                                      for k, v in inst["attributes"].items()}
+            gltf["nodes"].append(node)
+        scenes = src.get("scenes") or [
+            {"nodes": list(range(len(src.get("nodes", []))))}]
+        roots = scenes[src.get("scene", 0)]["nodes"]
+        root = {"name": name, "children": [r + nodes for r in roots],
+                "extras": extras, **transform}
+        gltf["nodes"].append(root)
+        gltf["scenes"][0]["nodes"].append(len(gltf["nodes"]) - 1)
+        for key, merged in (("extensionsUsed", self.used),
+                            ("extensionsRequired", self.required)):
+            merged += [e for e in src.get(key, []) if e not in merged]
+
+    def finish(self):
+        gltf = self.doc.gltf
+        for key, merged in (("extensionsUsed", self.used),
+                            ("extensionsRequired", self.required)):
+            if merged:
+                gltf[key] = merged
+        if not gltf["materials"]:
+            del gltf["materials"]
+        self.doc.bin = bytes(self.bin)
+        return self.doc
+
+
+def transform(data):
+    """glTF TRS of a sidecar's [transform] (Y-up, quaternion x, y, z, w)."""
+    t = data.get("transform", {})
+    out = {}
+    for key, gltf_key, identity in (("position", "translation", [0, 0, 0]),
+                                    ("rotation", "rotation", [0, 0, 0, 1]),
+                                    ("scale", "scale", [1, 1, 1])):
+        value = [float(v) for v in t.get(key, identity)]
+        if value != identity:
+            out[gltf_key] = value
+    return out
+
+
+def merge(components, scene_name):
+    """One Glb from (sidecar path, sidecar data, GLB path, mesh as written
+    in the sidecar) tuples."""
+    merged = _Bundle(scene_name)
+    for path, data, glb, mesh in components:
+        merged.add(sidecar.name(path), Glb.read(glb), transform(data),
+                   {"sidecar": os.path.basename(path), "mesh": mesh})
+    return merged.finish()
+
+
+def bundle(sidecars, out_path=None):
+    """Merge the GLBs of `sidecars` (one product) into one GLB; returns its
+    path and one row per component (name, mesh, bytes). Components whose
+    mesh is missing are listed with mesh None and left out."""
+    if not sidecars:
+        raise ValueError("no sidecars to bundle")
+    v1 = os.path.dirname(os.path.abspath(sidecars[0]))
+    name = bundle_name(sidecars)
+    out_path = out_path or os.path.join(v1, "meshes", name)
+    components, rows = [], []
+    for path in sidecars:
+        data = sidecar.load(path)
+        glb = sidecar.mesh_file(path, data)
+        rows.append({"name": sidecar.name(path), "mesh": glb,
+                     "bytes": os.path.getsize(glb) if glb else 0})
+        if glb is not None:
+            components.append((path, data, glb, data["asset"]["mesh"]))
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    merge(components, os.path.splitext(name)[0]).write(out_path)
+    return out_path, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.bundle",
+        description="Merge each product's component GLBs into one GLB.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("-o", "--out", default=None,
+                        help="directory for the bundles (default: each "
+                             "product's V1/meshes)")
+    args = parser.parse_args(argv)
+
+    by_product = sidecar.by_product(sidecar.discover(args.products))
+    if not by_product:
+        parser.error("no sidecars found")
+    status = 0
+    for paths in by_product.values():
+        out = args.out and os.path.join(args.out, bundle_name(paths))
+        out, rows = bundle(paths, out)
+        missing = [r["name"] for r in rows if r["mesh"] is None]
+        parts = sum(r["bytes"] for r in rows)
+        print(f"{out}: {len(rows) - len(missing)} components, "
+              f"{parts/1024:.1f} KB in parts -> "
+              f"{os.path.getsize(out)/1024:.1f} KB")
+        if missing:
+            print(f"  missing meshes: {', '.join(missing)}")
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
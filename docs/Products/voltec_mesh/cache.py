@@ -0,0 +1,223 @@
+# ============================================================================
+# cache.py — Content-addressed build cache for the catalogue GLBs
+# A script's key hashes everything its GLB depends on:
+#   - the script's syntax tree (comments and formatting do not count)
+#   - its resolved UPPER_CASE module-level constants (STATOR_R, FIN_COUNT…)
+#   - the syntax trees of the voltec_mesh modules it imports, transitively
+#   - the Blender version string and output options (the codec)
+#   - the material names and colours in its product's sidecars, which
+#     build.library_material() reads (materials.py)
+# After a build the GLB is stored under <dir>/objects/<sha256>.glb and the
+# key's manifest under <dir>/keys/<key>.json. On the next build a matching
+# key skips the script: the GLB on disk is kept if its hash matches, or
+# restored from the objects directory if it was changed or deleted.
+# Manifests keep the constants, so a miss can name the ones that changed.
+# ============================================================================
+import ast
+import hashlib
+import json
+import math
+import os
+import shutil
+import subprocess
+
+PACKAGE_DIR   = os.path.dirname(os.path.abspath(__file__))
+PACKAGE       = os.path.basename(PACKAGE_DIR)
+CACHE_VERSION = 1
+
+_EVAL_BUILTINS = {f.__name__: f for f in
+                  (abs, float, int, len, max, min, range, round, tuple)}
+
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _parse(path):
+    with open(path, encoding="utf-8") as f:
+        return ast.parse(f.read(), filename=path)
+
+
+def constants(tree):
+    """UPPER_CASE module-level names whose values resolve from literals,
+    `math` and earlier constants, e.g. {"FIN_COUNT": 20, "FIN_PITCH": 0.06}.
+    Anything else (paths, calls into bpy) is left out."""
+    scope = {"math": math}
+    found = {}
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        try:
+            value = eval(compile(ast.Expression(node.value), "<const>", "eval"),
+                         {"__builtins__": _EVAL_BUILTINS}, dict(scope))
+        except Exception:
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                names, values = [target.id], [value]
+            elif (isinstance(target, ast.Tuple)
+                  and all(isinstance(e, ast.Name) for e in target.elts)
+                  and isinstance(value, tuple)
+                  and len(value) == len(target.elts)):
+                names, values = [e.id for e in target.elts], list(value)
+            else:
+                continue
+            for name, val in zip(names, values):
+                if name.isupper() and isinstance(
+                        val, (bool, int, float, str, tuple)):
+                    scope[name] = found[name] = val
+    return found
+
+
+def _imported_modules(tree, package_relative):
+    """voltec_mesh module names imported by `tree`. Inside the package
+    (`package_relative`) relative imports count too."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            if node.level and package_relative:
+                if node.module:
+                    names.add(node.module.split(".")[0])
+                else:
+                    names.update(a.name for a in node.names)
+            elif node.module and node.module.split(".")[0] == PACKAGE:
+                parts = node.module.split(".")
+                if len(parts) > 1:
+                    names.add(parts[1])
+                else:
+                    names.update(a.name for a in node.names)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                parts = alias.name.split(".")
+                if parts[0] == PACKAGE and len(parts) > 1:
+                    names.add(parts[1])
+    return {n for n in names
+            if os.path.exists(os.path.join(PACKAGE_DIR, n + ".py"))}
+
+
+def helper_modules(tree):
+    """{module: syntax-tree hash} for every voltec_mesh module a script
+    reaches through its imports."""
+    todo = sorted(_imported_modules(tree, False))
+    seen = {}
+    while todo:
+        name = todo.pop()
+        if name in seen:
+            continue
+        mod_tree = _parse(os.path.join(PACKAGE_DIR, name + ".py"))
+        seen[name] = hashlib.sha256(ast.dump(mod_tree).encode()).hexdigest()
+        todo += sorted(_imported_modules(mod_tree, True) - seen.keys())
+    return dict(sorted(seen.items()))
+
+
+def blender_version(blender):
+    """First line of `blender --version`, e.g. "Blender 4.4.0"."""
+    out = subprocess.run([blender, "--version"], capture_output=True,
+                         text=True, errors="replace", timeout=120).stdout
+    return next((line.strip() for line in out.splitlines()
+                 if line.startswith("Blender")), out.strip())
+
+
+def script_key(script, blender_ver, **options):
+    """(key, inputs) for `script`; `inputs` is what the key hashes.
+    `options` are build settings that change the output, such as the
+    codec."""
+    tree = _parse(script)
+    inputs = {
+        "version": CACHE_VERSION,
+        "blender": blender_ver,
+        "script": hashlib.sha256(ast.dump(tree).encode()).hexdigest(),
+        "constants": constants(tree),
+        "modules": helper_modules(tree),
+        "options": options,
+    }
+    blob = json.dumps(inputs, sort_keys=True, default=repr).encode()
+    return hashlib.sha256(blob).hexdigest(), inputs
+
+
+class BuildCache:
+    """Key → GLB store rooted at `root`; see the module header."""
+
+    def __init__(self, root):
+        self.root = root
+        self.keys_dir = os.path.join(root, "keys")
+        self.objects_dir = os.path.join(root, "objects")
+        self.latest_dir = os.path.join(root, "latest")
+        for d in (self.keys_dir, self.objects_dir, self.latest_dir):
+            os.makedirs(d, exist_ok=True)
+
+    def _manifest(self, key):
+        path = os.path.join(self.keys_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def lookup(self, key):
+        """("hit", row) if the GLB on disk is the cached one, ("restored",
+        row) after copying it back from the object store, or (None, None)."""
+        manifest = self._manifest(key)
+        if manifest is None:
+            return None, None
+        glb, digest = manifest["row"]["glb"], manifest["glb_sha256"]
+        obj = os.path.join(self.objects_dir, f"{digest}.glb")
+        if os.path.exists(glb) and sha256_file(glb) == digest:
+            return "hit", manifest["row"]
+        if not os.path.exists(obj):
+            return None, None
+        os.makedirs(os.path.dirname(glb), exist_ok=True)
+        shutil.copyfile(obj, glb)
+        return "restored", manifest["row"]
+
+    def store(self, key, inputs, row):
+        """Record a successful build's GLB and summary row under `key`."""
+        digest = sha256_file(row["glb"])
+        obj = os.path.join(self.objects_dir, f"{digest}.glb")
+        if not os.path.exists(obj):
+            shutil.copyfile(row["glb"], obj)
+        manifest = {"key": key, "inputs": inputs, "glb_sha256": digest,
+                    "row": row}
+        with open(os.path.join(self.keys_dir, f"{key}.json"), "w") as f:
+            json.dump(manifest, f, indent=1, default=repr)
+        with open(os.path.join(self.latest_dir, f"{row['name']}.json"),
+                  "w") as f:
+            json.dump(manifest, f, indent=1, default=repr)
+
+    def previous(self, name):
+        """Stored GLB of the last successful build of `name`, or None."""
+        path = os.path.join(self.latest_dir, f"{name}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            digest = json.load(f)["glb_sha256"]
+        obj = os.path.join(self.objects_dir, f"{digest}.glb")
+        return obj if os.path.exists(obj) else None
+
+    def changes(self, name, inputs):
+        """What differs from the last stored build of `name`, as short
+        strings ("FIN_COUNT 20 -> 24", "module build", "script")."""
+        path = os.path.join(self.latest_dir, f"{name}.json")
+        if not os.path.exists(path):
+            return ["not built before"]
+        with open(path) as f:
+            old = json.load(f)["inputs"]
+        new = json.loads(json.dumps(inputs, default=repr))
+        out = []
+        for k in sorted(old["constants"].keys() | new["constants"].keys()):
+            a, b = old["constants"].get(k), new["constants"].get(k)
+            if a != b:
+                out.append(f"{k} {a} -> {b}")
+        for m in sorted(old["modules"].keys() | new["modules"].keys()):
+            if old["modules"].get(m) != new["modules"].get(m):
+                out.append(f"module {m}")
+        if not out and old["script"] != new["script"]:
+            out.append("script")
+        if old.get("options") != new["options"]:
+            out.append(f"options {old.get('options')} -> {new['options']}")
+        if old["blender"] != new["blender"]:
+            out.append(f"blender {old['blender']} -> {new['blender']}")
+        return out
@@ -0,0 +1,388 @@
+# ============================================================================
+# catalogue.py — Parallel catalogue build across headless Blender processes
+# Discovers every docs/Products/*/V1/meshes/scripts/*.py, runs each one as
+# `blender --background --python <script>` on a pool of JOBS processes and
+# captures its output to <out>/logs/<name>.log. The verify() and export()
+# lines are parsed into one summary row per script (time, vertex/face
+# counts, watertight, GLB size) and the per-helper instrument stats land in
+# <out>/stats/<name>.json. Runs under plain Python; bpy is not imported.
+# With --warm the scripts go to long-lived Blender workers (worker.py)
+# instead of one fresh Blender each, which skips the per-script startup.
+# Scripts whose cache key (cache.py) matches a stored build are skipped and
+# their GLB kept or restored; --force rebuilds everything. --codec auto
+# re-encodes each GLB with meshopt (meshopt.py) where that is cheaper to
+# deliver than Draco; --codec meshopt always does. --instance turns repeated
+# parts into EXT_mesh_gpu_instancing (instancing.py). --lods then writes the
+# LOD chain of every built GLB and lists it in its sidecar (lod.py),
+# --bundle merges each product into one <Prefix>_V1.glb (bundle.py) and
+# --stream writes each product as a coarse-first stream (stream.py; it
+# implies --lods). --diff compares every rebuilt GLB with the one its
+# previous build left in the cache (geomdiff.py) and notes what moved.
+# The product sidecars are validated first (schema.py); errors stop the
+# build unless --no-validate is given.
+#
+# Usage (from docs/Products):
+#   python -m voltec_mesh.catalogue                 # every product, all cores
+#   python -m voltec_mesh.catalogue -j 4 V-Pump     # one product, 4 Blenders
+#   python -m voltec_mesh.catalogue -k Hex Motor    # scripts matching names
+#   python -m voltec_mesh.catalogue --warm          # reuse warm Blenders
+# ============================================================================
+import argparse
+import glob
+import json
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import (bundle, draco_bench, geomdiff, lod, materials, schema,
+               sidecar, stream)
+from .cache import BuildCache, blender_version, script_key
+from .instrument import STATS_ENV
+from .meshopt import RAW_ENV, choose
+from .worker import MAX_JOBS, Worker, WorkerError
+
+PRODUCTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_GLOB = os.path.join("*", "V1", "meshes", "scripts", "*.py")
+OUT_DIR      = os.path.join(PRODUCTS_DIR, ".build")
+BLENDER_ENV  = "VOLTEC_BLENDER"
+BLENDER_WIN  = r"C:\Program Files\Blender Foundation\Blender 4.4\blender.exe"
+TIMEOUT      = 1800
+
+VERIFY_RE = re.compile(
+    r"^\[(?P<obj>[^\]]+)\] V:(?P<verts>\d+) E:(?P<edges>\d+) F:(?P<faces>\d+)"
+    r" Quads:(?P<quads>\d+)/\d+ .*NM:(?P<non_manifold>\d+)"
+    r" Watertight:(?P<watertight>YES|NO)"
+    r"(?: Degenerate:(?P<degenerate>\d+) Vol:(?P<volume>\S+)cm3"
+    r" Area:(?P<area>\S+)cm2)?", re.M)
+EXPORT_RE = re.compile(r"^\[[^\]]+\] Exported: (?P<path>.+) \([\d.]+ KB\)$",
+                       re.M)
+
+
+def blender_path():
+    """Blender executable: $VOLTEC_BLENDER, then PATH, then the default
+    Windows install used by the product workflow."""
+    path = os.environ.get(BLENDER_ENV) or shutil.which("blender")
+    if path:
+        return path
+    if os.path.exists(BLENDER_WIN):
+        return BLENDER_WIN
+    raise FileNotFoundError(
+        f"Blender not found; set {BLENDER_ENV} or put blender on PATH")
+
+
+def discover(products=(), match=()):
+    """Script paths sorted by product then name. `products` limits the
+    product directories, `match` keeps scripts whose name contains any of the
+    given substrings."""
+    scripts = sorted(glob.glob(os.path.join(PRODUCTS_DIR, SCRIPTS_GLOB)))
+    if products:
+        scripts = [s for s in scripts
+                   if os.path.relpath(s, PRODUCTS_DIR).split(os.sep)[0]
+                   in products]
+    if match:
+        scripts = [s for s in scripts
+                   if any(m in os.path.basename(s) for m in match)]
+    return scripts
+
+
+def script_name(script):
+    return os.path.splitext(os.path.basename(script))[0]
+
+
+def parse_output(text):
+    """verify() counts and the exported GLB path from a script's stdout."""
+    row = {}
+    found = VERIFY_RE.search(text)
+    if found:
+        row["object"] = found["obj"]
+        row.update({k: int(found[k]) for k in
+                    ("verts", "edges", "faces", "quads", "non_manifold")})
+        row["watertight"] = found["watertight"] == "YES"
+        if found["degenerate"] is not None:
+            row["degenerate"] = int(found["degenerate"])
+            row["volume"] = float(found["volume"]) * 1e-6
+            row["area"] = float(found["area"]) * 1e-4
+    found = EXPORT_RE.search(text)
+    if found:
+        row["glb"] = found["path"]
+        if os.path.exists(found["path"]):
+            row["glb_bytes"] = os.path.getsize(found["path"])
+    return row
+
+
+def _build_env(out_dir, raw=False):
+    env = dict(os.environ, **{STATS_ENV: os.path.join(out_dir, "stats")})
+    if raw:
+        env[RAW_ENV] = os.path.join(out_dir, "raw")
+    return env
+
+
+def _run_cold(script, blender, env, threads, timeout):
+    cmd = [blender, "--background", "--factory-startup"]
+    if threads:
+        cmd += ["--threads", str(threads)]
+    cmd += ["--python-exit-code", "1", "--python", script]
+    try:
+        proc = subprocess.run(cmd, env=env, capture_output=True, text=True,
+                              errors="replace", timeout=timeout)
+        return proc.stdout + proc.stderr, proc.returncode
+    except subprocess.TimeoutExpired as exc:
+        out = exc.stdout or ""
+        if isinstance(out, bytes):    # bytes on POSIX, str on Windows
+            out = out.decode(errors="replace")
+        return out + f"\n[catalogue] timed out after {timeout} s\n", None
+
+
+def _run_warm(script, workers, timeout):
+    worker = workers.get()
+    try:
+        msg, text = worker.run(script, timeout)
+    except WorkerError as exc:
+        return f"[catalogue] {exc}\n", None
+    finally:
+        workers.put(worker)
+    if msg["error"]:
+        text += f"\n[catalogue] {msg['error'].splitlines()[-1]}\n"
+    return text, 0 if msg["error"] is None else 1
+
+
+def run_script(script, blender, out_dir, threads=0, timeout=TIMEOUT,
+               workers=None, codec="draco", instance=False):
+    """Build one script and return its summary row: in its own headless
+    Blender, or on a warm Worker taken from the `workers` queue. The full
+    output goes to <out_dir>/logs/<name>.log. Unless `codec` is "draco"
+    and `instance` is off, the GLB then goes through meshopt.choose()."""
+    name = script_name(script)
+    log_path = os.path.join(out_dir, "logs", f"{name}.log")
+    t0 = time.perf_counter()
+    if workers is None:
+        text, code = _run_cold(script, blender,
+                               _build_env(out_dir, codec != "draco"
+                                          or instance), threads, timeout)
+    else:
+        text, code = _run_warm(script, workers, timeout)
+    seconds = time.perf_counter() - t0
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    row = {"name": name, "script": script, "seconds": seconds,
+           "returncode": code, "log": log_path, **parse_output(text)}
+    row["ok"] = code == 0 and "glb_bytes" in row
+    if row["ok"] and (codec != "draco" or instance) and "object" in row:
+        raw = os.path.join(out_dir, "raw", f"{row['object']}.glb")
+        row.update(choose(raw, row["glb"], codec, instance))
+        row["glb_bytes"] = os.path.getsize(row["glb"])
+    return row
+
+
+def build(scripts, jobs=None, blender=None, out_dir=OUT_DIR, timeout=TIMEOUT,
+          warm=False, max_jobs=MAX_JOBS, cache=True, force=False,
+          codec="draco", instance=False, diff=False, progress=print):
+    """Run `scripts` on `jobs` concurrent Blender processes (default: one per
+    core) and return the summary rows in script order. Each Blender gets
+    cores // jobs threads so the pool does not oversubscribe the machine.
+    `warm` keeps `jobs` Worker processes alive across scripts, each one
+    restarted after `max_jobs` scripts. With `cache`, scripts whose key is
+    in <out_dir>/cache are not run; their row carries cache "hit" (GLB on
+    disk unchanged) or "restored", the built ones "miss" and the inputs
+    that changed. `force` runs every script but still records the results.
+    `codec` is "draco", "meshopt" or "auto" and `instance` enables GPU
+    instancing (see meshopt.choose()). With `diff` (and the cache), each
+    rebuilt GLB is compared with its previous build (geomdiff.py) and the
+    result stored in the row's "geometry"."""
+    blender = blender or blender_path()
+    for sub in ("logs", "stats"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+    rows, keys = {}, {}
+    store = BuildCache(os.path.join(out_dir, "cache")) if cache else None
+    if store is not None:
+        version = blender_version(blender)
+        for s in scripts:
+            key, inputs = script_key(s, version, codec=codec,
+                                     instance=instance,
+                                     materials=materials.fingerprint(s),
+                                     draco=draco_bench.fingerprint(s))
+            status, row = (None, None) if force else store.lookup(key)
+            if status:
+                rows[s] = dict(row, seconds=0.0, cache=status)
+                progress(f"[cache] {row['name']:<34} {status}")
+            else:
+                keys[s] = key, inputs
+        scripts_to_run = [s for s in scripts if s not in rows]
+    else:
+        scripts_to_run = list(scripts)
+    if not scripts_to_run:
+        return [rows[s] for s in scripts]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(scripts_to_run)))
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+    workers = None
+    if warm:
+        workers = queue.Queue()
+        for _ in range(jobs):
+            workers.put(Worker(blender, _build_env(
+                out_dir, codec != "draco" or instance), threads, max_jobs))
+    n = len(scripts_to_run)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(run_script, s, blender, out_dir, threads,
+                                   timeout, workers, codec, instance): s
+                       for s in scripts_to_run}
+            for done, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                script = futures[future]
+                if store is not None:
+                    key, inputs = keys[script]
+                    row["cache"] = "miss"
+                    row["changes"] = store.changes(row["name"], inputs)
+                    previous = store.previous(row["name"])
+                    if row["ok"]:
+                        store.store(key, inputs, row)
+                    if diff and row["ok"] and previous is not None:
+                        row["geometry"] = geomdiff.compare(previous,
+                                                           row["glb"])
+                rows[script] = row
+                progress(f"[{done:>{len(str(n))}}/{n}] "
+                         f"{row['name']:<34} {row['seconds']:7.1f} s "
+                         f"{'ok' if row['ok'] else 'FAILED'}")
+    finally:
+        while workers is not None and not workers.empty():
+            workers.get().stop()
+    return [rows[s] for s in scripts]
+
+
+def summary_table(rows, wall=None):
+    """Fixed-width summary table of the rows returned by `build()`."""
+    lines = [f"{'script':<34} {'time s':>7} {'verts':>7} {'faces':>7} "
+             f"{'NM':>4} {'tight':>5} {'GLB KB':>8}"]
+    for r in rows:
+        tight = "-" if "watertight" not in r else (
+            "YES" if r["watertight"] else "NO")
+        size = f"{r['glb_bytes']/1024:8.1f}" if "glb_bytes" in r else \
+            f"{'-':>8}"
+        note = "" if r["ok"] else "  FAILED"
+        if "codec" in r:
+            note += f"  [{r['codec']}]"
+        if r.get("instanced"):
+            note += "  [" + ", ".join(f"{p['instances']}x{p['vertices']}"
+                                      for p in r["instanced"]) + " instanced]"
+        if r.get("cache") in ("hit", "restored"):
+            note += f"  (cache {r['cache']})"
+        elif r.get("changes"):
+            note += "  (" + ", ".join(r["changes"][:3]) + (
+                ", ..." if len(r["changes"]) > 3 else "") + ")"
+        if "geometry" in r:
+            note += f"  [{geomdiff.describe(r['geometry'])}]"
+        lines.append(f"{r['name']:<34} {r['seconds']:7.1f} "
+                     f"{r.get('verts', '-'):>7} {r.get('faces', '-'):>7} "
+                     f"{r.get('non_manifold', '-'):>4} {tight:>5} {size}"
+                     + note)
+    cpu = sum(r["seconds"] for r in rows)
+    total = f"{len(rows)} scripts, {cpu:.1f} s in Blender"
+    if wall:
+        total += f", {wall:.1f} s wall ({cpu / wall:.1f}x)"
+    cached = [r.get("cache") for r in rows]
+    if any(cached):
+        total += (f", cache: {cached.count('hit')} hit, "
+                  f"{cached.count('restored')} restored, "
+                  f"{cached.count('miss')} miss")
+    failed = sum(not r["ok"] for r in rows)
+    if failed:
+        total += f", {failed} FAILED"
+    lines.append(total)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.catalogue",
+        description="Build the product meshes on a pool of headless Blenders.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories to build (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="concurrent Blender processes (default: cores)")
+    parser.add_argument("-k", "--match", nargs="+", default=(),
+                        help="only scripts whose name contains one of these")
+    parser.add_argument("--blender", default=None,
+                        help=f"Blender executable (default: ${BLENDER_ENV}, "
+                             "PATH, then the Windows install)")
+    parser.add_argument("-o", "--out", default=OUT_DIR,
+                        help="directory for logs/, stats/ and summary.json")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT,
+                        help="seconds before a script is killed")
+    parser.add_argument("--warm", action="store_true",
+                        help="run scripts on long-lived Blender workers")
+    parser.add_argument("--max-jobs", type=int, default=MAX_JOBS,
+                        help="scripts per warm worker before it restarts")
+    parser.add_argument("--codec", choices=("draco", "meshopt", "auto"),
+                        default="draco",
+                        help="GLB compression; auto keeps the cheaper of "
+                             "Draco and meshopt per asset")
+    parser.add_argument("--instance", action="store_true",
+                        help="write repeated parts as GPU instances "
+                             "(EXT_mesh_gpu_instancing, meshopt encoded)")
+    parser.add_argument("--force", action="store_true",
+                        help="run every script, ignoring cache hits")
+    parser.add_argument("--diff", action="store_true",
+                        help="compare each rebuilt GLB with its previous "
+                             "build (vertex/face, bbox, volume, Hausdorff)")
+    parser.add_argument("--no-validate", action="store_true",
+                        help="build even if the sidecars fail validation")
+    parser.add_argument("--lods", action="store_true",
+                        help="write LOD1-LOD3 of each built GLB and list "
+                             "them in its .glb.toml")
+    parser.add_argument("--bundle", action="store_true",
+                        help="merge each product into one <Prefix>_V1.glb")
+    parser.add_argument("--stream", action="store_true",
+                        help="write each product as a coarse-first stream "
+                             "(implies --lods)")
+    args = parser.parse_args(argv)
+
+    scripts = discover(args.products, args.match)
+    if not scripts:
+        parser.error("no scripts matched")
+    sidecars = sidecar.discover(args.products)
+    if not args.no_validate:
+        results = schema.check(sidecars, meshes=False)
+        if schema.errors(results):
+            print(schema.report(results, quiet=True))
+            print(f"{schema.errors(results)} sidecar errors; fix them or "
+                  "pass --no-validate")
+            return 2
+    t0 = time.perf_counter()
+    rows = build(scripts, args.jobs, args.blender, args.out, args.timeout,
+                 args.warm, args.max_jobs, force=args.force,
+                 codec=args.codec, instance=args.instance, diff=args.diff)
+    wall = time.perf_counter() - t0
+    print(summary_table(rows, wall))
+    if args.lods or args.stream:
+        built = [r["glb"] for r in rows if r["ok"]]
+        print(lod.table(lod.run(sidecar.discover(args.products), built)))
+    if args.bundle:
+        for paths in sidecar.by_product(
+                sidecar.discover(args.products)).values():
+            out, _ = bundle.bundle(paths)
+            print(f"[bundle] {out} ({os.path.getsize(out)/1024:.1f} KB)")
+    if args.stream:
+        for paths in sidecar.by_product(
+                sidecar.discover(args.products)).values():
+            manifest = stream.write(paths)
+            print(f"[stream] {manifest['stream']}: "
+                  f"{len(manifest['chunks'])} chunks, "
+                  f"{manifest['bytes']/1024:.1f} KB")
+    with open(os.path.join(args.out, "summary.json"), "w") as f:
+        json.dump({"wall_seconds": wall, "rows": rows}, f, indent=1)
+    ok = all(r["ok"] for r in rows)
+    if not args.no_validate:
+        results = schema.check(sidecars)
+        if schema.errors(results):
+            print(schema.report(results, quiet=True))
+            ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+# ============================================================================
+# draco_bench.py — Draco compression / quantization benchmark for the GLBs
+# Two halves:
+#   - Blender side: with VOLTEC_MESH_DRACO_BENCH=<dir> set, build.export()
+#     calls export_grid(), which re-exports the finished object once
+#     uncompressed (the reference), once with the script's own settings
+#     ("current") and once per setting of grid(), timing every export.
+#   - Plain Python: analyze() decodes every variant with DracoPy, times the
+#     decode (best of DECODE_REPEATS) and measures the geometric error
+#     against the reference: the largest distance from a decoded vertex to
+#     the nearest reference vertex, and the largest normal deviation there.
+#
+# The recommended setting per component is the one with the lowest
+# delivery cost, bytes / BANDWIDTH + decode seconds, among the variants
+# whose position error stays within POSITION_TOL and normal error within
+# NORMAL_TOL_DEG; if none does, the most accurate variant.
+#
+# --write records each recommendation in [asset].draco of the component's
+# sidecar ({ level = 7, position = 14, normal = 10, texcoord = 12 }).
+# build.export() ships that setting (shipped()) and falls back to
+# DEFAULT_LEVEL with the exporter's quantization where a sidecar has none;
+# catalogue.py keys its cache on the recorded settings (fingerprint()).
+#
+# Usage (from docs/Products; needs Blender, DracoPy and SciPy):
+#   python -m voltec_mesh.draco_bench                  # every component
+#   python -m voltec_mesh.draco_bench -k Motor         # matching scripts
+#   python -m voltec_mesh.draco_bench --analyze-only   # reuse the exports
+#   python -m voltec_mesh.draco_bench --write          # apply to sidecars
+# ============================================================================
+import argparse
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import sidecar
+from .glb import DRACO, Glb
+
+BENCH_ENV         = "VOLTEC_MESH_DRACO_BENCH"
+LEVELS            = (0, 3, 6, 7, 10)
+POSITION_BITS     = (11, 12, 14, 16)
+NORMAL_BITS       = (8, 10)
+TEXCOORD_BITS     = (10, 12)
+DECODE_REPEATS    = 3
+POSITION_TOL      = 5e-5      # m; a tenth of the smallest bevel
+NORMAL_TOL_DEG    = 2.0
+NORMAL_NEIGHBOURS = 8
+BANDWIDTH         = 625_000   # bytes/s (5 Mbit/s) for the cost trade-off
+MANIFEST          = "exports.json"
+DEFAULT_LEVEL     = 6
+SETTING_KEYS      = ("level", "position", "normal", "texcoord")
+
+
+def grid():
+    """Every (level, position, normal, texcoord) setting as a dict."""
+    return [dict(level=l, position=p, normal=n, texcoord=t)
+            for l, p, n, t in itertools.product(LEVELS, POSITION_BITS,
+                                                NORMAL_BITS, TEXCOORD_BITS)]
+
+
+def tag(setting):
+    if setting is None:
+        return "reference"
+    return (f"L{setting['level']}_p{setting['position']}"
+            f"_n{setting['normal']}_t{setting['texcoord']}")
+
+
+def _sidecars(product):
+    """{GLB file name: sidecar path} of a product directory."""
+    out = {}
+    for path in sidecar.discover([product]):
+        mesh = sidecar.load(path).get("asset", {}).get("mesh", "")
+        out.setdefault(os.path.basename(mesh), path)
+    return out
+
+
+def shipped(glb):
+    """Draco setting recorded for the GLB at `glb` in its sidecar's
+    [asset].draco, or {"level": DEFAULT_LEVEL} without one."""
+    product = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(glb))))
+    path = _sidecars(product).get(os.path.basename(glb))
+    setting = sidecar.load(path).get("asset", {}).get("draco") if path \
+        else None
+    return dict(setting) if setting else {"level": DEFAULT_LEVEL}
+
+
+def fingerprint(script):
+    """[asset].draco of every sidecar of the product `script` builds for,
+    as a JSON-ready dict; part of the build cache key (catalogue.py)."""
+    v1 = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(script))))
+    return {sidecar.name(p): sidecar.load(p).get("asset", {}).get("draco")
+            for p in sidecar.discover([os.path.dirname(v1)])}
+
+
+# --- Blender side ----------------------------------------------------------
+def export_grid(out_dir, write, current):
+    """Write the reference, "current" (the shipped setting `current`) and
+    GRID variants of the selected object into `out_dir` with
+    `write(path, draco)` and record size and export time per variant in
+    <out_dir>/exports.json."""
+    runs = [("reference", None), ("current", current)]
+    runs += [(tag(s), s) for s in grid()]
+    rows = []
+    for name, setting in runs:
+        path = os.path.join(out_dir, f"{name}.glb")
+        t0 = time.perf_counter()
+        write(path, setting)
+        rows.append({"tag": name, "setting": setting,
+                     "export_seconds": time.perf_counter() - t0,
+                     "bytes": os.path.getsize(path)})
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(rows, f, indent=1)
+
+
+# --- Analysis --------------------------------------------------------------
+def _points(doc):
+    """Positions and normals of every primitive, concatenated."""
+    prims = [a for _, _, a in doc.primitives()]
+    pos = np.vstack([a["POSITION"] for a in prims]).astype(np.float64)
+    nrm = np.vstack([a.get("NORMAL", np.zeros_like(a["POSITION"]))
+                     for a in prims]).astype(np.float64)
+    return pos, nrm
+
+
+def decode_seconds(doc, repeats=DECODE_REPEATS):
+    """Best-of-`repeats` time to decode every Draco buffer in `doc`."""
+    import DracoPy
+
+    views = [doc.view(p["extensions"][DRACO]["bufferView"])
+             for mesh in doc.gltf.get("meshes", [])
+             for p in mesh["primitives"] if DRACO in p.get("extensions", {})]
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for view in views:
+            DracoPy.decode(view)
+        best = min(best, time.perf_counter() - t0)
+    return best if views else 0.0
+
+
+def measure_variant(path, tree, ref_nrm):
+    """Decode time and error of one exported variant against the reference
+    KD-tree and normals. Split normals put several reference vertices on
+    one point, so the normal error is taken against the closest-matching
+    normal among the NORMAL_NEIGHBOURS nearest that share that point."""
+    doc = Glb.read(path)
+    pos, nrm = _points(doc)
+    dist, idx = tree.query(pos, k=min(NORMAL_NEIGHBOURS, tree.n))
+    dist, idx = dist.reshape(len(pos), -1), idx.reshape(len(pos), -1)
+    cand = ref_nrm[idx]
+    cos = np.einsum("ij,ikj->ik", nrm, cand)
+    norm = np.linalg.norm(nrm, axis=1)[:, None] * np.linalg.norm(cand, axis=2)
+    cos = np.clip(cos / np.where(norm > 0, norm, 1.0), -1.0, 1.0)
+    same = dist <= dist[:, :1] + 1e-9
+    best = np.where(same, cos, -1.0).max(axis=1)
+    return {"decode_seconds": decode_seconds(doc),
+            "position_error": float(dist[:, 0].max(initial=0.0)),
+            "normal_error_deg": float(np.degrees(np.arccos(best))
+                                      .max(initial=0.0))}
+
+
+def cost(row):
+    return row["bytes"] / BANDWIDTH + row["decode_seconds"]
+
+
+def recommend(rows):
+    """The row to ship: cheapest within tolerance, else most accurate."""
+    variants = [r for r in rows if r["tag"] not in ("reference", "current")]
+    ok = [r for r in variants if r["position_error"] <= POSITION_TOL
+          and r["normal_error_deg"] <= NORMAL_TOL_DEG]
+    if ok:
+        return min(ok, key=lambda r: (cost(r), r["bytes"]))
+    return min(variants, key=lambda r: (r["position_error"], r["bytes"]))
+
+
+def analyze_component(comp_dir):
+    """Measure every variant in one component's bench directory."""
+    from scipy.spatial import cKDTree
+
+    with open(os.path.join(comp_dir, MANIFEST)) as f:
+        rows = json.load(f)
+    ref_pos, ref_nrm = _points(Glb.read(os.path.join(comp_dir,
+                                                     "reference.glb")))
+    tree = cKDTree(ref_pos)
+    for row in rows:
+        if row["tag"] == "reference":
+            row.update(decode_seconds=0.0, position_error=0.0,
+                       normal_error_deg=0.0)
+        else:
+            row.update(measure_variant(
+                os.path.join(comp_dir, f"{row['tag']}.glb"), tree, ref_nrm))
+    best = recommend(rows)
+    current = next(r for r in rows if r["tag"] == "current")
+    return {"name": os.path.basename(comp_dir), "current": current,
+            "recommended": best, "variants": rows}
+
+
+def analyze(bench_dir):
+    """Analyze every component under `bench_dir`; write draco.json."""
+    comps = sorted(os.path.dirname(p) for p in
+                   glob.glob(os.path.join(bench_dir, "*", MANIFEST)))
+    results = [analyze_component(c) for c in comps]
+    recommended = {r["name"]: r["recommended"]["setting"] for r in results}
+    with open(os.path.join(bench_dir, "draco.json"), "w") as f:
+        json.dump({"tolerances": {"position": POSITION_TOL,
+                                  "normal_deg": NORMAL_TOL_DEG},
+                   "bandwidth": BANDWIDTH, "recommended": recommended,
+                   "components": results}, f, indent=1)
+    return results
+
+
+def record(results, products=()):
+    """Write each result's recommended setting to [asset].draco of the
+    sidecar whose mesh is <name>.glb; returns the sidecars changed."""
+    meshes = {}
+    for product in sidecar.by_product(sidecar.discover(products)):
+        meshes.update(_sidecars(os.path.dirname(product)))
+    changed = []
+    for r in results:
+        path = meshes.get(f"{r['name']}.glb")
+        setting = r["recommended"]["setting"]
+        if path and sidecar.update(path, "asset", "draco",
+                                   {k: setting[k] for k in SETTING_KEYS}):
+            changed.append(sidecar.name(path))
+    return changed
+
+
+def table(results):
+    lines = [f"{'component':<34} {'current KB':>10} {'dec ms':>7} "
+             f"{'recommended':<20} {'KB':>8} {'dec ms':>7} {'err um':>7} "
+             f"{'exp s':>6}"]
+    for r in results:
+        cur, best = r["current"], r["recommended"]
+        lines.append(
+            f"{r['name']:<34} {cur['bytes']/1024:10.1f} "
+            f"{cur['decode_seconds']*1e3:7.2f} {best['tag']:<20} "
+            f"{best['bytes']/1024:8.1f} {best['decode_seconds']*1e3:7.2f} "
+            f"{best['position_error']*1e6:7.1f} {best['export_seconds']:6.2f}")
+    cur = sum(r["current"]["bytes"] for r in results)
+    best = sum(r["recommended"]["bytes"] for r in results)
+    if cur:
+        lines.append(f"{len(results)} components: {cur/1024:.1f} KB -> "
+                     f"{best/1024:.1f} KB ({100*(best-cur)/cur:+.1f}%)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from . import catalogue
+
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.draco_bench",
+        description="Benchmark Draco level and quantization per component.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("-k", "--match", nargs="+", default=(),
+                        help="only scripts whose name contains one of these")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="concurrent Blender processes (default: cores)")
+    parser.add_argument("--blender", default=None)
+    parser.add_argument("-o", "--out",
+                        default=os.path.join(catalogue.OUT_DIR, "draco"),
+                        help="directory for the variants and draco.json")
+    parser.add_argument("--analyze-only", action="store_true",
+                        help="skip the Blender exports, analyze what is there")
+    parser.add_argument("--write", action="store_true",
+                        help="record the recommendations in the sidecars")
+    args = parser.parse_args(argv)
+
+    if not args.analyze_only:
+        scripts = catalogue.discover(args.products, args.match)
+        if not scripts:
+            parser.error("no scripts matched")
+        os.environ[BENCH_ENV] = os.path.abspath(args.out)
+        rows = catalogue.build(scripts, args.jobs, args.blender,
+                               cache=False)
+        if not all(r["ok"] for r in rows):
+            print(catalogue.summary_table(rows))
+            return 1
+    results = analyze(args.out)
+    print(table(results))
+    if args.write:
+        changed = record(results, args.products)
+        print(f"[asset].draco updated in {len(changed)} sidecar(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
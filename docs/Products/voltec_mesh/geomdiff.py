@@ -0,0 +1,307 @@
+# ============================================================================
+# geomdiff.py — Geometric regression diff between two builds of a GLB
+# After a constant changes, compare() answers "what moved?" without
+# opening Blender. Both GLBs are read with glb.py (Draco and meshopt are
+# decoded), flattened to world-space triangles, and compared on:
+#   - vertex and triangle counts
+#   - bounding-box corners and enclosed volume (meshdata.volume)
+#   - a two-sided Hausdorff distance: SAMPLES area-weighted surface points
+#     plus every distinct vertex position of each mesh are measured against
+#     the other mesh's triangles. A cKDTree over the other side's sample
+#     points gives NEIGHBOURS candidate triangles per point and an upper
+#     bound from the exact point-triangle distance to those; the points
+#     whose bound could still be the maximum are then resolved exactly
+#     against the triangles whose bounding box comes within the bound
+#     (a bounding-volume hierarchy, LEAF_SIZE triangles per leaf), largest
+#     bound first, until no bound left exceeds the best exact distance.
+# A component counts as changed when its counts differ or its Hausdorff
+# distance exceeds TOLERANCE (draco_bench.POSITION_TOL, the quantization
+# budget), so a re-encode alone does not show up as a change.
+#
+# catalogue.py --diff runs compare() on every rebuilt script against the
+# GLB of its previous build in the cache.
+#
+# Usage (from docs/Products; needs SciPy, DracoPy for Draco GLBs):
+#   python -m voltec_mesh.geomdiff old.glb new.glb
+#   python -m voltec_mesh.geomdiff /tmp/before V-Pump/V1/meshes   # by name
+#   python -m voltec_mesh.geomdiff V-Pump/V1/meshes/VPump_BypassValve.glb \
+#       V-Pump/V1/meshes/VPump_BypassValve_LOD1.glb --max-seconds 2
+# --max-seconds exits with 2 when any pair takes longer; timing a
+# component against its _LOD1 checks the speed on a mesh that really
+# changed, where a self-compare would settle at once.
+# ============================================================================
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+from .draco_bench import POSITION_TOL
+from .glb import Glb
+from .meshdata import triangle_areas, volume
+
+SAMPLES    = 10_000
+NEIGHBOURS = 4
+LEAF_SIZE  = 8
+TOLERANCE  = POSITION_TOL
+SEED       = 0
+
+
+def load(path):
+    """World-space (vertices, triangles) of every mesh node of a GLB."""
+    return Glb.read(path).world_triangles()
+
+
+def sample(verts, tris, n=SAMPLES, seed=SEED):
+    """(points, triangle index of each point): `n` points spread over the
+    surface by area, followed by every distinct vertex position."""
+    if not len(tris):
+        return np.zeros((0, 3)), np.zeros(0, dtype=np.int64)
+    rng = np.random.default_rng(seed)
+    areas = triangle_areas(verts, tris)
+    total = areas.sum()
+    p = areas / total if total > 0 else None
+    which = rng.choice(len(tris), size=n, p=p)
+    u, v = rng.random((2, n))
+    flip = u + v > 1
+    u[flip], v[flip] = 1 - u[flip], 1 - v[flip]
+    a, b, c = (verts[tris[which, i]] for i in range(3))
+    surface = a + u[:, None] * (b - a) + v[:, None] * (c - a)
+    owner = np.empty(len(verts), dtype=np.int64)
+    owner[tris.ravel()] = np.repeat(np.arange(len(tris)), 3)
+    used = np.unique(tris)
+    _, first = np.unique(verts[used], axis=0, return_index=True)
+    used = used[first]
+    return (np.vstack([surface, verts[used]]),
+            np.concatenate([which, owner[used]]))
+
+
+def point_triangle_distance(p, a, b, c):
+    """(N,) distance from each point to the matching triangle (Ericson's
+    closest-point regions, vectorized); degenerate triangles fall back to
+    their first corner."""
+    ab, ac, ap = b - a, c - a, p - a
+    bp, cp = p - b, p - c
+    d1, d2 = np.einsum("ij,ij->i", ab, ap), np.einsum("ij,ij->i", ac, ap)
+    d3, d4 = np.einsum("ij,ij->i", ab, bp), np.einsum("ij,ij->i", ac, bp)
+    d5, d6 = np.einsum("ij,ij->i", ab, cp), np.einsum("ij,ij->i", ac, cp)
+    va, vb, vc = d3 * d6 - d5 * d4, d5 * d2 - d1 * d6, d1 * d4 - d3 * d2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = va + vb + vc
+        q = a + ab * (vb / denom)[:, None] + ac * (vc / denom)[:, None]
+        w_bc = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        regions = [  # lowest priority first
+            (((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)),
+             b + (c - b) * w_bc[:, None]),
+            (((vb <= 0) & (d2 >= 0) & (d6 <= 0)),
+             a + ac * (d2 / (d2 - d6))[:, None]),
+            (((d6 >= 0) & (d5 <= d6)), c),
+            (((vc <= 0) & (d1 >= 0) & (d3 <= 0)),
+             a + ab * (d1 / (d1 - d3))[:, None]),
+            (((d3 >= 0) & (d4 <= d3)), b),
+            (((d1 <= 0) & (d2 <= 0)), a),
+        ]
+        for mask, point in regions:
+            q = np.where(mask[:, None], point, q)
+    q = np.where(np.isfinite(q), q, a)
+    return np.linalg.norm(p - q, axis=1)
+
+
+def _box_gap(points, lo, hi):
+    """(N,) distance from each point to the matching axis-aligned box."""
+    return np.linalg.norm(np.maximum(np.maximum(lo - points, points - hi),
+                                     0), axis=1)
+
+
+def _ranges(starts, stops):
+    """Concatenation of arange(start, stop) for each pair."""
+    sizes = stops - starts
+    offsets = np.repeat(starts - np.cumsum(sizes) + sizes, sizes)
+    return offsets + np.arange(sizes.sum())
+
+
+class _Surface:
+    """Triangles of one mesh with the search structures one_sided() needs:
+    its sample points (and their triangles) and a bounding-volume
+    hierarchy over the triangles' boxes. The hierarchy is a balanced
+    binary tree stored level by level: at each level the triangles are
+    ordered by centroid along the longest axis of their node and every
+    node is cut at its middle, down to LEAF_SIZE triangles or fewer."""
+
+    def __init__(self, verts, tris, samples):
+        from scipy.spatial import cKDTree
+
+        self.verts, self.tris = verts, tris
+        self.points, self.owners = sample(verts, tris, samples)
+        self.tree = cKDTree(self.points)
+        corners = verts[tris]
+        self.lo, self.hi = corners.min(axis=1), corners.max(axis=1)
+        centroids = corners.mean(axis=1)
+        n = len(tris)
+        depth = int(np.log2(max(n // LEAF_SIZE, 1)))
+        self.order, self.levels = np.arange(n), []
+        for d in range(depth + 1):
+            edges = np.arange(2 ** d + 1) * n // 2 ** d
+            lo = np.minimum.reduceat(self.lo[self.order], edges[:-1])
+            hi = np.maximum.reduceat(self.hi[self.order], edges[:-1])
+            self.levels.append((lo, hi))
+            if d == depth:
+                self.edges = edges
+                break
+            node = np.repeat(np.arange(2 ** d), np.diff(edges))
+            axis = (hi - lo).argmax(axis=1)[node]
+            self.order = self.order[np.lexsort(
+                (centroids[self.order, axis], node))]
+
+    def distance(self, points, tris):
+        """Distance from each of `points` to the matching triangle index."""
+        t = self.tris[tris]
+        return point_triangle_distance(points, self.verts[t[:, 0]],
+                                       self.verts[t[:, 1]],
+                                       self.verts[t[:, 2]])
+
+    def exact(self, points, bounds):
+        """Distance from each of `points` to the surface, given an upper
+        bound for each: the hierarchy is walked down for all points at
+        once, keeping the (point, node) pairs whose box comes within the
+        bound, and the triangles of the leaves reached are measured if
+        their own box does too."""
+        owner, node = np.arange(len(points)), np.zeros(len(points), int)
+        for d, (lo, hi) in enumerate(self.levels):
+            if d:
+                owner, node = np.repeat(owner, 2), np.repeat(node, 2) * 2
+                node[1::2] += 1
+            keep = _box_gap(points[owner], lo[node], hi[node]) \
+                <= bounds[owner]
+            owner, node = owner[keep], node[keep]
+        cand = self.order[_ranges(self.edges[node], self.edges[node + 1])]
+        owner = np.repeat(owner, np.diff(self.edges)[node])
+        keep = _box_gap(points[owner], self.lo[cand], self.hi[cand]) \
+            <= bounds[owner]
+        owner, cand = owner[keep], cand[keep]
+        dist = bounds.copy()
+        np.minimum.at(dist, owner, self.distance(points[owner], cand))
+        return dist
+
+
+def one_sided(points, surface, chunk=256):
+    """(largest distance, its point index) from `points` to `surface`."""
+    k = min(NEIGHBOURS, surface.tree.n)
+    _, idx = surface.tree.query(points, k=k)
+    cand = surface.owners[idx.reshape(len(points), k)]
+    bound = surface.distance(np.repeat(points, k, axis=0), cand.ravel()) \
+        .reshape(len(points), k).min(axis=1)
+    order = np.argsort(-bound, kind="stable")
+    best, where = 0.0, int(order[0])
+    for start in range(0, len(order), chunk):
+        batch = order[start:start + chunk]
+        batch = batch[bound[batch] > best]
+        if not len(batch):
+            break
+        dist = surface.exact(points[batch], bound[batch])
+        i = int(dist.argmax())
+        if dist[i] >= best:
+            best, where = float(dist[i]), int(batch[i])
+    return best, where
+
+
+def compare(old, new, samples=SAMPLES):
+    """Geometry deltas between GLBs `old` and `new` (paths or (verts, tris)
+    pairs); see the module header."""
+    t0 = time.perf_counter()
+    meshes = [load(m) if isinstance(m, str) else m for m in (old, new)]
+    row = {"vertices": [len(v) for v, _ in meshes],
+           "triangles": [len(t) for _, t in meshes]}
+    if not all(len(t) for _, t in meshes):
+        row.update(hausdorff=None, changed=row["triangles"][0]
+                   != row["triangles"][1], seconds=time.perf_counter() - t0)
+        return row
+    lo = [v.min(axis=0) for v, _ in meshes]
+    hi = [v.max(axis=0) for v, _ in meshes]
+    row["bbox_min"] = (lo[1] - lo[0]).tolist()
+    row["bbox_max"] = (hi[1] - hi[0]).tolist()
+    row["volume"] = [volume(v, t) for v, t in meshes]
+    surfaces = [_Surface(v, t, samples) for v, t in meshes]
+    row["hausdorff"], row["at"] = 0.0, None
+    for here, there in ((0, 1), (1, 0)):
+        points = surfaces[here].points
+        dist, i = one_sided(points, surfaces[there])
+        if row["at"] is None or dist > row["hausdorff"]:
+            row["hausdorff"], row["at"] = dist, points[i].tolist()
+    row["changed"] = (row["vertices"][0] != row["vertices"][1]
+                      or row["triangles"][0] != row["triangles"][1]
+                      or row["hausdorff"] > TOLERANCE)
+    row["seconds"] = time.perf_counter() - t0
+    return row
+
+
+def describe(row):
+    """One-line summary of a compare() row."""
+    if row.get("hausdorff") is None:
+        return f"triangles {row['triangles'][0]} -> {row['triangles'][1]}"
+    parts = []
+    for key in ("vertices", "triangles"):
+        a, b = row[key]
+        if a != b:
+            parts.append(f"{key} {a} -> {b} ({b - a:+d})")
+    a, b = row["volume"]
+    if a and abs(b - a) > 1e-9:
+        parts.append(f"volume {(b - a) / abs(a) * 100:+.2f}%")
+    grow = max(np.abs(row["bbox_min"]).max(), np.abs(row["bbox_max"]).max())
+    if grow > TOLERANCE:
+        parts.append(f"bbox moved {grow * 1000:.2f} mm")
+    if row["hausdorff"] > TOLERANCE:
+        x, y, z = row["at"]
+        parts.append(f"Hausdorff {row['hausdorff'] * 1000:.3f} mm at "
+                     f"({x:.3f}, {y:.3f}, {z:.3f})")
+    return ", ".join(parts) if row["changed"] else "unchanged"
+
+
+def pairs(old, new):
+    """(name, old GLB, new GLB) for two files, or for the GLBs with the
+    same file name in two directories (names missing on one side get None
+    there)."""
+    if not os.path.isdir(old):
+        return [(os.path.basename(new), old, new)]
+    names = sorted({os.path.basename(p) for d in (old, new)
+                    for p in glob.glob(os.path.join(d, "*.glb"))})
+    return [(n, *(os.path.join(d, n) if os.path.exists(os.path.join(d, n))
+                  else None for d in (old, new))) for n in names]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.geomdiff",
+        description="Report geometry changes between two GLBs or two "
+                    "directories of GLBs.")
+    parser.add_argument("old", help="GLB or directory of the old build")
+    parser.add_argument("new", help="GLB or directory of the new build")
+    parser.add_argument("-n", "--samples", type=int, default=SAMPLES,
+                        help="surface samples per mesh")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="exit with 2 if any pair takes longer")
+    args = parser.parse_args(argv)
+
+    if os.path.isdir(args.old) != os.path.isdir(args.new):
+        parser.error("compare two files or two directories")
+    changed = slow = 0
+    for name, old, new in pairs(args.old, args.new):
+        if old is None or new is None:
+            print(f"{name:<40} {'added' if old is None else 'removed'}")
+            changed += 1
+            continue
+        row = compare(old, new, args.samples)
+        changed += row["changed"]
+        if args.max_seconds is not None and row["seconds"] > args.max_seconds:
+            slow += 1
+        print(f"{name:<40} {row['seconds']:6.3f} s  {describe(row)}")
+    if slow:
+        print(f"{slow} comparison(s) over {args.max_seconds:g} s")
+        return 2
+    return 1 if changed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+# ============================================================================
+# glb.py — Minimal GLB reader/writer for the post-export tools
+# Parses the binary glTF container (JSON chunk + BIN chunk) and reads
+# accessors straight into NumPy arrays, including strided and normalized
+# (KHR_mesh_quantization) attributes. Primitives compressed with
+# KHR_draco_mesh_compression are decoded through DracoPy and buffer views
+# compressed with EXT_meshopt_compression through meshoptimizer (with its
+# OCTAHEDRAL, QUATERNION and EXPONENTIAL filters undone here); both are
+# optional dependencies, imported only when such a file is read. Nodes with
+# EXT_mesh_gpu_instancing count once per instance in mesh_nodes().
+# Runs under plain Python; bpy is not imported.
+# ============================================================================
+import json
+import struct
+
+import numpy as np
+
+MAGIC      = 0x46546C67  # b"glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN  = 0x004E4942
+DRACO      = "KHR_draco_mesh_compression"
+MESHOPT    = "EXT_meshopt_compression"
+INSTANCING = "EXT_mesh_gpu_instancing"
+
+COMPONENT_DTYPES = {5120: np.int8, 5121: np.uint8, 5122: np.int16,
+                    5123: np.uint16, 5125: np.uint32, 5126: np.float32}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4,
+              "MAT2": 4, "MAT3": 9, "MAT4": 16}
+COMPONENT_TYPES = {np.dtype(d): c for c, d in COMPONENT_DTYPES.items()}
+VECTOR_TYPES    = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4"}
+
+
+def _pad(data, fill):
+    return data + fill * (-len(data) % 4)
+
+
+def _normalized(values):
+    """Normalized integers to floats as the glTF spec defines them."""
+    info = np.iinfo(values.dtype)
+    out = values.astype(np.float32) / info.max
+    return np.maximum(out, -1.0) if info.min < 0 else out
+
+
+def quat_matrix(q):
+    """3×3 rotation of a glTF (x, y, z, w) quaternion."""
+    x, y, z, w = q
+    return np.array([
+        [1 - 2*(y*y + z*z), 2*(x*y - z*w), 2*(x*z + y*w)],
+        [2*(x*y + z*w), 1 - 2*(x*x + z*z), 2*(y*z - x*w)],
+        [2*(x*z - y*w), 2*(y*z + x*w), 1 - 2*(x*x + y*y)]])
+
+
+def node_matrix(node):
+    """Local 4×4 transform of a glTF node (matrix or TRS)."""
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    mat = np.eye(4)
+    mat[:3, :3] = quat_matrix(node.get("rotation", (0, 0, 0, 1))) \
+        * np.asarray(node.get("scale", (1, 1, 1)), dtype=np.float64)
+    mat[:3, 3] = node.get("translation", (0, 0, 0))
+    return mat
+
+
+def trs_matrices(translation, rotation, scale):
+    """(N, 4, 4) transforms from (N, 3) translations, (N, 4) quaternions and
+    (N, 3) scales, as EXT_mesh_gpu_instancing stores them."""
+    rot = np.array([quat_matrix(q) for q in np.asarray(rotation, np.float64)])
+    out = np.tile(np.eye(4), (len(rot), 1, 1))
+    out[:, :3, :3] = rot * np.asarray(scale, dtype=np.float64)[:, None, :]
+    out[:, :3, 3] = translation
+    return out
+
+
+def _round_int(x, dtype):
+    return (x + np.where(x >= 0, 0.5, -0.5)).astype(np.int32).astype(dtype)
+
+
+def _filter_octahedral(raw, count, stride):
+    """OCTAHEDRAL: x, y packed on the octahedron, z holding 1.0 in the same
+    bit width; yields the unit vector, the 4th component as stored."""
+    dtype = np.int8 if stride == 4 else np.int16
+    data = np.frombuffer(raw, dtype).reshape(count, 4).copy()
+    top = float(np.iinfo(dtype).max)
+    x, y, z = (data[:, i].astype(np.float32) for i in range(3))
+    z = z - np.abs(x) - np.abs(y)
+    t = np.minimum(z, 0.0)
+    x = x + np.where(x >= 0, t, -t)
+    y = y + np.where(y >= 0, t, -t)
+    s = top / np.sqrt(x * x + y * y + z * z)
+    for i, c in enumerate((x, y, z)):
+        data[:, i] = _round_int(c * s, dtype)
+    return data.tobytes()
+
+
+def _filter_quaternion(raw, count):
+    """QUATERNION: three smallest components and the index of the dropped
+    one (low two bits of the 4th), with the scale in its high bits."""
+    data = np.frombuffer(raw, np.int16).reshape(count, 4)
+    ss = np.float32(1.0 / np.sqrt(2.0)) / (data[:, 3] | 3).astype(np.float32)
+    xyz = data[:, :3].astype(np.float32) * ss[:, None]
+    w = np.sqrt(np.maximum(1.0 - (xyz * xyz).sum(axis=1), 0.0))
+    values = np.column_stack([w, xyz])
+    qc = (data[:, 3] & 3).astype(np.intp)
+    out = np.empty_like(data)
+    rows = np.arange(count)
+    for k in range(4):
+        out[rows, (qc + k) & 3] = _round_int(values[:, k] * 32767.0, np.int16)
+    return out.tobytes()
+
+
+def _filter_exponential(raw):
+    """EXPONENTIAL: 24-bit signed mantissa, 8-bit signed exponent per
+    32-bit value; yields float32 m·2^e."""
+    v = np.frombuffer(raw, np.int32)
+    m = (v << 8) >> 8
+    e = v >> 24
+    return np.ldexp(m.astype(np.float32), e).astype(np.float32).tobytes()
+
+
+def decode_meshopt(ext, data):
+    """Decompress one EXT_meshopt_compression buffer view."""
+    try:
+        import meshoptimizer
+    except ImportError as exc:
+        raise ImportError("decoding meshopt GLBs needs meshoptimizer "
+                          "(pip install meshoptimizer)") from exc
+    count, stride = ext["count"], ext["byteStride"]
+    mode = ext.get("mode", "ATTRIBUTES")
+    filt = ext.get("filter", "NONE")
+    if filt not in ("NONE", "OCTAHEDRAL", "QUATERNION", "EXPONENTIAL"):
+        raise ValueError(f"unknown meshopt filter {filt}")
+    if mode == "ATTRIBUTES":
+        out = meshoptimizer.decode_vertex_buffer(count, stride, data)
+    elif mode == "TRIANGLES":
+        out = meshoptimizer.decode_index_buffer(count, stride, data)
+    else:
+        out = meshoptimizer.decode_index_sequence(count, stride, data)
+    raw = np.ascontiguousarray(out).tobytes()[:count * stride]
+    if filt == "OCTAHEDRAL":
+        return _filter_octahedral(raw, count, stride)
+    if filt == "QUATERNION":
+        return _filter_quaternion(raw, count)
+    if filt == "EXPONENTIAL":
+        return _filter_exponential(raw)
+    return raw
+
+
+class Glb:
+    """A glTF document (`gltf`, the parsed JSON) with its binary buffer."""
+
+    def __init__(self, gltf, bin=b""):
+        self.gltf = gltf
+        self.bin = bytes(bin)
+        self._decoded = {}
+
+    # --- Container --------------------------------------------------------
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, length = struct.unpack_from("<III", data)
+        if magic != MAGIC or version != 2:
+            raise ValueError("not a glTF 2.0 binary")
+        gltf, bin, offset = None, b"", 12
+        while offset < length:
+            size, kind = struct.unpack_from("<II", data, offset)
+            chunk = data[offset + 8:offset + 8 + size]
+            if kind == CHUNK_JSON:
+                gltf = json.loads(chunk)
+            elif kind == CHUNK_BIN and not bin:
+                bin = chunk
+            offset += 8 + size
+        if gltf is None:
+            raise ValueError("GLB has no JSON chunk")
+        return cls(gltf, bin)
+
+    @classmethod
+    def read(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def to_bytes(self):
+        if self.gltf.get("buffers"):
+            self.gltf["buffers"][0]["byteLength"] = len(self.bin)
+        text = _pad(json.dumps(self.gltf, separators=(",", ":")).encode(),
+                    b" ")
+        bin = _pad(self.bin, b"\0")
+        chunks = struct.pack("<II", len(text), CHUNK_JSON) + text
+        if bin:
+            chunks += struct.pack("<II", len(bin), CHUNK_BIN) + bin
+        return struct.pack("<III", MAGIC, 2, 12 + len(chunks)) + chunks
+
+    def write(self, path):
+        data = self.to_bytes()
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+    # --- Buffers ----------------------------------------------------------
+    def add_accessor(self, values, target=None, bounds=False):
+        """Append `values` ((count,) or (count, n)) uncompressed to the BIN
+        chunk with its own buffer view; returns the accessor index."""
+        values = np.ascontiguousarray(values)
+        n = 1 if values.ndim == 1 else values.shape[1]
+        self.bin = _pad(self.bin, b"\0")
+        view = {"buffer": 0, "byteOffset": len(self.bin),
+                "byteLength": values.nbytes}
+        if target:
+            view["target"] = target
+        self.bin += values.tobytes()
+        views = self.gltf.setdefault("bufferViews", [])
+        views.append(view)
+        acc = {"bufferView": len(views) - 1,
+               "componentType": COMPONENT_TYPES[values.dtype],
+               "count": len(values), "type": VECTOR_TYPES[n]}
+        if bounds:
+            acc["min"] = values.reshape(len(values), n).min(0).tolist()
+            acc["max"] = values.reshape(len(values), n).max(0).tolist()
+        accessors = self.gltf.setdefault("accessors", [])
+        accessors.append(acc)
+        if not self.gltf.get("buffers"):
+            self.gltf["buffers"] = [{"byteLength": 0}]
+        return len(accessors) - 1
+
+    def raw_view(self, index):
+        """Stored bytes of buffer view `index` in the BIN chunk; for a
+        meshopt-compressed view, the compressed stream."""
+        bv = self.gltf["bufferViews"][index]
+        bv = bv.get("extensions", {}).get(MESHOPT, bv)
+        start = bv.get("byteOffset", 0)
+        return self.bin[start:start + bv["byteLength"]]
+
+    def view(self, index):
+        """Bytes of buffer view `index`, decompressed if it is meshopt
+        compressed."""
+        ext = self.gltf["bufferViews"][index].get("extensions", {})
+        if MESHOPT not in ext:
+            return self.raw_view(index)
+        if index not in self._decoded:
+            self._decoded[index] = decode_meshopt(ext[MESHOPT],
+                                                  self.raw_view(index))
+        return self._decoded[index]
+
+    def accessor(self, index, normalize=True):
+        """Accessor `index` as a (count, n) array, or (count,) for SCALAR.
+        Normalized integer attributes come back as floats unless
+        `normalize` is False."""
+        acc = self.gltf["accessors"][index]
+        dtype = np.dtype(COMPONENT_DTYPES[acc["componentType"]])
+        n, count = TYPE_SIZES[acc["type"]], acc["count"]
+        if "bufferView" not in acc:
+            out = np.zeros((count, n), dtype=dtype)
+        else:
+            bv = self.gltf["bufferViews"][acc["bufferView"]]
+            stride = bv.get("byteStride") or n * dtype.itemsize
+            out = np.ndarray((count, n), dtype=dtype,
+                             buffer=self.view(acc["bufferView"]),
+                             offset=acc.get("byteOffset", 0),
+                             strides=(stride, dtype.itemsize))
+            out = out.copy()
+        if normalize and acc.get("normalized"):
+            out = _normalized(out)
+        return out[:, 0] if acc["type"] == "SCALAR" else out
+
+    # --- Meshes -----------------------------------------------------------
+    def primitive(self, mesh, prim):
+        """Attribute arrays of one primitive keyed by glTF semantic, plus
+        "indices" as an (M, 3) triangle array. Draco primitives are decoded."""
+        p = self.gltf["meshes"][mesh]["primitives"][prim]
+        if DRACO in p.get("extensions", {}):
+            return self._draco(p)
+        out = {name: self.accessor(i) for name, i in p["attributes"].items()}
+        count = len(out["POSITION"])
+        if "indices" in p:
+            out["indices"] = self.accessor(p["indices"]).astype(np.int64)
+        else:
+            out["indices"] = np.arange(count, dtype=np.int64)
+        out["indices"] = out["indices"].reshape(-1, 3)
+        return out
+
+    def _draco(self, p):
+        try:
+            import DracoPy
+        except ImportError as exc:
+            raise ImportError("decoding Draco GLBs needs DracoPy "
+                              "(pip install DracoPy)") from exc
+        mesh = DracoPy.decode(self.view(p["extensions"][DRACO]["bufferView"]))
+        out = {"POSITION": np.asarray(mesh.points, dtype=np.float32)
+               .reshape(-1, 3),
+               "indices": np.asarray(mesh.faces, dtype=np.int64)
+               .reshape(-1, 3)}
+        if getattr(mesh, "normals", None) is not None and len(mesh.normals):
+            out["NORMAL"] = np.asarray(mesh.normals, dtype=np.float32) \
+                .reshape(-1, 3)
+        if getattr(mesh, "tex_coord", None) is not None and len(mesh.tex_coord):
+            out["TEXCOORD_0"] = np.asarray(mesh.tex_coord, dtype=np.float32) \
+                .reshape(-1, 2)
+        return out
+
+    def primitives(self):
+        """(mesh index, primitive index, arrays) for every primitive."""
+        for m, mesh in enumerate(self.gltf.get("meshes", [])):
+            for p in range(len(mesh["primitives"])):
+                yield m, p, self.primitive(m, p)
+
+    def instances(self, node):
+        """(N, 4, 4) EXT_mesh_gpu_instancing transforms of node index
+        `node`, or None if it is not instanced."""
+        ext = self.gltf["nodes"][node].get("extensions", {}).get(INSTANCING)
+        if ext is None:
+            return None
+        attrs = ext["attributes"]
+        count = self.gltf["accessors"][next(iter(attrs.values()))]["count"]
+        trs = []
+        for name, default in (("TRANSLATION", (0.0, 0.0, 0.0)),
+                              ("ROTATION", (0.0, 0.0, 0.0, 1.0)),
+                              ("SCALE", (1.0, 1.0, 1.0))):
+            trs.append(self.accessor(attrs[name]) if name in attrs
+                       else np.tile(default, (count, 1)))
+        return trs_matrices(*trs)
+
+    def mesh_nodes(self):
+        """(node index, world 4×4 matrix) for every node with a mesh in the
+        default scene, depth first; instanced nodes once per instance."""
+        nodes = self.gltf.get("nodes", [])
+        scenes = self.gltf.get("scenes") or [{"nodes": list(range(len(nodes)))}]
+        stack = [(n, np.eye(4))
+                 for n in reversed(scenes[self.gltf.get("scene", 0)]["nodes"])]
+        while stack:
+            n, parent = stack.pop()
+            world = parent @ node_matrix(nodes[n])
+            if "mesh" in nodes[n]:
+                inst = self.instances(n)
+                for mat in ([np.eye(4)] if inst is None else inst):
+                    yield n, world @ mat
+            stack += [(c, world) for c in reversed(nodes[n].get("children", []))]
+
+    def world_triangles(self):
+        """(N, 3) float64 world vertices and (M, 3) triangles of every mesh
+        node in the default scene."""
+        verts, tris, base, cache = [], [], 0, {}
+        for n, world in self.mesh_nodes():
+            m = self.gltf["nodes"][n]["mesh"]
+            for p in range(len(self.gltf["meshes"][m]["primitives"])):
+                if (m, p) not in cache:
+                    cache[m, p] = self.primitive(m, p)
+                arrays = cache[m, p]
+                pos = arrays["POSITION"].astype(np.float64)
+                verts.append(pos @ world[:3, :3].T + world[:3, 3])
+                tris.append(arrays["indices"] + base)
+                base += len(pos)
+        if not verts:
+            return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+        return np.vstack(verts), np.vstack(tris)
@@ -0,0 +1,181 @@
+# ============================================================================
+# honeycomb.py — Analytic hexagonal honeycomb slab generator
+# Emits the perforated slab (hex holes + peripheral frame) as all-quad
+# topology in one vectorized pass, watertight by construction: no cutters,
+# no booleans. Used by the V-Cell Al hex lattice current collectors.
+#
+# Lattice layout (XY plane, slab centered on the origin, Z = thickness):
+#   - holes are pointy-top hexagons (vertices at 30° + k·60°), neighbours
+#     along X and at ±60°, so every wall has the same flat-to-flat width
+#   - each hole sits in its Voronoi "territory" hexagon; the ring between
+#     hole and territory is 6 quads, territories share vertices
+#   - the frame between the outer rectangle and the zig-zag outline of the
+#     territory union is quad strips projected onto the rectangle edges
+# ============================================================================
+import math
+
+import numpy as np
+
+from .primitives import mesh_object, transform
+
+# Territory vertex offsets in lattice units (x: pitch/2, y: territory R/2),
+# counter-clockwise from 30°
+_OFFSETS = np.array([[1, 1], [0, 2], [-1, 1], [-1, -1], [0, -2], [1, -1]])
+
+
+def honeycomb_layout(length, width, cell_radius, wall, frame):
+    """Rows/columns that fit the slab. `cell_radius` is the hole circumradius
+    (the radius of a 6-vertex cylinder), `wall` the flat-to-flat wall between
+    neighbouring holes, `frame` the solid border outside the outermost walls.
+    """
+    if cell_radius <= 0 or wall <= 0 or frame <= 0:
+        raise ValueError("cell_radius, wall and frame must be positive")
+    pitch = cell_radius * math.sqrt(3) + wall
+    terr_r = pitch / math.sqrt(3)
+    avail_x = length - 2 * frame
+    avail_y = width - 2 * frame
+    rows = int((avail_y - 2 * terr_r) / (1.5 * terr_r) + 1e-9) + 1
+    cols = int((avail_x - (pitch / 2 if rows > 1 else 0.0)) / pitch + 1e-9)
+    if avail_y < 2 * terr_r or cols < 1:
+        raise ValueError(
+            f"no {cell_radius*1e3:.3f} mm cell fits a "
+            f"{length*1e3:.1f} × {width*1e3:.1f} mm slab with "
+            f"{frame*1e3:.2f} mm frame")
+    return rows, cols, pitch, terr_r
+
+
+def honeycomb_centers(length, width, cell_radius, wall, frame):
+    """(rows·cols, 2) float64 hole centres of the slab `honeycomb_arrays`
+    builds, row by row — for cutter-based slabs that must match it."""
+    rows, cols, pitch, terr_r = honeycomb_layout(
+        length, width, cell_radius, wall, frame)
+    row, col = np.divmod(np.arange(rows * cols), cols)
+    shift = 1 if rows > 1 else 0
+    x0 = -(cols - 1 + shift / 2) * pitch / 2
+    y0 = -1.5 * (rows - 1) * terr_r / 2
+    return np.column_stack([x0 + (2 * col + row % 2) * pitch / 2,
+                            y0 + 3 * row * terr_r / 2])
+
+
+def honeycomb_arrays(length, width, thickness, cell_radius, wall, frame):
+    """Vertex (N, 3) float64 and quad face (M, 4) int64 arrays of the slab,
+    centered on the origin. Faces wind counter-clockwise seen from outside.
+    """
+    rows, cols, pitch, terr_r = honeycomb_layout(
+        length, width, cell_radius, wall, frame)
+    n_cells = rows * cols
+    shift = 1 if rows > 1 else 0
+
+    # --- Territory vertices on the integer lattice, de-duplicated ---
+    row, col = np.divmod(np.arange(n_cells), cols)
+    cx = 2 * col + row % 2
+    cy = 3 * row
+    tx = cx[:, None] + _OFFSETS[:, 0]
+    ty = cy[:, None] + _OFFSETS[:, 1]
+    stride = 3 * rows + 8
+    keys, terr = np.unique((tx + 2) * stride + (ty + 4), return_inverse=True)
+    terr = terr.reshape(n_cells, 6)
+    ix, iy = np.divmod(keys, stride)
+    ix, iy = ix - 2, iy - 4
+
+    # Lattice units → meters, union bbox centered on the origin
+    ux, uy = pitch / 2, terr_r / 2
+    x0 = -(cols - 1 + shift / 2) * ux
+    y0 = -1.5 * (rows - 1) * uy
+    terr_xy = np.column_stack([x0 + ix * ux, y0 + iy * uy])
+
+    # --- Hole vertices: territory offsets scaled by hole/territory ratio ---
+    k = cell_radius / terr_r
+    hole_xy = np.stack([x0 + (cx[:, None] + k * _OFFSETS[:, 0]) * ux,
+                        y0 + (cy[:, None] + k * _OFFSETS[:, 1]) * uy],
+                       axis=-1).reshape(-1, 2)
+    n_terr = len(terr_xy)
+    hole = n_terr + np.arange(6 * n_cells).reshape(n_cells, 6)
+
+    # Ring quads: outer k → outer k+1 → inner k+1 → inner k
+    nxt = np.roll(np.arange(6), -1)
+    rings = np.stack([terr, terr[:, nxt], hole[:, nxt], hole],
+                     axis=-1).reshape(-1, 4)
+
+    # --- Outline of the territory union (lattice coords), 4 monotone paths ---
+    top = rows - 1
+    s_top = top % 2
+    bx = np.arange(-1, 2 * cols)
+    bottom = np.column_stack([bx, np.where(bx % 2, -1, -2)])
+    tx_ = np.arange(s_top - 1, 2 * cols + s_top)
+    top_path = np.column_stack(
+        [tx_, np.where((tx_ - s_top) % 2, 3 * top + 1, 3 * top + 2)])
+    r = np.arange(rows)
+    s = r % 2
+    left = np.column_stack([np.repeat(s - 1, 2),
+                            (3 * r[:, None] + [-1, 1]).ravel()])
+    right = np.column_stack([np.repeat(2 * (cols - 1) + s + 1, 2),
+                             (3 * r[:, None] + [-1, 1]).ravel()])
+
+    def lookup(path):
+        return np.searchsorted(keys, (path[:, 0] + 2) * stride + path[:, 1] + 4)
+
+    b_idx, t_idx = lookup(bottom), lookup(top_path)
+    l_idx, r_idx = lookup(left), lookup(right)
+
+    # --- Frame: project outline vertices onto the rectangle edges ---
+    X0, X1, Y0, Y1 = -length / 2, length / 2, -width / 2, width / 2
+    base = n_terr + len(hole_xy)
+    proj_xy, cursor = [], base
+
+    def project(idx, x=None, y=None):
+        nonlocal cursor
+        pts = terr_xy[idx].copy()
+        if x is not None:
+            pts[:, 0] = x
+        if y is not None:
+            pts[:, 1] = y
+        proj_xy.append(pts)
+        out = cursor + np.arange(len(idx))
+        cursor += len(idx)
+        return out
+
+    pb, pt = project(b_idx, y=Y0), project(t_idx, y=Y1)
+    pl, pr = project(l_idx, x=X0), project(r_idx, x=X1)
+    proj_xy.append(np.array([[X0, Y0], [X1, Y0], [X1, Y1], [X0, Y1]]))
+    c_bl, c_br, c_tr, c_tl = cursor + np.arange(4)
+
+    frame_quads = np.vstack([
+        np.column_stack([pb[:-1], pb[1:], b_idx[1:], b_idx[:-1]]),
+        np.column_stack([t_idx[:-1], t_idx[1:], pt[1:], pt[:-1]]),
+        np.column_stack([pl[:-1], l_idx[:-1], l_idx[1:], pl[1:]]),
+        np.column_stack([r_idx[:-1], pr[:-1], pr[1:], r_idx[1:]]),
+        [[c_bl, pb[0], b_idx[0], pl[0]],
+         [pb[-1], c_br, pr[0], b_idx[-1]],
+         [r_idx[-1], pr[-1], c_tr, pt[-1]],
+         [pl[-1], l_idx[-1], pt[0], c_tl]],
+    ])
+
+    xy = np.vstack([terr_xy, hole_xy] + proj_xy)
+    quads = np.vstack([rings, frame_quads])
+
+    # --- Extrude: top/bottom caps + a side wall on every boundary edge ---
+    n2 = len(xy)
+    verts = np.vstack([
+        np.column_stack([xy, np.full(n2, thickness / 2)]),
+        np.column_stack([xy, np.full(n2, -thickness / 2)]),
+    ])
+    a = quads.ravel()
+    b = np.roll(quads, -1, axis=1).ravel()
+    edge = a * n2 + b
+    boundary = ~np.isin(b * n2 + a, edge)
+    a, b = a[boundary], b[boundary]
+    faces = np.vstack([
+        quads,
+        quads[:, ::-1] + n2,
+        np.column_stack([a + n2, b + n2, b, a]),
+    ])
+    return verts, faces
+
+
+def honeycomb_object(name, length, width, thickness, cell_radius, wall, frame,
+                     loc=(0, 0, 0)):
+    """Link a honeycomb slab mesh object into the active collection."""
+    verts, faces = honeycomb_arrays(length, width, thickness,
+                                    cell_radius, wall, frame)
+    return mesh_object(name, transform(verts, loc), faces)
@@ -0,0 +1,490 @@
+# ============================================================================
+# incinerator.py — Mass and energy balance of the V-Incinerator gas path
+# How much waste, of what composition, the plant can take is a question
+# for many feeds and set-points at once. balance() carries the gas through
+# STAGES with every quantity a NumPy array over cases:
+#   WasteFeed           feed rate and ultimate analysis (FEED fractions),
+#                       lower heating value (Channiwala-Parikh HHV minus
+#                       the latent heat of the water formed)
+#   PlasmaChamber       torch power; the ash melts to slag at the
+#                       AshHopper's slag_output_temp_k, FLY_ASH of it
+#                       is carried on as dust; water-cooled jacket
+#   CombustionChamber   complete combustion to SPECIES; excess air λ is
+#                       raised until the gas is at the set-point (never
+#                       below EXCESS_AIR)
+#   HeatExchanger       effectiveness HX_EFFECTIVENESS against feedwater,
+#                       capped at thermal_duty_mw; steam and electricity
+#                       from steam_output_mw / thermal_duty_mw and
+#                       TURBINE_EFFICIENCY
+#   WetScrubber         water quench to SCRUBBER_T; HCl and SO2 removed
+#                       per hcl_ / so2_removal_pct, NaOH consumed,
+#                       SCRUBBER_DUST of the dust captured
+#   CatalyticConverter  reheated to operating_temp_k; space velocity
+#   HEPAFilter          spray-cooled to HEPA_T; dust removed per
+#                       filtration_efficiency_pct; face velocity and ΔP
+#   CarbonBed           spray-cooled to CARBON_T; contact time
+#   ExhaustStack        HCl and dust in mg/Nm³ (dry, REFERENCE_O2)
+#                       against STACK_LIMITS
+# Each stage with a [thermodynamic] table has a gas volume (residence
+# time), pressure and a wall: heat capacity [physics].mass × specific_heat
+# (massprops.py), area 6·V^(2/3), gas-side H_GAS behind any refractory
+# lining the sidecar gives (K_REFRACTORY), and loss U_LOSS to ambient
+# (COOLING for jacketed stages). The gas leaves a stage at
+# T_w + (T - T_w)·exp(-NTU).
+#
+# Steady state solves the walls in closed form; transient() steps them
+# with backward Euler from their sidecar temperatures (a cold start).
+# Every case gets a "limits" mask per check (residence times, wall
+# oxidation and melting, HX duty, space velocity, ΔP, stack emissions,
+# slag vitrification); capacity() sweeps feed rates for each composition
+# and returns the largest one that passes them all.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.incinerator                      # nominal case
+#   python -m voltec_mesh.incinerator --sweep 2000         # capacity plan
+#   python -m voltec_mesh.incinerator --transient 48       # cold start
+# ============================================================================
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import sidecar
+
+PRODUCT = os.path.join(sidecar.PRODUCTS_DIR, "V-Incinerator")
+PREFIX  = "VIncinerator_"
+STAGES  = ("WasteFeed", "PlasmaChamber", "CombustionChamber",
+           "HeatExchanger", "WetScrubber", "CatalyticConverter",
+           "HEPAFilter", "CarbonBed", "ExhaustStack")
+
+# feed ultimate analysis, mass fractions as received (US MSW average)
+FEED         = ("moisture", "ash", "C", "H", "O", "N", "S", "Cl")
+DEFAULT_FEED = np.array([0.25, 0.20, 0.28, 0.04, 0.21, 0.01, 0.002, 0.008])
+FEED_RATE    = 0.116        # kg/s, 10 t/day (EustressEngine requirements)
+
+SPECIES    = ("CO2", "H2O", "N2", "O2", "SO2", "HCl")
+MOLAR_MASS = np.array([44.010, 18.015, 28.013, 31.999, 64.066, 36.461]) / 1e3
+CP         = np.array([50.0, 39.0, 31.5, 33.0, 49.0, 30.5])  # J/(mol·K), mean
+CO2, H2O, N2, O2, SO2, HCL = range(len(SPECIES))
+
+R, T_REF     = 8.314462618, 298.15
+T_NORMAL, P_NORMAL = 273.15, 101325.0
+H_EVAP       = 44.0e3       # J/mol, water at T_REF
+EXCESS_AIR   = 1.5          # minimum λ
+COMBUSTION_T = 1473.15      # K, set-point
+COMBUSTION_ENVELOPE = (1273.15, 1673.15)
+CP_SYNGAS    = 2600.0       # J/(kg·K), effective, dissociating plasma gas
+CP_SLAG      = 1000.0       # J/(kg·K)
+H_FUSION_SLAG = 4.0e5       # J/kg
+FLY_ASH      = 0.02         # ash not vitrified, carried as dust
+SCRUBBER_DUST = 0.95
+PLASMA_EFFICIENCY = 0.5     # torch power reaching the melt
+HX_EFFECTIVENESS  = 0.85
+FEEDWATER_T  = 378.15
+TURBINE_EFFICIENCY = 0.38
+SCRUBBER_T   = 328.15
+HEPA_T       = 473.15
+HEPA_RATED_VELOCITY = 0.025  # m/s face velocity at the clean ΔP
+CARBON_T     = 423.15
+H_GAS        = 50.0         # W/(m²·K), gas to wall
+U_LOSS       = 5.0          # W/(m²·K), wall shell to ambient
+COOLING      = {"PlasmaChamber": 150.0}     # W/(m²·K), water jacket
+K_REFRACTORY = 1.5          # W/(m·K)
+LINING       = ("refractory_thickness_m", "refractory_lining_thickness_m")
+AMBIENT_T    = 293.15
+STACK_LIMITS = {"HCl": 1.0, "dust": 0.03}   # mg/Nm³
+REFERENCE_O2 = 0.11         # emissions normalized to 11% O2, dry gas
+
+_FEED_INDEX = {name: i for i, name in enumerate(FEED)}
+
+
+def plant(product=PRODUCT):
+    """{stage: {volume, pressure, area, wall_capacity, temperature,
+    melting_point, custom}} of STAGES from the product's sidecars; stages
+    without a [thermodynamic] table get volume None and no wall."""
+    sidecars = {sidecar.name(p): sidecar.load(p)
+                for p in sidecar.discover([product])}
+    out = {}
+    for stage in STAGES + ("AshHopper",):
+        data = sidecars.get(PREFIX + stage)
+        if data is None:
+            raise ValueError(f"no sidecar {PREFIX}{stage}")
+        mat = data.get("material", {})
+        thermo = data.get("thermodynamic")
+        physics = data.get("physics", {})
+        custom = mat.get("custom", {})
+        lining = sum(custom.get(k, 0.0) for k in LINING)
+        entry = {"custom": custom, "volume": None,
+                 "pressure": P_NORMAL, "area": 0.0, "wall_capacity": 0.0,
+                 "h_gas": 1.0 / (1.0 / H_GAS + lining / K_REFRACTORY),
+                 "u_loss": COOLING.get(stage, U_LOSS),
+                 "temperature": AMBIENT_T,
+                 "melting_point": mat.get("melting_point", np.inf)}
+        if thermo:
+            volume = thermo["volume"]
+            mass = physics.get("mass", mat.get("density", 0.0)
+                               * physics.get("volume", volume))
+            entry.update(volume=volume, pressure=thermo["pressure"],
+                         area=6.0 * volume ** (2.0 / 3.0),
+                         wall_capacity=mass * mat.get("specific_heat", 0.0),
+                         temperature=thermo["temperature"])
+        out[stage] = entry
+    return out
+
+
+def cases(feed_rate=FEED_RATE, composition=DEFAULT_FEED, plasma=None,
+          combustion_t=COMBUSTION_T, stages=None):
+    """Broadcast inputs to arrays over cases: feed_rate (kg/s),
+    composition (…, len(FEED)) mass fractions (normalized), plasma (W,
+    default the installed torch_power_kw) and combustion_t (K)."""
+    if plasma is None:
+        stages = plant() if stages is None else stages
+        plasma = stages["PlasmaChamber"]["custom"]["torch_power_kw"] * 1e3
+    composition = np.asarray(composition, dtype=np.float64)
+    composition = composition / composition.sum(axis=-1, keepdims=True)
+    rate, plasma, combustion_t = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in
+          (feed_rate, plasma, combustion_t)))
+    shape = np.broadcast_shapes(rate.shape, composition.shape[:-1])
+    return {"feed_rate": np.broadcast_to(rate, shape).ravel(),
+            "composition": np.broadcast_to(
+                composition, shape + (len(FEED),)).reshape(-1, len(FEED)),
+            "plasma": np.broadcast_to(plasma, shape).ravel(),
+            "combustion_t": np.broadcast_to(combustion_t, shape).ravel()}
+
+
+def heating_value(composition):
+    """Lower heating value (J/kg) of (…, len(FEED)) mass fractions."""
+    f = {k: composition[..., i] for k, i in _FEED_INDEX.items()}
+    hhv = (34.91 * f["C"] + 117.83 * f["H"] + 10.05 * f["S"]
+           - 1.51 * f["N"] - 10.34 * f["O"] - 2.11 * f["ash"]) * 1e6
+    return hhv - 2.442e6 * (8.937 * f["H"] + f["moisture"])
+
+
+def _wall(stage, temp, rate, wall, dt):
+    """(gas outlet temperature, wall temperature) of a stage whose gas
+    enters at `temp` with heat-capacity rate `rate` (W/K); steady if `dt`
+    is None, else one backward-Euler step from `wall`."""
+    if stage["volume"] is None:
+        return temp, wall
+    ua_gas = stage["h_gas"] * stage["area"]
+    ua_loss = stage["u_loss"] * stage["area"]
+    g = rate * -np.expm1(-ua_gas / np.maximum(rate, 1e-9))
+    if dt is None:
+        wall = (g * temp + ua_loss * AMBIENT_T) / (g + ua_loss)
+    else:
+        c = stage["wall_capacity"] / dt
+        wall = (c * wall + g * temp + ua_loss * AMBIENT_T) / (c + g + ua_loss)
+    out = temp - g * (temp - wall) / np.maximum(rate, 1e-9)
+    return out, wall
+
+
+def _quench(n, temp, target):
+    """Water (mol/s) evaporated to cool gas `n` from `temp` to `target`
+    (no-op where already colder), and the new temperature."""
+    target = np.minimum(temp, target)
+    water = (n @ CP) * (temp - target) / (H_EVAP + CP[H2O]
+                                          * (target - T_REF))
+    n[:, H2O] += water
+    return water, target
+
+
+def _flow(n, temp, pressure):
+    """(actual m³/s, normal m³/s) of gas `n` at `temp` and `pressure`."""
+    moles = n.sum(axis=1)
+    return moles * R * temp / pressure, moles * R * T_NORMAL / P_NORMAL
+
+
+def balance(stages, case, walls=None, dt=None):
+    """One pass of the gas through STAGES for every case; steady state
+    unless `walls` ({stage: wall temperature}) and `dt` are given.
+    Returns {"stages": {stage: {...}}, "limits": {check: mask}, "ok",
+    "electric", "walls"}."""
+    m = case["feed_rate"]
+    f = {k: case["composition"][:, i] * m for k, i in _FEED_INDEX.items()}
+    walls = {} if walls is None else walls
+    new_walls, out, limits = {}, {}, {}
+    count = len(m)
+
+    def wall(name, temp, rate):
+        stage = stages[name]
+        prev = walls.get(name, np.full(count, stage["temperature"]))
+        temp, new_walls[name] = _wall(stage, temp, rate, prev, dt)
+        return temp
+
+    def residence(name, temp, n):
+        actual, normal = _flow(n, temp, stages[name]["pressure"])
+        return stages[name]["volume"] / np.maximum(actual, 1e-12), \
+            actual, normal
+
+    # WasteFeed
+    lhv = heating_value(case["composition"])
+    out["WasteFeed"] = {"feed_rate": m, "lhv": lhv, "T": np.full(count,
+                                                                 T_REF)}
+
+    # PlasmaChamber: slag vitrification, syngas carries the rest
+    slag_t = stages["AshHopper"]["custom"]["slag_output_temp_k"]
+    slag = f["ash"] * (1.0 - FLY_ASH)
+    slag_duty = slag * (CP_SLAG * (slag_t - T_REF) + H_FUSION_SLAG)
+    syngas = np.maximum(m - slag, 1e-9)
+    t_plasma = T_REF + (case["plasma"] - slag_duty) / (syngas * CP_SYNGAS)
+    t_plasma = wall("PlasmaChamber", t_plasma, syngas * CP_SYNGAS)
+    sensible = syngas * CP_SYNGAS * (t_plasma - T_REF)
+    limits["slag"] = case["plasma"] * PLASMA_EFFICIENCY < slag_duty
+    out["PlasmaChamber"] = {"T": t_plasma, "slag": slag,
+                            "slag_duty": slag_duty}
+
+    # CombustionChamber: products, then λ for the set-point
+    hcl = f["Cl"] / 35.453e-3
+    fuel = np.zeros((count, len(SPECIES)))
+    fuel[:, CO2] = f["C"] / 12.011e-3
+    fuel[:, H2O] = (f["H"] / 1.008e-3 - hcl) / 2.0 + f["moisture"] / 18.015e-3
+    fuel[:, SO2] = f["S"] / 32.06e-3
+    fuel[:, HCL] = hcl
+    fuel[:, N2] = f["N"] / 28.013e-3
+    o2_stoich = np.maximum(fuel[:, CO2] + (fuel[:, H2O] - f["moisture"]
+                                           / 18.015e-3) / 2.0
+                           + fuel[:, SO2] - f["O"] / 31.998e-3, 0.0)
+    per_lambda = o2_stoich * (CP[O2] + 3.76 * CP[N2])
+    base = fuel @ CP - o2_stoich * CP[O2]
+    energy = m * lhv + sensible
+    target = np.maximum(case["combustion_t"] - T_REF, 1.0)
+    air = np.maximum((energy / target - base) / np.maximum(per_lambda, 1e-12),
+                     EXCESS_AIR)
+    n = fuel.copy()
+    n[:, O2] += (air - 1.0) * o2_stoich
+    n[:, N2] += 3.76 * air * o2_stoich
+    t_comb = T_REF + energy / (n @ CP)
+    limits["combustion_temperature"] = (t_comb < COMBUSTION_ENVELOPE[0]) \
+        | (t_comb > COMBUSTION_ENVELOPE[1])
+    dwell, _, _ = residence("CombustionChamber", t_comb, n)
+    custom = stages["CombustionChamber"]["custom"]
+    limits["combustion_dwell"] = dwell < custom["dwell_time_s"]
+    temp = wall("CombustionChamber", t_comb, n @ CP)
+    limits["combustion_wall"] = new_walls["CombustionChamber"] \
+        > custom["oxidation_limit_k"]
+    out["CombustionChamber"] = {"T": t_comb, "excess_air": air,
+                                "residence": dwell, "outlet_T": temp}
+
+    # HeatExchanger
+    custom = stages["HeatExchanger"]["custom"]
+    duty_max = custom["thermal_duty_mw"] * 1e6
+    duty = HX_EFFECTIVENESS * (n @ CP) * np.maximum(temp - FEEDWATER_T, 0.0)
+    limits["hx_duty"] = duty > duty_max
+    duty = np.minimum(duty, duty_max)
+    temp = wall("HeatExchanger", temp - duty / (n @ CP), n @ CP)
+    steam = duty * custom["steam_output_mw"] / custom["thermal_duty_mw"]
+    out["HeatExchanger"] = {"T": temp, "duty": duty, "steam": steam,
+                            "electric": steam * TURBINE_EFFICIENCY}
+
+    # WetScrubber
+    custom = stages["WetScrubber"]["custom"]
+    water, temp = _quench(n, temp, SCRUBBER_T)
+    removed_hcl = n[:, HCL] * custom["hcl_removal_pct"] / 100.0
+    removed_so2 = n[:, SO2] * custom["so2_removal_pct"] / 100.0
+    n[:, HCL] -= removed_hcl
+    n[:, SO2] -= removed_so2
+    temp = wall("WetScrubber", temp, n @ CP)
+    out["WetScrubber"] = {"T": temp, "water": water * MOLAR_MASS[H2O],
+                          "naoh": (removed_hcl + 2.0 * removed_so2) * 0.040}
+
+    # CatalyticConverter
+    custom = stages["CatalyticConverter"]["custom"]
+    reheat = (n @ CP) * np.maximum(custom["operating_temp_k"] - temp, 0.0)
+    temp = np.maximum(temp, custom["operating_temp_k"])
+    _, _, normal = residence("CatalyticConverter", temp, n)
+    velocity = normal * 3600.0 / stages["CatalyticConverter"]["volume"]
+    limits["catalyst_space_velocity"] = velocity > \
+        custom["space_velocity_per_h"]
+    temp = wall("CatalyticConverter", temp, n @ CP)
+    out["CatalyticConverter"] = {"T": temp, "reheat": reheat,
+                                 "space_velocity": velocity}
+
+    # HEPAFilter
+    custom = stages["HEPAFilter"]["custom"]
+    water, temp = _quench(n, temp, HEPA_T)
+    _, actual, _ = residence("HEPAFilter", temp, n)
+    face = actual / custom["filter_area_m2"]
+    drop = custom["pressure_drop_clean_pa"] * face / HEPA_RATED_VELOCITY
+    limits["hepa_pressure_drop"] = drop > custom["pressure_drop_loaded_pa"]
+    limits["hepa_temperature"] = temp > custom["max_operating_temp_k"]
+    dust = f["ash"] * FLY_ASH * (1.0 - SCRUBBER_DUST) \
+        * (1.0 - custom["filtration_efficiency_pct"] / 100.0)
+    temp = wall("HEPAFilter", temp, n @ CP)
+    out["HEPAFilter"] = {"T": temp, "water": water * MOLAR_MASS[H2O],
+                         "face_velocity": face, "pressure_drop": drop}
+
+    # CarbonBed
+    custom = stages["CarbonBed"]["custom"]
+    water, temp = _quench(n, temp, CARBON_T)
+    contact, _, _ = residence("CarbonBed", temp, n)
+    limits["carbon_contact"] = contact < custom["contact_time_s"]
+    temp = wall("CarbonBed", temp, n @ CP)
+    out["CarbonBed"] = {"T": temp, "water": water * MOLAR_MASS[H2O],
+                        "contact_time": contact}
+
+    # ExhaustStack
+    _, normal = _flow(n, temp, P_NORMAL)
+    dry = normal * (1.0 - n[:, H2O] / n.sum(axis=1))
+    o2_dry = n[:, O2] / (n.sum(axis=1) - n[:, H2O])
+    reference = dry * (0.21 - o2_dry) / (0.21 - REFERENCE_O2)
+    emissions = {"HCl": n[:, HCL] * MOLAR_MASS[HCL] * 1e6 / reference,
+                 "dust": dust * 1e6 / reference}
+    for key, limit in STACK_LIMITS.items():
+        limits[f"stack_{key}"] = emissions[key] > limit
+    out["ExhaustStack"] = {"T": temp, "flow": normal, "emissions": emissions,
+                           "composition": n / n.sum(axis=1, keepdims=True)}
+
+    melting = np.zeros(count, dtype=bool)
+    for name, t_wall in new_walls.items():
+        melting |= t_wall >= stages[name]["melting_point"]
+    limits["wall_melting"] = melting
+    for name in new_walls:
+        out[name]["wall_T"] = new_walls[name]
+    ok = ~np.any(np.stack(list(limits.values())), axis=0)
+    return {"stages": out, "limits": limits, "ok": ok, "walls": new_walls,
+            "electric": out["HeatExchanger"]["electric"]}
+
+
+def steady(stages, case):
+    return balance(stages, case)
+
+
+def transient(stages, case, seconds, dt=60.0, record=3600.0):
+    """Cold start: walls from their sidecar temperatures, stepped with
+    backward Euler under constant inputs. Returns ([(time, balance()
+    result)] every `record` seconds, steady-state result)."""
+    walls, rows = None, []
+    every = max(1, int(round(record / dt)))
+    for n in range(1, int(round(seconds / dt)) + 1):
+        result = balance(stages, case, walls, dt)
+        walls = result["walls"]
+        if n % every == 0:
+            rows.append((n * dt, result))
+    return rows, steady(stages, case)
+
+
+def capacity(stages, compositions, rates, **kwargs):
+    """(largest feasible feed rate per composition, NaN if none; the
+    balance() result over the len(compositions) × len(rates) grid)."""
+    compositions = np.asarray(compositions, dtype=np.float64)
+    rates = np.asarray(rates, dtype=np.float64)
+    case = cases(rates[None, :], compositions[:, None, :], stages=stages,
+                 **kwargs)
+    result = balance(stages, case)
+    ok = result["ok"].reshape(len(compositions), len(rates))
+    best = np.where(ok, rates[None, :], -np.inf).max(axis=1)
+    return np.where(np.isfinite(best), best, np.nan), result
+
+
+def sample_feeds(count, spread=0.25, seed=0):
+    """`count` compositions scattered around DEFAULT_FEED (Dirichlet, with
+    relative spread about `spread`)."""
+    rng = np.random.default_rng(seed)
+    concentration = DEFAULT_FEED * (1.0 / spread ** 2)
+    return rng.dirichlet(concentration, size=count)
+
+
+def stage_table(result, i=0):
+    lines = [f"{'stage':<20} {'gas K':>8} {'wall K':>8}  notes"]
+    for name in STAGES:
+        row = result["stages"][name]
+        notes = []
+        for key, unit, scale in (("excess_air", "λ", 1), ("residence", "s", 1),
+                                 ("duty", "kW", 1e-3), ("reheat", "kW", 1e-3),
+                                 ("water", "kg/s", 1), ("naoh", "kg/s", 1),
+                                 ("space_velocity", "/h", 1),
+                                 ("pressure_drop", "Pa", 1),
+                                 ("contact_time", "s", 1),
+                                 ("lhv", "MJ/kg", 1e-6),
+                                 ("slag_duty", "kW", 1e-3)):
+            if key in row:
+                notes.append(f"{key} {row[key][i] * scale:.4g} {unit}")
+        if name == "ExhaustStack":
+            notes += [f"{k} {v[i]:.3g} mg/Nm³"
+                      for k, v in row["emissions"].items()]
+        wall = row.get("wall_T")
+        lines.append(f"{name:<20} {row['T'][i]:8.1f} "
+                     f"{'-' if wall is None else f'{wall[i]:.1f}':>8}  "
+                     f"{', '.join(notes)}")
+    failed = [k for k, v in result["limits"].items() if v[i]]
+    lines.append(f"electric {result['electric'][i] / 1e3:.0f} kW; limits "
+                 f"{'exceeded: ' + ', '.join(failed) if failed else 'met'}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.incinerator",
+        description="Mass and energy balance of the V-Incinerator gas path.")
+    parser.add_argument("--feed", type=float, default=FEED_RATE,
+                        help="feed rate, kg/s (default: %(default)s)")
+    parser.add_argument("--plasma", type=float, default=None,
+                        help="torch power, kW (default: installed)")
+    parser.add_argument("--combustion-t", type=float, default=COMBUSTION_T,
+                        help="combustion set-point, K")
+    parser.add_argument("--sweep", type=int, default=0, metavar="N",
+                        help="capacity of N sampled feed compositions")
+    parser.add_argument("--rates", type=int, default=64,
+                        help="feed-rate set-points per composition in "
+                             "--sweep (up to 4 × --feed)")
+    parser.add_argument("--transient", type=float, default=0.0,
+                        metavar="HOURS", help="simulate a cold start")
+    parser.add_argument("--dt", type=float, default=60.0,
+                        help="transient time step, s")
+    args = parser.parse_args(argv)
+
+    try:
+        stages = plant()
+    except (ValueError, KeyError) as exc:
+        parser.error(str(exc))
+    plasma = None if args.plasma is None else args.plasma * 1e3
+    t0 = time.perf_counter()
+    if args.sweep:
+        feeds = sample_feeds(args.sweep)
+        rates = np.linspace(args.feed / args.rates * 4, args.feed * 4,
+                            args.rates)
+        best, result = capacity(stages, feeds, rates, plasma=plasma,
+                                combustion_t=args.combustion_t)
+        seconds = time.perf_counter() - t0
+        lhv = heating_value(feeds) / 1e6
+        found = np.isfinite(best)
+        print(f"{len(feeds)} compositions × {len(rates)} feed rates "
+              f"({len(feeds) * len(rates)} cases) in {seconds:.2f} s")
+        if found.any():
+            q = np.percentile(best[found], [5, 50, 95])
+            print(f"capacity kg/s: P5 {q[0]:.4f}  P50 {q[1]:.4f}  "
+                  f"P95 {q[2]:.4f}  ({q[1] * 86.4:.1f} t/day median)")
+            print(f"LHV MJ/kg: {lhv.min():.2f}–{lhv.max():.2f}; capacity "
+                  f"vs LHV correlation "
+                  f"{np.corrcoef(lhv[found], best[found])[0, 1]:+.2f}")
+        print(f"no feasible rate for {int((~found).sum())} compositions")
+        binding = {k: int(v.sum()) for k, v in result["limits"].items()}
+        print("cases failing each limit: " + ", ".join(
+            f"{k} {v}" for k, v in sorted(binding.items(),
+                                          key=lambda kv: -kv[1]) if v))
+        return 0
+    case = cases(args.feed, plasma=plasma, combustion_t=args.combustion_t,
+                 stages=stages)
+    if args.transient:
+        rows, final = transient(stages, case, args.transient * 3600.0,
+                                args.dt)
+        walled = [s for s in STAGES if s in final["walls"]]
+        print(f"{'hours':>6} " + " ".join(f"{s[:11]:>11}" for s in walled)
+              + "   (wall K)")
+        for t, result in rows:
+            print(f"{t / 3600:6.1f} " + " ".join(
+                f"{result['walls'][s][0]:11.1f}" for s in walled))
+        print(f"{'steady':>6} " + " ".join(
+            f"{final['walls'][s][0]:11.1f}" for s in walled))
+        print(f"{len(rows)} rows in {time.perf_counter() - t0:.2f} s")
+        return 0
+    result = steady(stages, case)
+    print(stage_table(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+# ============================================================================
+# index.py — Columnar index over every .glb.toml sidecar
+# Questions such as "total mass of the V-Pump" or "parts melting above
+# 800 K" otherwise mean parsing every sidecar again. load() flattens each
+# sidecar to dotted keys ("material.density", "material.custom.role",
+# "electrochemical.capacity_ah") and holds one column per key across all
+# components:
+#   - numbers as float64, NaN where a sidecar lacks the key
+#   - fixed-length number lists ([transform].position …) as (N, k) float64
+#   - strings, booleans and anything mixed as object arrays, None if absent
+# plus the derived column "mass": physics.mass where massprops.py has
+# written it, else material.density × thermodynamic.volume.
+#
+# The flattened sidecars are kept in <.build>/sidecar_index.json with each
+# file's mtime and size; load() re-parses only the files that changed, were
+# added or were removed since, so a refresh costs one stat per sidecar.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.index                                # summary
+#   python -m voltec_mesh.index V-Pump --sum mass
+#   python -m voltec_mesh.index -w "material.melting_point > 800" \
+#       -c material.name material.melting_point
+# ============================================================================
+import argparse
+import json
+import operator
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from . import sidecar
+
+INDEX_FILE    = os.path.join(sidecar.PRODUCTS_DIR, ".build",
+                             "sidecar_index.json")
+INDEX_VERSION = 1
+OPS = {"<": operator.lt, "<=": operator.le, ">": operator.gt,
+       ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+
+_CONDITION_RE = re.compile(r"^\s*([\w.]+)\s*(<=|>=|==|!=|<|>)\s*(.+?)\s*$")
+
+
+def flatten(data, prefix=""):
+    """{dotted key: value} of a parsed sidecar; arrays of tables
+    ([asset].lods) are left out."""
+    out = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            out.update(flatten(value, f"{prefix}{key}."))
+        elif not (isinstance(value, list) and value
+                  and isinstance(value[0], dict)):
+            out[prefix + key] = value
+    return out
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _column(values):
+    """Typed array of one key's values (None where missing)."""
+    present = [v for v in values if v is not None]
+    if present and all(_is_number(v) for v in present):
+        return np.array([np.nan if v is None else v for v in values],
+                        dtype=np.float64)
+    if (present and all(isinstance(v, list) for v in present)
+            and len({len(v) for v in present}) == 1
+            and all(_is_number(x) for v in present for x in v)):
+        width = len(present[0])
+        return np.array([[np.nan] * width if v is None else v
+                         for v in values], dtype=np.float64)
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+class Index:
+    """Columns of the flattened sidecars, one row per component; see the
+    module header."""
+
+    def __init__(self, records):
+        self.paths = np.array([r["path"] for r in records], dtype=object)
+        self.names = np.array([sidecar.name(p) for p in self.paths],
+                              dtype=object)
+        self.products = np.array(
+            [os.path.basename(os.path.dirname(os.path.dirname(p)))
+             for p in self.paths], dtype=object)
+        keys = sorted({k for r in records for k in r["values"]})
+        self.columns = {k: _column([r["values"].get(k) for r in records])
+                        for k in keys}
+        if {"material.density", "thermodynamic.volume"} <= self.columns.keys():
+            self.columns["mass"] = (self.columns["material.density"]
+                                    * self.columns["thermodynamic.volume"])
+        if "physics.mass" in self.columns:
+            measured = self.columns["physics.mass"]
+            self.columns["mass"] = np.where(
+                np.isnan(measured), self.columns.get("mass", np.nan), measured)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __getitem__(self, key):
+        return self.columns[key]
+
+    def keys(self):
+        return self.columns.keys()
+
+    def mask(self, conditions=(), products=()):
+        """Boolean row mask: every (key, op, value) condition holds and the
+        product is one of `products` (if given). Comparisons with a missing
+        value are false."""
+        keep = np.ones(len(self), dtype=bool)
+        if products:
+            keep &= np.isin(self.products, [os.path.basename(
+                os.path.normpath(p)) for p in products])
+        for key, op, value in conditions:
+            col = self.columns.get(key)
+            if col is None:
+                return np.zeros(len(self), dtype=bool)
+            if col.dtype == object:
+                hit = np.array([v is not None and _compare(OPS[op], v, value)
+                                for v in col], dtype=bool)
+            else:
+                with np.errstate(invalid="ignore"):
+                    hit = OPS[op](col, value)
+                if hit.ndim > 1:
+                    hit = hit.all(axis=1)
+            keep &= hit
+        return keep
+
+    def rows(self, mask=None, keys=()):
+        """[{"name", "product", key: value, ...}] of the rows in `mask`."""
+        out = []
+        for i in np.flatnonzero(np.ones(len(self), dtype=bool)
+                                if mask is None else mask):
+            row = {"name": self.names[i], "product": self.products[i]}
+            for key in keys:
+                value = self.columns[key][i] if key in self.columns else None
+                row[key] = value.tolist() if isinstance(value, np.ndarray) \
+                    else value
+            out.append(row)
+        return out
+
+    def total(self, key, mask=None):
+        """Sum of a numeric column over `mask`, missing values skipped."""
+        col = self.columns[key]
+        return float(np.nansum(col if mask is None else col[mask]))
+
+
+def _compare(op, a, b):
+    try:
+        return bool(op(a, b))
+    except TypeError:
+        return False
+
+
+def parse_condition(text):
+    """("material.melting_point", ">", 800.0) from "material.melting_point >
+    800"; the value is a number, true/false or a (quoted) string."""
+    match = _CONDITION_RE.match(text)
+    if match is None:
+        raise ValueError(f"not a condition: {text!r}")
+    key, op, raw = match.groups()
+    if raw in ("true", "false"):
+        value = raw == "true"
+    else:
+        try:
+            value = float(raw)
+        except ValueError:
+            value = raw.strip("\"'")
+    return key, op, value
+
+
+# --- Store -----------------------------------------------------------------
+def _read_store(path):
+    try:
+        with open(path) as f:
+            store = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if store.get("version") != INDEX_VERSION:
+        return {}
+    return store.get("files", {})
+
+
+def refresh(paths, store_path=INDEX_FILE):
+    """(records for `paths`, number of files re-parsed): records whose
+    sidecar's mtime and size match the store are reused, the rest parsed
+    and the store rewritten."""
+    files = _read_store(store_path)
+    records, parsed = [], 0
+    for path in paths:
+        stat = os.stat(path)
+        key = os.path.relpath(path, sidecar.PRODUCTS_DIR)
+        record = files.get(key)
+        if (record is None or record["mtime_ns"] != stat.st_mtime_ns
+                or record["size"] != stat.st_size):
+            record = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+                      "values": flatten(sidecar.load(path))}
+            files[key] = record
+            parsed += 1
+        records.append(dict(record, path=os.path.abspath(path)))
+    wanted = {os.path.relpath(p, sidecar.PRODUCTS_DIR) for p in paths}
+    stale = [k for k in files if k not in wanted
+             and not os.path.exists(os.path.join(sidecar.PRODUCTS_DIR, k))]
+    if parsed or stale:
+        for k in stale:
+            del files[k]
+        os.makedirs(os.path.dirname(store_path), exist_ok=True)
+        with open(store_path, "w") as f:
+            json.dump({"version": INDEX_VERSION, "files": files}, f)
+    return records, parsed
+
+
+def load(products=(), store_path=INDEX_FILE):
+    """Index of the sidecars of `products` (default: all), refreshed."""
+    records, _ = refresh(sidecar.discover(products), store_path)
+    return Index(records)
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f"{value:.6g}"
+    if isinstance(value, list):
+        return "[" + ", ".join(_format(v) for v in value) + "]"
+    return "-" if value is None else str(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.index",
+        description="Query the sidecars of the catalogue as columns.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("-w", "--where", action="append", default=[],
+                        help='condition such as "material.density > 5000" '
+                             "(repeat for AND)")
+    parser.add_argument("-c", "--columns", nargs="+", default=(),
+                        help="columns to print for the matching components")
+    parser.add_argument("--sum", nargs="+", default=(),
+                        help="numeric columns to total over the matches")
+    parser.add_argument("--keys", action="store_true",
+                        help="list the indexed columns")
+    parser.add_argument("--store", default=INDEX_FILE,
+                        help="index file (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    records, parsed = refresh(sidecar.discover(), args.store)
+    index = Index(records)
+    loaded = time.perf_counter() - t0
+    try:
+        conditions = [parse_condition(w) for w in args.where]
+    except ValueError as exc:
+        parser.error(str(exc))
+    for key in [c[0] for c in conditions] + list(args.columns) + \
+            list(args.sum):
+        if key not in index.keys():
+            parser.error(f"unknown column {key!r} (see --keys)")
+    t1 = time.perf_counter()
+    mask = index.mask(conditions, args.products)
+    totals = {key: index.total(key, mask) for key in args.sum}
+    rows = index.rows(mask, args.columns)
+    query = time.perf_counter() - t1
+
+    if args.keys:
+        for key, col in index.columns.items():
+            kind = "text" if col.dtype == object else (
+                f"float[{col.shape[1]}]" if col.ndim > 1 else "float")
+            print(f"{key:<48} {kind}")
+    for row in rows if (args.columns or args.where) else ():
+        print(f"{row['name']:<34} " + "  ".join(
+            _format(row[k]) for k in args.columns))
+    for key, value in totals.items():
+        print(f"sum {key}: {value:.6g} over {int(mask.sum())} components")
+    print(f"{len(index)} sidecars, {len(index.keys())} columns "
+          f"({parsed} re-parsed, {loaded * 1000:.1f} ms); "
+          f"{int(mask.sum())} match, query {query * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+# ============================================================================
+# instancing.py — EXT_mesh_gpu_instancing for repeated hardware in a GLB
+# The scripts join repeated parts (tie rods, hex nuts, pins, LED lenses)
+# into one object before export, so the GLB carries every copy's vertices.
+# instance() finds the copies again and rewrites the document with one
+# prototype mesh per repeated feature plus per-instance transforms:
+#   - each primitive is split into connected components (vertices welded
+#     by position, so normal/UV seams do not split a part)
+#   - components with the same vertex and triangle counts are matched
+#     against a prototype: by translation, then by the rotations that align
+#     their principal axes (spun about the axis for round parts); a match
+#     needs every vertex within POSITION_TOL of the moved prototype
+#   - groups of at least MIN_INSTANCES that save MIN_SAVED_VERTICES or more
+#     (smaller ones cost more in JSON and buffer views than they save)
+#     become a child node of the mesh node with the prototype, centred on
+#     its centroid, and the TRANSLATION / ROTATION attributes of the
+#     extension; the rest stays in the mesh
+# Parts fused by a boolean UNION are one component with their base and
+# stay where they are. The result has plain float buffers; meshopt.encode()
+# compresses it, so instanced assets always ship meshopt encoded (the
+# catalogue's --instance runs this inside meshopt.choose()).
+#
+# Usage (from docs/Products; needs SciPy, DracoPy for Draco GLBs):
+#   python -m voltec_mesh.instancing V-Cell/V1/meshes/VCell_CompressionFrame.glb
+# ============================================================================
+import argparse
+import copy
+import itertools
+import sys
+
+import numpy as np
+
+from .draco_bench import POSITION_TOL
+from .glb import DRACO, INSTANCING, MESHOPT, Glb
+
+MIN_INSTANCES      = 2
+MIN_SAVED_VERTICES = 256
+MAX_SPINS          = 64    # spin candidates tried per round part
+EIGEN_RTOL         = 1e-3  # principal moments closer than this are equal
+
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+
+def components(arrays):
+    """(welded positions, welded id per vertex, component id per triangle,
+    component count) of one primitive."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    pos = arrays["POSITION"].astype(np.float64)
+    welded, weld = np.unique(pos, axis=0, return_inverse=True)
+    weld = weld.ravel()
+    tris = weld[arrays["indices"]]
+    edges = np.concatenate([tris[:, [0, 1]], tris[:, [1, 2]]])
+    graph = coo_matrix((np.ones(len(edges)), (edges[:, 0], edges[:, 1])),
+                       shape=(len(welded), len(welded)))
+    count, labels = connected_components(graph, directed=False)
+    return welded, weld, labels[tris[:, 0]], count
+
+
+def _quaternion(rot):
+    """(x, y, z, w) unit quaternion of a 3×3 rotation."""
+    m = rot
+    t = np.trace(m)
+    if t > 0:
+        s = 2.0 * np.sqrt(1.0 + t)
+        q = ((m[2, 1] - m[1, 2]) / s, (m[0, 2] - m[2, 0]) / s,
+             (m[1, 0] - m[0, 1]) / s, 0.25 * s)
+    else:
+        i = int(np.argmax(np.diag(m)))
+        j, k = (i + 1) % 3, (i + 2) % 3
+        s = 2.0 * np.sqrt(1.0 + m[i, i] - m[j, j] - m[k, k])
+        q = [0.0, 0.0, 0.0, (m[k, j] - m[j, k]) / s]
+        q[i] = 0.25 * s
+        q[j] = (m[j, i] + m[i, j]) / s
+        q[k] = (m[k, i] + m[i, k]) / s
+    q = np.asarray(q)
+    return q / np.linalg.norm(q)
+
+
+def _axis_rotation(a, b):
+    """Rotation taking unit vector `a` onto unit vector `b`."""
+    v, c = np.cross(a, b), float(np.dot(a, b))
+    if c < -1 + 1e-12:
+        perp = np.eye(3)[np.argmin(np.abs(a))]
+        v = np.cross(a, perp)
+        v /= np.linalg.norm(v)
+        return 2 * np.outer(v, v) - np.eye(3)
+    k = np.array([[0, -v[2], v[1]], [v[2], 0, -v[0]], [-v[1], v[0], 0]])
+    return np.eye(3) + k + k @ k / (1 + c)
+
+
+def _axis_rotation_angle(u, angle):
+    """Rotation by `angle` about unit axis `u`."""
+    k = np.array([[0, -u[2], u[1]], [u[2], 0, -u[0]], [-u[1], u[0], 0]])
+    return np.eye(3) + np.sin(angle) * k + (1 - np.cos(angle)) * k @ k
+
+
+class _Shape:
+    """Centred welded points of one component with its principal axes."""
+
+    def __init__(self, points):
+        self.centroid = points.mean(0)
+        self.points = points - self.centroid
+        self.moments, self.axes = np.linalg.eigh(
+            self.points.T @ self.points / len(points))
+        self._tree = None
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+
+            self._tree = cKDTree(self.points)
+        return self._tree
+
+    def fits(self, other, rot, tol):
+        """Whether `rot` maps this shape onto `other` within `tol`."""
+        dist, _ = self.tree.query(other.points @ rot, distance_upper_bound=tol)
+        return bool(np.isfinite(dist).all())
+
+    def _rotations(self, other, tol):
+        """Candidate rotations taking this shape onto `other`."""
+        yield np.eye(3)
+        scale = max(self.moments.max(), 1e-30)
+        if not np.allclose(self.moments, other.moments, rtol=EIGEN_RTOL,
+                           atol=tol * tol):
+            return
+        gaps = np.diff(self.moments) / scale
+        distinct = gaps > EIGEN_RTOL
+        if distinct.all():
+            for signs in itertools.product((1, -1), repeat=3):
+                rot = other.axes @ np.diag(signs) @ self.axes.T
+                if np.linalg.det(rot) > 0:
+                    yield rot
+            return
+        if not distinct.any():
+            return
+        # round part: align the odd axis, then spin about it
+        a = 0 if distinct[0] else 2
+        ref = self.points
+        for sign in (1, -1):
+            align = _axis_rotation(self.axes[:, a], sign * other.axes[:, a])
+            u = other.axes[:, a]
+            moved = ref @ align.T
+            height = moved @ u
+            radial = moved - np.outer(height, u)
+            radius = np.linalg.norm(radial, axis=1)
+            i = int(np.argmax(radius))
+            if radius[i] <= tol:
+                yield align
+                continue
+            o_height = other.points @ u
+            o_radial = other.points - np.outer(o_height, u)
+            o_radius = np.linalg.norm(o_radial, axis=1)
+            cand = np.nonzero((np.abs(o_height - height[i]) <= tol)
+                              & (np.abs(o_radius - radius[i]) <= tol))[0]
+            for j in cand[:MAX_SPINS]:
+                x = radial[i] / radius[i]
+                y = o_radial[j] / o_radius[j]
+                angle = np.arctan2(np.dot(np.cross(x, y), u), np.dot(x, y))
+                spin = _axis_rotation_angle(u, angle)
+                yield spin @ align
+
+    def match(self, other, tol):
+        """Rotation taking this shape onto `other`, or None."""
+        for rot in self._rotations(other, tol):
+            if self.fits(other, rot, tol):
+                return rot
+        return None
+
+
+def find(arrays, tol=POSITION_TOL, min_instances=MIN_INSTANCES):
+    """Repeated parts of one primitive: a list of (prototype triangle mask,
+    centroid, [(rotation, translation), ...]) and the mask of triangles
+    that stay in the mesh."""
+    welded, weld, tri_comp, count = components(arrays)
+    comp_points = np.bincount(np.unique(
+        np.column_stack([tri_comp.repeat(3), weld[arrays["indices"]].ravel()]),
+        axis=0)[:, 0], minlength=count)
+    tri_count = np.bincount(tri_comp, minlength=count)
+    buckets = {}
+    for c in range(count):
+        buckets.setdefault((comp_points[c], tri_count[c]), []).append(c)
+    groups, rest = [], np.ones(len(tri_comp), dtype=bool)
+    for members in buckets.values():
+        if len(members) < min_instances:
+            continue
+        protos = []  # (component, shape, [(component, rot, centroid)])
+        for c in members:
+            verts = np.unique(weld[arrays["indices"][tri_comp == c]])
+            shape = _Shape(welded[verts])
+            for _, proto, found in protos:
+                rot = proto.match(shape, tol)
+                if rot is not None:
+                    found.append((c, rot, shape.centroid))
+                    break
+            else:
+                protos.append((c, shape, [(c, np.eye(3), shape.centroid)]))
+        for c, shape, found in protos:
+            saved = (len(found) - 1) * len(shape.points)
+            if len(found) < min_instances or saved < MIN_SAVED_VERTICES:
+                continue
+            mask = np.isin(tri_comp, [f[0] for f in found])
+            rest &= ~mask
+            groups.append((tri_comp == c, shape.centroid,
+                           [(rot, t) for _, rot, t in found]))
+    return groups, rest
+
+
+def _subset(arrays, tri_mask, offset=None):
+    """Arrays of the triangles in `tri_mask` with unused vertices dropped;
+    positions moved by -`offset`."""
+    tris = arrays["indices"][tri_mask]
+    keep, inverse = np.unique(tris, return_inverse=True)
+    out = {name: values[keep] for name, values in arrays.items()
+           if name != "indices"}
+    if offset is not None:
+        out["POSITION"] = (out["POSITION"] - offset).astype(np.float32)
+    out["indices"] = inverse.reshape(-1, 3)
+    return out
+
+
+def _primitive(doc, source, arrays):
+    """glTF primitive for `arrays`, keeping material and mode of `source`."""
+    attrs = {}
+    for name, values in arrays.items():
+        if name == "indices":
+            continue
+        values = values.astype(np.float32)
+        attrs[name] = doc.add_accessor(values, _ARRAY_BUFFER,
+                                       bounds=name == "POSITION")
+    prim = {"attributes": attrs,
+            "indices": doc.add_accessor(arrays["indices"].astype(np.uint32)
+                                        .ravel(), _ELEMENT_ARRAY_BUFFER)}
+    for key in ("material", "mode"):
+        if key in source:
+            prim[key] = source[key]
+    return prim
+
+
+def instance(doc, tol=POSITION_TOL, min_instances=MIN_INSTANCES):
+    """(Glb, report) with the repeated parts of `doc` instanced, or (None,
+    report) if nothing repeats. `report` lists one dict per instanced part
+    (mesh, vertices, instances)."""
+    out = Glb(copy.deepcopy(doc.gltf))
+    gltf = out.gltf
+    for key in ("accessors", "bufferViews", "buffers"):
+        gltf.pop(key, None)
+    meshes, gltf["meshes"] = gltf.get("meshes", []), []
+    nodes = gltf.setdefault("nodes", [])
+    users = {}                      # source mesh -> nodes, before parts
+    for n, node in enumerate(nodes):
+        if "mesh" in node:
+            users.setdefault(node["mesh"], []).append(n)
+    mesh_map, report = {}, []
+    for m, mesh in enumerate(meshes):
+        rest_prims, parts = [], []
+        for p, source in enumerate(mesh["primitives"]):
+            arrays = doc.primitive(m, p)
+            groups, rest = find(arrays, tol, min_instances)
+            if rest.any():
+                rest_prims.append(_primitive(out, source,
+                                             _subset(arrays, rest)))
+            for mask, centroid, placed in groups:
+                proto = _subset(arrays, mask, centroid)
+                parts.append((_primitive(out, source, proto), placed))
+                report.append({"mesh": mesh.get("name", str(m)),
+                               "vertices": len(proto["POSITION"]),
+                               "instances": len(placed)})
+        if rest_prims:
+            mesh_map[m] = len(gltf["meshes"])
+            gltf["meshes"].append(dict(mesh, primitives=rest_prims))
+        for k, (prim, placed) in enumerate(parts):
+            gltf["meshes"].append({"name": f"{mesh.get('name', m)}_part{k}",
+                                   "primitives": [prim]})
+            trans = np.array([t for _, t in placed], dtype=np.float32)
+            quats = np.array([_quaternion(r) for r, _ in placed],
+                             dtype=np.float32)
+            attrs = {"TRANSLATION": out.add_accessor(trans),
+                     "ROTATION": out.add_accessor(quats)}
+            for n in users.get(m, ()):
+                nodes.append({"name": f"{nodes[n].get('name', n)}_part{k}",
+                              "mesh": len(gltf["meshes"]) - 1,
+                              "extensions": {INSTANCING: {
+                                  "attributes": dict(attrs)}}})
+                nodes[n].setdefault("children", []).append(len(nodes) - 1)
+    if not report:
+        return None, report
+    for node in nodes:
+        if "mesh" in node and INSTANCING not in node.get("extensions", {}):
+            if node["mesh"] in mesh_map:
+                node["mesh"] = mesh_map[node["mesh"]]
+            else:
+                del node["mesh"]
+    for key in ("extensionsUsed", "extensionsRequired"):
+        kept = [e for e in gltf.get(key, []) if e not in (DRACO, MESHOPT)]
+        gltf[key] = kept + [INSTANCING]
+    out.gltf["buffers"][0]["byteLength"] = len(out.bin)
+    return out, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.instancing",
+        description="Report (and optionally write) the instanced form of "
+                    "GLBs.")
+    parser.add_argument("glbs", nargs="+")
+    parser.add_argument("-o", "--out", default=None,
+                        help="write the instanced, meshopt-encoded GLB here "
+                             "(one input only)")
+    args = parser.parse_args(argv)
+    if args.out and len(args.glbs) != 1:
+        parser.error("--out takes one input GLB")
+
+    from .meshopt import encode
+
+    for path in args.glbs:
+        doc = Glb.read(path)
+        instanced, report = instance(doc)
+        if instanced is None:
+            print(f"{path}: nothing repeats")
+            continue
+        before = sum(len(a["POSITION"]) for _, _, a in doc.primitives())
+        after = sum(len(a["POSITION"]) for _, _, a in instanced.primitives())
+        parts = ", ".join(f"{r['instances']}x{r['vertices']}" for r in report)
+        print(f"{path}: {before} -> {after} vertices ({parts})")
+        if args.out:
+            encode(instanced).write(args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
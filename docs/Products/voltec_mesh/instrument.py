@@ -0,0 +1,132 @@
+# ============================================================================
+# instrument.py — Per-call wall time, face counts and peak memory for the
+# build helpers in build.py
+#
+# Every helper runs inside `measure()`, which appends one record per call.
+# `report()` prints a per-helper summary at the end of a script and, when the
+# VOLTEC_MESH_STATS environment variable names a directory, also writes the raw
+# records to <dir>/<name>.json so whole-catalogue runs can be compared.
+# ============================================================================
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+STATS_ENV = "VOLTEC_MESH_STATS"
+
+RECORDS = []
+
+
+def face_count(obj):
+    if obj is None or getattr(obj, "type", None) != "MESH":
+        return 0
+    return len(obj.data.polygons)
+
+
+def peak_rss_mb():
+    """High-water resident set size of this process in MiB."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD),
+                        ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters), counters.cb)
+        return counters.PeakWorkingSetSize / 2**20
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class Call:
+    """Handle yielded by `measure()`; set the result with `output()`."""
+
+    def __init__(self, helper, faces_in, detail):
+        self.record = {"helper": helper, "seconds": 0.0,
+                       "faces_in": faces_in, "faces_out": 0,
+                       "peak_mb": 0.0, **detail}
+
+    def output(self, *objs):
+        self.record["faces_out"] = sum(face_count(o) for o in objs)
+
+    def note(self, **detail):
+        self.record.update(detail)
+
+
+@contextmanager
+def measure(helper, *inputs, **detail):
+    call = Call(helper, sum(face_count(o) for o in inputs), detail)
+    t0 = time.perf_counter()
+    try:
+        yield call
+    finally:
+        call.record["seconds"] = time.perf_counter() - t0
+        call.record["peak_mb"] = peak_rss_mb()
+        RECORDS.append(call.record)
+
+
+def summary(records=None):
+    """Aggregate records per helper, in first-call order."""
+    rows = {}
+    for rec in RECORDS if records is None else records:
+        row = rows.setdefault(rec["helper"], {
+            "calls": 0, "seconds": 0.0, "faces_in": 0, "faces_out": 0,
+            "peak_mb": 0.0})
+        row["calls"] += 1
+        row["seconds"] += rec["seconds"]
+        row["faces_in"] += rec["faces_in"]
+        row["faces_out"] += rec["faces_out"]
+        row["peak_mb"] = max(row["peak_mb"], rec["peak_mb"])
+    return rows
+
+
+def reset():
+    RECORDS.clear()
+
+
+def report(name):
+    """Print the per-helper table for this run and write the JSON stats file
+    if VOLTEC_MESH_STATS is set. Returns the summary dict."""
+    rows = summary()
+    print(f"[{name}] {'helper':<14} {'calls':>5} {'time s':>8} "
+          f"{'faces in':>9} {'faces out':>9} {'peak MB':>8}")
+    for helper, row in rows.items():
+        print(f"[{name}] {helper:<14} {row['calls']:5d} "
+              f"{row['seconds']:8.3f} {row['faces_in']:9d} "
+              f"{row['faces_out']:9d} {row['peak_mb']:8.1f}")
+    total = sum(row["seconds"] for row in rows.values())
+    print(f"[{name}] {'total':<14} {len(RECORDS):5d} {total:8.3f}")
+    routed = [rec for rec in RECORDS if "route" in rec]
+    if routed:
+        routes = [rec["route"] for rec in routed]
+        line = ", ".join(f"{routes.count(r)} {r}"
+                         for r in ("JOIN", "FAST", "EXACT"))
+        reasons = [rec["fallback"] for rec in routed if "fallback" in rec]
+        if reasons:
+            line += " (FAST passed over: " + ", ".join(
+                f"{reasons.count(r)} {r}"
+                for r in sorted(set(reasons), key=reasons.index)) + ")"
+        print(f"[{name}] bool_op routing: {line}")
+    out_dir = os.environ.get(STATS_ENV)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+        with open(os.path.join(out_dir, f"{name}.json"), "w") as f:
+            json.dump({"name": name, "summary": rows, "records": RECORDS},
+                      f, indent=1)
+    return rows
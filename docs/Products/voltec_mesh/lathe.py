@@ -0,0 +1,75 @@
+# ============================================================================
+# lathe.py — Solids of revolution from a 2D (r, z) outline
+# Spins closed outlines in the r ≥ 0 half-plane about Z in one vectorized
+# pass: every outline point becomes a ring (a single pole vertex on the axis)
+# and every outline edge a band of quads. Coaxial stacks of tubes, flanges,
+# fins and stiffener rings that used to be one boolean per feature come out
+# as a single watertight mesh with quad sides.
+#
+# Outline rules:
+#   - points are (r, z) pairs; the outline closes back to its first point
+#     and may run either way round (it is oriented counter-clockwise)
+#   - edges lying on the axis emit nothing, so a hollow vessel is one outline
+#     that returns along the axis through its cavity
+#   - a flat edge from a ring to the axis closes as one n-gon cap like the
+#     cylinder primitive, a sloped one as a triangle fan to the apex
+#   - several outlines (e.g. a vessel and a separate skirt) may share a mesh
+# Rings reuse primitives.ring(), so lathe rings coincide bit for bit with
+# add_cyl() cylinders of the same radius and segment count.
+# ============================================================================
+import numpy as np
+
+from .primitives import polys, ring
+
+
+def _outlines(profile):
+    """One (r, z) outline or a list of them, as a list of (K, 2) arrays."""
+    if np.ndim(profile[0]) == 1:
+        profile = [profile]
+    return [np.asarray(o, dtype=np.float64).reshape(-1, 2) for o in profile]
+
+
+def _prepare(outline):
+    """Drop repeated points and orient the outline counter-clockwise."""
+    keep = np.any(outline != np.roll(outline, 1, axis=0), axis=1)
+    pts = outline[keep] if keep.any() else outline[:1]
+    if len(pts) < 3 or (pts[:, 0] < 0).any():
+        raise ValueError("lathe outline needs 3+ distinct points with r >= 0")
+    r, z = pts[:, 0], pts[:, 1]
+    if np.dot(r, np.roll(z, -1)) - np.dot(np.roll(r, -1), z) < 0:
+        pts = pts[::-1]
+    return pts
+
+
+def lathe_arrays(profile, segs=48):
+    """Vertices and faces of `profile` (one outline or a list) revolved
+    about Z with `segs` segments."""
+    verts, blocks, n = [], [], 0
+    nxt = np.roll(np.arange(segs), -1)
+    for pts in map(_prepare, _outlines(profile)):
+        idx, pole = [], pts[:, 0] == 0
+        for (r, z), on_axis in zip(pts, pole):
+            if on_axis:
+                verts.append([[0.0, 0.0, z]])
+                idx.append(np.full(segs, n))
+                n += 1
+            else:
+                verts.append(ring(r, z, segs))
+                idx.append(n + np.arange(segs))
+                n += segs
+        for a in range(len(pts)):
+            b = (a + 1) % len(pts)
+            ia, ib = idx[a], idx[b]
+            if pole[a] and pole[b]:
+                continue
+            if pole[a] or pole[b]:
+                if pts[a, 1] == pts[b, 1]:
+                    cap = ib if pole[a] else ia[::-1]
+                    blocks.append(cap[None, :])
+                elif pole[a]:
+                    blocks.append(np.column_stack([ia, ib, ib[nxt]]))
+                else:
+                    blocks.append(np.column_stack([ia, ib, ia[nxt]]))
+            else:
+                blocks.append(np.column_stack([ia, ib, ib[nxt], ia[nxt]]))
+    return np.vstack(verts), polys(*blocks)
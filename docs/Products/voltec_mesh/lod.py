@@ -0,0 +1,220 @@
+# ============================================================================
+# lod.py — LOD1–LOD3 chain for every component, recorded in its sidecar
+# Each finished GLB is decimated with meshoptimizer's error-bounded
+# simplifier. A level stops at whichever comes first: its triangle TARGET
+# fraction of the full mesh, or its error bound, a fraction of the mesh's
+# bounding-box diagonal. The simplifier works on the position-welded mesh;
+# each kept corner then takes the normal and UV of the split vertex whose
+# normal best matches its new face, so hard edges stay hard. A level that
+# saves less than MIN_REDUCTION of the previous level's triangles is
+# dropped, along with the ones after it.
+#
+# The recorded error is measured, not the simplifier's estimate: the
+# two-sided Hausdorff distance (geomdiff.compare) between the GLB and the
+# written level, quantization included. A level whose screen_size is not
+# strictly below the previous level's would never be shown and is dropped;
+# the next kept level takes its number.
+#
+# The variants are written next to the GLB as <Name>_LOD<n>.glb, quantized
+# and meshopt compressed (meshopt.py), and listed in [asset].lods of the
+# component's .glb.toml:
+#   lods = [
+#     { level = 1, mesh = "meshes/VCell_Housing_LOD1.glb",
+#       screen_size = 0.21, error = 0.0004, triangles = 812 },
+#   ]
+# The engine switches to a level once the component's projected height
+# drops below screen_size (a fraction of the viewport height); at that size
+# the level's measured error covers at most PIXEL_ERROR pixels on a
+# SCREEN_HEIGHT_PX viewport. `error` is in mesh units (metres).
+#
+# Usage (from docs/Products; needs meshoptimizer and SciPy, and DracoPy to
+# read Draco GLBs):
+#   python -m voltec_mesh.lod                     # every sidecar
+#   python -m voltec_mesh.lod V-Incinerator       # one product
+#   python -m voltec_mesh.catalogue --lods        # after a build
+# ============================================================================
+import argparse
+import glob
+import os
+import sys
+
+import numpy as np
+
+from . import geomdiff, sidecar
+from .glb import Glb
+from .meshopt import _meshoptimizer, encode
+
+#          level, triangle fraction, error / diagonal
+LEVELS = ((1, 0.50, 0.002),
+          (2, 0.25, 0.006),
+          (3, 0.10, 0.020))
+MIN_REDUCTION    = 0.10
+PIXEL_ERROR      = 1.0
+SCREEN_HEIGHT_PX = 1080
+
+
+def lod_path(glb, level):
+    stem, ext = os.path.splitext(glb)
+    return f"{stem}_LOD{level}{ext}"
+
+
+def _weld(pos):
+    """Welded vertex id of every vertex (vertices split for normals or UVs
+    share a position) and the original vertices of each id as a padded
+    (ids, k) array, -1 where a group is shorter."""
+    _, first, weld = np.unique(pos, axis=0, return_index=True,
+                               return_inverse=True)
+    weld = weld.ravel()
+    order = np.argsort(weld, kind="stable")
+    sizes = np.bincount(weld, minlength=len(first))
+    slot = np.arange(len(weld)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    members = np.full((len(first), sizes.max(initial=1)), -1, dtype=np.int64)
+    members[weld[order], slot] = order
+    return weld, first, members
+
+
+def _corner_sources(arrays, members, tris, pos):
+    """Original vertex for each corner of the simplified welded `tris`:
+    the split vertex whose normal is closest to the new face normal, so
+    hard edges keep their crease and smooth surfaces their normals."""
+    cand = members[tris.ravel()]
+    if "NORMAL" not in arrays:
+        return cand[:, 0]
+    a, b, c = (pos[tris[:, i]] for i in range(3))
+    face = np.repeat(np.cross(b - a, c - a), 3, axis=0)
+    dots = np.einsum("ij,ikj->ik", face, arrays["NORMAL"][cand])
+    dots[cand < 0] = -np.inf
+    return cand[np.arange(len(cand)), dots.argmax(axis=1)]
+
+
+def simplify(arrays, target, error):
+    """(arrays, absolute error) of one primitive with its triangles reduced
+    towards `target` of the original count while staying within `error`
+    (in mesh units). The simplifier sees the position-welded mesh, since
+    it would otherwise lock every seam vertex in place; the kept corners
+    then take their attributes from the matching split vertex."""
+    mo = _meshoptimizer()
+    weld, first, members = _weld(arrays["POSITION"])
+    pos = np.ascontiguousarray(arrays["POSITION"][first], dtype=np.float32)
+    flat = np.ascontiguousarray(weld[arrays["indices"].ravel()],
+                                dtype=np.uint32)
+    scale = mo.simplify_scale(pos, len(pos)) or 1.0
+    dest = np.empty_like(flat)
+    result = np.zeros(1, dtype=np.float32)
+    count = mo.simplify(dest, flat, pos, len(flat), len(pos),
+                        target_index_count=max(3, int(len(flat) * target)
+                                               // 3 * 3),
+                        target_error=error / scale, result_error=result)
+    tris = dest[:count].astype(np.int64).reshape(-1, 3)
+    source = _corner_sources(arrays, members, tris, pos.astype(np.float64))
+    keep, corners = np.unique(source, return_inverse=True)
+    out = {name: values[keep] for name, values in arrays.items()
+           if name != "indices"}
+    out["indices"] = corners.reshape(-1, 3)
+    return out, float(result[0]) * scale
+
+
+def screen_size(error, diameter):
+    """Viewport-height fraction below which `error` is under PIXEL_ERROR."""
+    if error <= 0:
+        return 1.0
+    return min(1.0, PIXEL_ERROR * diameter / (error * SCREEN_HEIGHT_PX))
+
+
+def chain(glb):
+    """Write the LOD variants of `glb`; returns its triangle count and one
+    dict per level kept (level, path, screen_size, error, triangles)."""
+    doc = Glb.read(glb)
+    prims = {(m, p): a for m, p, a in doc.primitives()}
+    pos = np.vstack([a["POSITION"] for a in prims.values()]) \
+        .astype(np.float64)
+    diameter = float(np.linalg.norm(np.ptp(pos, axis=0)))
+    full = previous = sum(len(a["indices"]) for a in prims.values())
+    base = doc.world_triangles()
+    levels = []
+    for _, target, rel in LEVELS:
+        simplified = {key: simplify(arrays, target, rel * diameter)[0]
+                      for key, arrays in prims.items()}
+        triangles = sum(len(a["indices"]) for a in simplified.values())
+        if triangles > previous * (1 - MIN_REDUCTION):
+            break
+        path = lod_path(glb, len(levels) + 1)
+        encode(doc, primitives=simplified).write(path)
+        error = geomdiff.compare(base, path)["hausdorff"]
+        size = round(screen_size(error, diameter), 4)
+        if levels and size >= levels[-1]["screen_size"]:
+            continue
+        levels.append({"level": len(levels) + 1, "path": path,
+                       "screen_size": size,
+                       "error": float(f"{error:.3g}"),
+                       "triangles": triangles})
+        previous = triangles
+    kept = {lv["path"] for lv in levels}
+    for stale in glob.glob(lod_path(glb, "[0-9]")):
+        if stale not in kept:
+            os.remove(stale)
+    return full, levels
+
+
+def record(path, data, levels):
+    """Write `levels` to [asset].lods of the sidecar at `path`."""
+    lods = [{"level": lv["level"],
+             "mesh": sidecar.sibling_mesh(data, os.path.basename(lv["path"])),
+             "screen_size": lv["screen_size"], "error": lv["error"],
+             "triangles": lv["triangles"]} for lv in levels]
+    return sidecar.update(path, "asset", "lods", lods or None)
+
+
+def run(sidecars, glbs=None):
+    """Build the chain for every sidecar (only those whose GLB is in `glbs`
+    if given); returns one summary row per sidecar."""
+    wanted = None if glbs is None else {os.path.abspath(g) for g in glbs}
+    rows = []
+    for path in sidecars:
+        data = sidecar.load(path)
+        glb = sidecar.mesh_file(path, data)
+        if glb is None or (wanted is not None
+                           and os.path.abspath(glb) not in wanted):
+            continue
+        full, levels = chain(glb)
+        rows.append({"name": sidecar.name(path), "triangles": full,
+                     "levels": levels,
+                     "updated": record(path, data, levels)})
+    return rows
+
+
+def table(rows):
+    lines = [f"{'component':<34} {'LOD0':>6} {'LOD1':>6} {'LOD2':>6} "
+             f"{'LOD3':>6}  screen sizes"]
+    for r in rows:
+        tris = {lv["level"]: lv["triangles"] for lv in r["levels"]}
+        sizes = " ".join(f"{lv['screen_size']:.3f}" for lv in r["levels"])
+        lines.append(f"{r['name']:<34} {r['triangles']:6d} "
+                     + " ".join(f"{tris[n]:6d}" if n in tris else f"{'-':>6}"
+                                for n in (1, 2, 3))
+                     + f"  {sizes}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.lod",
+        description="Write LOD1-LOD3 next to each GLB and list them in the "
+                    "sidecars.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("-k", "--match", nargs="+", default=(),
+                        help="only sidecars whose name contains one of these")
+    args = parser.parse_args(argv)
+
+    sidecars = [p for p in sidecar.discover(args.products)
+                if not args.match
+                or any(m in sidecar.name(p) for m in args.match)]
+    if not sidecars:
+        parser.error("no sidecars matched")
+    print(table(run(sidecars)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# ============================================================================
+# massprops.py — Mass properties of every component from its GLB
+# The sidecars carry [material].density and a hand-entered
+# [thermodynamic].volume, but nothing ties either to the exported mesh.
+# integrals() applies the divergence theorem to the world-space triangles
+# of a GLB: each triangle spans a signed tetrahedron with the origin, and
+# the volume, first and second moments are sums over those tetrahedra in
+# one vectorized pass. Times [material].density that gives
+#   - volume (m³) and mass (kg)
+#   - center_of_mass (m), in the GLB's own frame
+#   - inertia (kg·m²), the 3×3 tensor about the center of mass, and its
+#     principal_moments
+# in the frame the mesh was exported in; the engine applies [transform]
+# on top. A mesh wound inside out is flipped. An open mesh (once coincident
+# vertices are welded and the triangles collapsed by that weld dropped, an
+# edge not traversed as often in each direction) encloses no well-defined
+# volume: its figures are still computed but marked closed = false.
+#
+# --write stores them in a generated [physics] table of each sidecar.
+# A sidecar whose [thermodynamic].volume differs from the mesh volume by
+# more than VOLUME_TOL (relative) is flagged; components without a
+# density get volume and center only.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.massprops                   # report
+#   python -m voltec_mesh.massprops V-Pump --write    # ... and write [physics]
+# ============================================================================
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from . import sidecar
+from .glb import Glb
+
+VOLUME_TOL = 0.10
+DIGITS     = 6
+
+
+def integrals(verts, tris):
+    """(volume, first moment (3,), second moment (3, 3)) of the solid
+    bounded by the triangles: ∫dV, ∫x dV and ∫x xᵀ dV, signed by winding."""
+    a, b, c = (verts[tris[:, i]].astype(np.float64) for i in range(3))
+    det = np.einsum("ij,ij->i", a, np.cross(b, c))
+    s = a + b + c
+    first = det @ s / 24.0
+    outer = (np.einsum("n,ni,nj->ij", det, a, a)
+             + np.einsum("n,ni,nj->ij", det, b, b)
+             + np.einsum("n,ni,nj->ij", det, c, c)
+             + np.einsum("n,ni,nj->ij", det, s, s))
+    return det.sum() / 6.0, first, outer / 120.0
+
+
+def closed(verts, tris):
+    """Whether the surface has no boundary: with coincident vertices welded
+    and the triangles that welding collapses (quantized slivers from Draco)
+    dropped, every edge is traversed as often in one direction as in the
+    other. Shells meeting along an edge share it four times and still
+    enclose a well-defined volume."""
+    _, weld = np.unique(verts, axis=0, return_inverse=True)
+    t = weld.ravel()[tris].astype(np.int64)
+    t = t[(t[:, 0] != t[:, 1]) & (t[:, 1] != t[:, 2]) & (t[:, 0] != t[:, 2])]
+    edges = np.vstack([t[:, [0, 1]], t[:, [1, 2]], t[:, [2, 0]]])
+    lo, hi = edges.min(axis=1), edges.max(axis=1)
+    _, edge = np.unique(lo * len(verts) + hi, return_inverse=True)
+    turns = np.bincount(edge.ravel(),
+                        np.where(edges[:, 0] < edges[:, 1], 1, -1))
+    return bool(len(t)) and not turns.any()
+
+
+def properties(verts, tris, density=None):
+    """{volume, closed, center_of_mass[, mass, inertia, principal_moments]}
+    of a mesh; the mass terms need `density` (kg/m³)."""
+    vol, first, second = integrals(verts, tris)
+    if vol < 0:
+        vol, first, second = -vol, -first, -second
+    center = first / vol if vol > 0 else np.zeros(3)
+    row = {"volume": float(vol), "closed": closed(verts, tris),
+           "center_of_mass": center.tolist()}
+    if density is not None and vol > 0:
+        mass = density * vol
+        cov = density * second - mass * np.outer(center, center)
+        inertia = np.trace(cov) * np.eye(3) - cov
+        row.update(mass=float(mass), inertia=inertia.tolist(),
+                   principal_moments=np.linalg.eigvalsh(inertia).tolist())
+    return row
+
+
+def component(path, data=None):
+    """properties() of the GLB of the sidecar at `path` with its density,
+    plus "stated" ([thermodynamic].volume) and "mismatch" (relative
+    difference beyond VOLUME_TOL, or None); None without a GLB."""
+    data = sidecar.load(path) if data is None else data
+    glb = sidecar.mesh_file(path, data)
+    if glb is None:
+        return None
+    verts, tris = Glb.read(glb).world_triangles()
+    if not len(tris):
+        return None
+    row = properties(verts, tris, data.get("material", {}).get("density"))
+    stated = data.get("thermodynamic", {}).get("volume")
+    row["stated"] = stated
+    row["mismatch"] = None
+    if stated and row["volume"] > 0:
+        diff = (stated - row["volume"]) / row["volume"]
+        if abs(diff) > VOLUME_TOL:
+            row["mismatch"] = diff
+    return row
+
+
+def _round(value):
+    if isinstance(value, list):
+        return [_round(v) for v in value]
+    if isinstance(value, float):
+        return float(f"{value:.{DIGITS}g}") + 0.0
+    return value
+
+
+def write(path, row):
+    """Store a component() row in the [physics] table of the sidecar;
+    returns whether the file changed."""
+    changed = False
+    for key in ("volume", "mass", "center_of_mass", "inertia",
+                "principal_moments", "closed"):
+        changed |= sidecar.update(path, "physics", key,
+                                  _round(row[key]) if key in row else None)
+    return changed
+
+
+def table(rows):
+    lines = [f"{'component':<34} {'volume m³':>11} {'mass kg':>11} "
+             f"{'center m':>28}  {'principal kg·m²':>32}  notes"]
+    for name, row in rows:
+        center = " ".join(f"{c:8.4f}" for c in row["center_of_mass"])
+        mass = f"{row['mass']:11.5g}" if "mass" in row else f"{'-':>11}"
+        moments = " ".join(f"{m:10.4g}" for m in row["principal_moments"]) \
+            if "principal_moments" in row else "-"
+        notes = []
+        if not row["closed"]:
+            notes.append("open mesh")
+        if "mass" not in row:
+            notes.append("no density")
+        if row["mismatch"] is not None:
+            notes.append(f"stated volume {row['stated']:.4g} m³ "
+                         f"({row['mismatch'] * 100:+.0f}%)")
+        lines.append(f"{name:<34} {row['volume']:11.5g} {mass} {center:>28}  "
+                     f"{moments:>32}  {', '.join(notes)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.massprops",
+        description="Compute mass properties of the components from their "
+                    "GLBs and densities.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("--write", action="store_true",
+                        help="store the results in each sidecar's [physics]")
+    args = parser.parse_args(argv)
+
+    paths = sidecar.discover(args.products)
+    if not paths:
+        parser.error("no sidecars found")
+    t0 = time.perf_counter()
+    rows, missing = [], []
+    for path in paths:
+        row = component(path)
+        if row is None:
+            missing.append(sidecar.name(path))
+        else:
+            rows.append((path, row))
+    seconds = time.perf_counter() - t0
+    print(table([(sidecar.name(p), r) for p, r in rows]))
+    if missing:
+        print(f"no GLB: {', '.join(missing)}")
+    if args.write:
+        written = sum(write(p, r) for p, r in rows)
+        print(f"[physics] updated in {written} sidecars")
+    flagged = sum(r["mismatch"] is not None for _, r in rows)
+    print(f"{len(rows)} components in {seconds * 1000:.0f} ms; {flagged} "
+          f"stated volumes differ from the mesh by more than "
+          f"{VOLUME_TOL:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+# ============================================================================
+# materials.py — Shared PBR material library built from the sidecars
+# Each script sets up its own Principled BSDF, so one alloy gets as many
+# materials as there are parts made of it, under as many names, and a
+# colour corrected in a .glb.toml never reaches the GLB. library() builds
+# one entry per alloy and colour across every product's sidecars:
+#   - keyed by the ALLOYS entry whose pattern occurs first in
+#     [material].name, so "304 Stainless Steel (Carbon Bed Vessel)" and a
+#     script's "304SS" are both "304 Stainless Steel", and "Aluminum
+#     6061-T6 End Plates + 316L SS Tie Rods" is its leading alloy; a name
+#     no pattern matches is keyed by itself without parenthetical notes
+#   - base colour from [properties].color, metallic and roughness from
+#     ALLOYS (a name outside ALLOYS leaves them to the script)
+#   - named MAT_<key>_<colour hex> ("MAT_304_Stainless_Steel_A8ADAD")
+#   - alpha from [properties].color's fourth value, or
+#     1 - [properties].transparency; translucent entries carry it as
+#     _A<percent> (MAT_Aluminum_6061_T6_A70)
+# so the name alone fixes the material and does not depend on which other
+# parts exist, and parts of one alloy share it as long as their sidecars
+# agree on the colour (the CLI lists alloys that come in several colours). A sidecar without [material].name (a plain Part) is keyed
+# by its script's MATERIAL constant instead.
+#
+# build.library_material() looks a component up by the GLB it exports,
+# build.alloy_material() looks up one ALLOYS key for the further materials
+# of a multi-material part, and build.make_material() creates each material
+# once per build, so objects and components sharing an entry share one
+# material: the GLB references it by index and bundle.py keeps a single
+# copy per product.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.materials               # every product
+#   python -m voltec_mesh.materials V-Pump        # those products' parts
+# ============================================================================
+import argparse
+import ast
+import os
+import re
+import sys
+
+from . import cache, sidecar
+
+# key: (pattern in [material].name, metallic, roughness)
+ALLOYS = {
+    "Aluminum 6061-T6":         (r"6061", 0.95, 0.25),
+    "Aluminum 1100-H14":        (r"\b1100\b", 1.0, 0.12),
+    "304 Stainless Steel":      (r"\b304(?!\d)", 1.0, 0.30),
+    "316L Stainless Steel":     (r"\b316L\b", 1.0, 0.35),
+    "17-4 PH Stainless Steel":  (r"\b17-4\s*PH\b", 1.0, 0.20),
+    "Duplex 2205 Stainless Steel":
+        (r"S32205|\b2205\b|\bDuplex Steel\b", 1.0, 0.35),
+    "Super Duplex 2507 Stainless Steel": (r"S32750|\b2507\b", 1.0, 0.25),
+    "A694 F60 Steel":           (r"\bA694\b", 1.0, 0.35),
+    "A36 Carbon Steel":         (r"\bA36\b", 1.0, 0.55),
+    "AR400 Steel":              (r"\bAR400\b", 1.0, 0.60),
+    "Powder-Coated Steel":      (r"\bPowder\s*-?\s*Coat", 0.6, 0.50),
+    "Inconel 625":              (r"Inconel\s*625", 1.0, 0.40),
+    "Inconel 718":              (r"Inconel\s*718", 1.0, 0.38),
+    "Hastelloy C-276":          (r"Hastelloy|\bC-?276\b", 1.0, 0.35),
+    "Tungsten":                 (r"\bTungsten\b", 1.0, 0.40),
+    "Copper C110":              (r"\bC110\b", 1.0, 0.10),
+    "Copper-Nickel C71500":     (r"\bC71500\b|\bCuNi\b", 1.0, 0.30),
+    "Sodium":                   (r"\bSodium\b", 0.98, 0.15),
+    "Sulfur-VACNT":             (r"\bSulfur\b", 0.0, 0.90),
+    "Sc-NASICON":               (r"NASICON", 0.0, 0.55),
+    "Aluminum Nitride":         (r"Aluminum Nitride|\bAlN\b", 0.0, 0.45),
+    "Borosilicate Glass":       (r"\bBorosilicate\b", 0.2, 0.55),
+    "SiC/SiC Composite":        (r"\bSiC/SiC\b", 0.15, 0.10),
+    "Reaction-Bonded SiC":      (r"\bRBSiC\b", 0.2, 0.15),
+    "Polycarbonate":
+        (r"\bPolycarbonate\b|\bLED\s*Panel\b", 0.0, 0.25),
+}
+
+
+def alloy_key(label):
+    """ALLOYS key whose pattern occurs first in `label` (underscores read
+    as spaces), or None."""
+    text = label.replace("_", " ")
+    found = [(m.start(), key) for key, (pattern, *_rest) in ALLOYS.items()
+             for m in [re.search(pattern, text, re.IGNORECASE)] if m]
+    return min(found)[1] if found else None
+
+
+def material_key(label):
+    """Library key of a [material].name: its ALLOYS key, else the name with
+    parenthetical notes dropped and whitespace collapsed."""
+    return alloy_key(label) or " ".join(
+        re.sub(r"\([^)]*\)", " ", label).split())
+
+
+def material_name(key, color, alpha=1.0):
+    """Blender / glTF name of a library entry, e.g.
+    "MAT_316L_Stainless_Steel_A3A6AD": the key, the hex of `color` and the
+    percent of an `alpha` below 1."""
+    name = "MAT_" + re.sub(r"\W+", "_", key).strip("_")
+    name += "_" + "".join(f"{round(c * 255):02X}" for c in color[:3])
+    if alpha < 1.0 - 1e-6:
+        name += f"_A{round(alpha * 100)}"
+    return name
+
+
+def describe(label, values):
+    """Library entry (name, key, label, base_color, alpha, metallic,
+    roughness) of material `label` with the sidecar's pbr() `values`;
+    metallic and roughness are None outside ALLOYS."""
+    key = material_key(label)
+    color, alpha = values
+    _, metallic, roughness = ALLOYS.get(key, (None,) * 3)
+    return {"name": material_name(key, color, alpha), "key": key,
+            "label": label, "base_color": color, "alpha": alpha,
+            "metallic": metallic, "roughness": roughness}
+
+
+def pbr(data):
+    """(base colour RGBA, alpha) of a sidecar's [properties], or None."""
+    props = data.get("properties", {})
+    color = props.get("color")
+    if not color:
+        return None
+    rgb = [float(c) for c in color[:3]]
+    if len(color) > 3:
+        alpha = float(color[3])
+    else:
+        alpha = 1.0 - float(props.get("transparency", 0.0))
+    return tuple(rgb + [1.0]), alpha
+
+
+def script_materials(v1):
+    """{GLB file name: MATERIAL constant} of the scripts under `v1`/meshes/
+    scripts, for sidecars without a [material].name."""
+    out = {}
+    scripts = os.path.join(v1, "meshes", "scripts")
+    for name in sorted(os.listdir(scripts)) if os.path.isdir(scripts) else ():
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(scripts, name), encoding="utf-8") as f:
+            found = cache.constants(ast.parse(f.read()))
+        if isinstance(found.get("OUT_FILE"), str) \
+                and isinstance(found.get("MATERIAL"), str):
+            out[os.path.basename(found["OUT_FILE"])] = found["MATERIAL"]
+    return out
+
+
+def _label(data, hints):
+    """[material].name of a sidecar, else its script's MATERIAL."""
+    label = data.get("material", {}).get("name")
+    mesh = os.path.basename(data.get("asset", {}).get("mesh", ""))
+    return label or hints.get(mesh)
+
+
+def library(sidecars):
+    """{material name: entry} of the sidecars (any products); an entry is
+    describe()'s with the first label seen and the components using it.
+    Sidecars without a colour or any material name are left out."""
+    entries, hints = {}, {}
+    for path in sidecars:
+        v1 = os.path.dirname(os.path.abspath(path))
+        if v1 not in hints:
+            hints[v1] = script_materials(v1)
+        data = sidecar.load(path)
+        label, values = _label(data, hints[v1]), pbr(data)
+        if not label or values is None:
+            continue
+        entry = describe(label, values)
+        entry = entries.setdefault(entry["name"], dict(entry, components=[]))
+        entry["components"].append(sidecar.name(path))
+    return entries
+
+
+def component(glb, hint=None):
+    """Library entry of the component exported to `glb` (matched on the file
+    name of [asset].mesh), keyed by `hint` (the script's material name) if
+    the sidecar names none; an entry with name None for a sidecar that
+    gives a colour but no material name; None without a sidecar or
+    colour."""
+    product = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(glb))))
+    filename = os.path.basename(glb)
+    for path in sidecar.discover([product]):
+        data = sidecar.load(path)
+        if os.path.basename(data.get("asset", {}).get("mesh", "")) != filename:
+            continue
+        values = pbr(data)
+        if values is None:
+            return None
+        label = data.get("material", {}).get("name") or hint
+        if not label:
+            return {"name": None, "base_color": values[0], "alpha": values[1],
+                    "metallic": None, "roughness": None}
+        return describe(label, values)
+    return None
+
+
+def fingerprint(script):
+    """Colour and name of every library entry of the product `script` builds
+    for, as JSON-ready lists; part of the build cache key (catalogue.py)."""
+    v1 = os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(script))))
+    rows = []
+    for path in sidecar.discover([os.path.dirname(v1)]):
+        data = sidecar.load(path)
+        values = pbr(data)
+        rows.append([sidecar.name(path),
+                     data.get("material", {}).get("name"),
+                     None if values is None else list(values[0]) + [values[1]]])
+    return rows
+
+
+def table(entries):
+    lines = [f"{'material':<38} {'colour':<16} {'alpha':>5} {'metal':>5} "
+             f"{'rough':>5}  components"]
+    for e in entries.values():
+        color = " ".join(f"{c:.2f}" for c in e["base_color"][:3])
+        pbr_values = " ".join("    -" if v is None else f"{v:5.2f}"
+                              for v in (e["metallic"], e["roughness"]))
+        lines.append(f"{e['name']:<38} {color:<16} {e['alpha']:5.2f} "
+                     f"{pbr_values}  {', '.join(e['components'])}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.materials",
+        description="List the shared material library of the products.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    args = parser.parse_args(argv)
+
+    paths = sidecar.discover(args.products)
+    if not paths:
+        parser.error("no sidecars found")
+    entries = library(paths)
+    named = {c for e in entries.values() for c in e["components"]}
+    print(f"{len(entries)} materials for {len(paths)} components in "
+          f"{len(sidecar.by_product(paths))} products")
+    print(table(entries))
+    unnamed = [sidecar.name(p) for p in paths if sidecar.name(p) not in named]
+    if unnamed:
+        print(f"  no material name or colour: {', '.join(unnamed)}")
+    loose = [e["name"] for e in entries.values() if e["key"] not in ALLOYS]
+    if loose:
+        print(f"  not in ALLOYS (metallic and roughness from the script): "
+              f"{', '.join(loose)}")
+    colours = {}
+    for e in entries.values():
+        colours.setdefault(e["key"], []).append(e)
+    for key, split in colours.items():
+        if key in ALLOYS and len(split) > 1:
+            print(f"  {key} in {len(split)} colours: " + "; ".join(
+                f"{e['name']} ({', '.join(e['components'])})"
+                for e in split))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
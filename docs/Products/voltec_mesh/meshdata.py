@@ -0,0 +1,285 @@
+# ============================================================================
+# meshdata.py — NumPy views of Blender mesh data
+# Vertex, triangle, face and edge arrays read with foreach_get, plus the
+# geometric measures the build helpers check results with: signed volume,
+# area, non-manifold edges, convexity, and the volume a convex cutter
+# overlaps (convex_overlap_volume(), the reference FAST booleans are held
+# to). All measures take plain arrays, so they work the same on object data
+# and on evaluated or temporary meshes.
+# ============================================================================
+import numpy as np
+
+
+def vertices(mesh):
+    """(N, 3) float64 vertex coordinates in mesh space."""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3).astype(np.float64)
+
+
+def normals(mesh):
+    """(N, 3) float64 vertex normals in mesh space."""
+    nrm = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("normal", nrm)
+    return nrm.reshape(-1, 3).astype(np.float64)
+
+
+def triangles(mesh):
+    """(M, 3) vertex indices of the mesh's loop triangles."""
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", tris)
+    return tris.reshape(-1, 3)
+
+
+def triangle_polygons(mesh):
+    """(M, 3) loop-triangle vertex indices and the (M,) polygon each
+    triangle belongs to."""
+    tris = triangles(mesh)
+    poly = np.empty(len(mesh.loop_triangles), dtype=np.int32)
+    mesh.loop_triangles.foreach_get("polygon_index", poly)
+    return tris, poly
+
+
+def face_sizes(mesh):
+    """(F,) corner count of every polygon."""
+    total = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", total)
+    return total
+
+
+def edge_face_counts(mesh):
+    """(E,) number of faces using each edge."""
+    edge = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("edge_index", edge)
+    return np.bincount(edge, minlength=len(mesh.edges))
+
+
+def to_world(verts, matrix):
+    """Apply a 4×4 (mathutils or array) transform to (N, 3) points."""
+    mat = np.array(matrix)
+    return verts @ mat[:3, :3].T + mat[:3, 3]
+
+
+def world_tris(obj, mesh=None, inflate=0.0):
+    """World-space vertices and loop triangles of `obj` (or of `mesh` placed
+    like `obj`), the vertices pushed `inflate` outward along their normals."""
+    mesh = obj.data if mesh is None else mesh
+    verts = vertices(mesh)
+    if inflate:
+        verts += inflate * normals(mesh)
+    return to_world(verts, obj.matrix_basis), triangles(mesh)
+
+
+def volume(verts, tris):
+    """Signed volume enclosed by triangles (divergence theorem); positive
+    for a closed surface with outward normals."""
+    a, b, c = verts[tris[:, 0]], verts[tris[:, 1]], verts[tris[:, 2]]
+    return float(np.einsum("ij,ij->", a, np.cross(b, c))) / 6.0
+
+
+def triangle_areas(verts, tris):
+    """(M,) area of every triangle."""
+    a, b, c = verts[tris[:, 0]], verts[tris[:, 1]], verts[tris[:, 2]]
+    return 0.5 * np.linalg.norm(np.cross(b - a, c - a), axis=1)
+
+
+def non_manifold_edges(mesh):
+    """Edges not shared by exactly two faces."""
+    return int(np.count_nonzero(edge_face_counts(mesh) != 2))
+
+
+def is_convex(verts, tris, tol=1e-6):
+    """True if no vertex lies more than `tol` (relative to the bounds) in
+    front of any triangle's plane."""
+    a, b, c = verts[tris[:, 0]], verts[tris[:, 1]], verts[tris[:, 2]]
+    n = np.cross(b - a, c - a)
+    length = np.linalg.norm(n, axis=1)
+    keep = length > 0
+    n = n[keep] / length[keep, None]
+    height = verts @ n.T - np.einsum("ij,ij->i", a[keep], n)
+    return bool(height.max(initial=0.0)
+                <= tol * np.ptp(verts, axis=0).max(initial=0.0))
+
+
+# oblique ray for inside(), off every axis and common diagonal
+RAY = np.array([1.0, 0.5772156649, 0.3183098862]) / 1.1896524387
+
+
+def inside(points, verts, tris):
+    """(P,) whether each point lies inside a closed triangle surface: odd
+    crossings of a ray along RAY, tested in the plane across it."""
+    e1 = np.cross(RAY, [0.0, 0.0, 1.0])
+    e1 /= np.linalg.norm(e1)
+    e2 = np.cross(RAY, e1)
+    basis = np.column_stack([e1, e2, RAY])
+    tv, tp = verts @ basis, points @ basis
+    a, b, c = tv[tris[:, 0]], tv[tris[:, 1]], tv[tris[:, 2]]
+    lo = np.minimum(np.minimum(a, b), c)[:, :2]
+    hi = np.maximum(np.maximum(a, b), c)[:, :2]
+    span = ((lo <= tp[:, :2].max(axis=0)) & (hi >= tp[:, :2].min(axis=0))
+            ).all(axis=1)
+    a, b, c, lo, hi = a[span], b[span], c[span], lo[span], hi[span]
+    out = np.zeros(len(points), dtype=bool)
+    chunk = max(1, 4_000_000 // max(len(tris), 1))
+    for s in range(0, len(points), chunk):
+        p = tp[s:s + chunk]
+        pi, ti = np.nonzero(((p[:, None, :2] >= lo) & (p[:, None, :2] <= hi))
+                            .all(axis=2))
+        q, ta, tb, tc = p[pi], a[ti], b[ti], c[ti]
+        w = np.column_stack([
+            (tc[:, 0] - tb[:, 0]) * (q[:, 1] - tb[:, 1])
+            - (tc[:, 1] - tb[:, 1]) * (q[:, 0] - tb[:, 0]),
+            (ta[:, 0] - tc[:, 0]) * (q[:, 1] - tc[:, 1])
+            - (ta[:, 1] - tc[:, 1]) * (q[:, 0] - tc[:, 0]),
+            (tb[:, 0] - ta[:, 0]) * (q[:, 1] - ta[:, 1])
+            - (tb[:, 1] - ta[:, 1]) * (q[:, 0] - ta[:, 0])])
+        total = w.sum(axis=1)
+        hit = ((w >= 0).all(axis=1) | (w <= 0).all(axis=1)) & (total != 0)
+        depth = (w[:, 0] * ta[:, 2] + w[:, 1] * tb[:, 2]
+                 + w[:, 2] * tc[:, 2])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hit &= depth / total > q[:, 2]
+        out[s:s + chunk] = np.bincount(pi[hit], minlength=len(p)) % 2 == 1
+    return out
+
+
+def _planes(verts, tris, tol):
+    """Unit normals and offsets of the planes of a convex surface, and the
+    plane of every triangle."""
+    a, b, c = verts[tris[:, 0]], verts[tris[:, 1]], verts[tris[:, 2]]
+    n = np.cross(b - a, c - a)
+    n /= np.linalg.norm(n, axis=1, keepdims=True)
+    d = np.einsum("ij,ij->i", n, a)
+    # coplanar within rounding; a face split by it only adds a redundant
+    # plane whose cap terms cancel
+    key = np.column_stack([np.round(n * 1e6), np.round(d / tol)])
+    _, keep, plane = np.unique(key, axis=0, return_index=True,
+                               return_inverse=True)
+    return n[keep], d[keep], plane
+
+
+def _clip(polys, labels, counts, n, d, k):
+    """Sutherland–Hodgman clip of padded polygons (N, M, 3) to n·x <= d.
+    `labels` tags the edge leaving each vertex (-1 for the original
+    triangle, else the plane that cut it); new cut edges get `k`."""
+    N, M = counts.shape[0], polys.shape[1]
+    j = np.arange(M)
+    valid = j[None] < counts[:, None]
+    nxt = np.where(j[None] + 1 < counts[:, None], j[None] + 1, 0)
+    q = np.take_along_axis(polys, nxt[..., None], axis=1)
+    s0 = polys @ n - d
+    s1 = q @ n - d
+    inside0, inside1 = s0 <= 0, s1 <= 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(inside0 != inside1, s0 / (s0 - s1), 0.0)
+    x = polys + t[..., None] * (q - polys)
+    # per edge: the start vertex if inside, then the crossing if any
+    cand = np.stack([polys, x], axis=2).reshape(N, 2 * M, 3)
+    lab = np.stack([labels, np.where(inside0, k, labels)],
+                   axis=2).reshape(N, 2 * M)
+    use = np.stack([valid & inside0, valid & (inside0 != inside1)],
+                   axis=2).reshape(N, 2 * M)
+    order = np.argsort(~use, axis=1, kind="stable")
+    counts = use.sum(axis=1)
+    width = max(int(counts.max(initial=0)), 1)
+    order = order[:, :width]
+    return (np.take_along_axis(cand, order[..., None], axis=1),
+            np.take_along_axis(lab, order, axis=1), counts)
+
+
+def _segment_hits(p, q, verts, tris):
+    """(segment, t) of every crossing of the segments p→q (E, 3) with the
+    triangles, 0 < t < 1."""
+    a, b, c = verts[tris[:, 0]], verts[tris[:, 1]], verts[tris[:, 2]]
+    e1, e2, dvec = b - a, c - a, q - p
+    h = np.cross(dvec[:, None], e2[None])                  # (E, T, 3)
+    det = np.einsum("tj,etj->et", e1, h)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 1.0 / det
+        s = p[:, None] - a[None]
+        u = np.einsum("etj,etj->et", s, h) * inv
+        qv = np.cross(s, e1[None])
+        v = np.einsum("etj,ej->et", qv, dvec) * inv
+        t = np.einsum("tj,etj->et", e2, qv) * inv
+    hit = ((np.abs(det) > 0) & (u >= 0) & (v >= 0) & (u + v <= 1)
+           & (t > 0) & (t < 1))
+    seg, _ = np.nonzero(hit)
+    return seg, t[hit]
+
+
+def convex_overlap_volume(va, ta, vb, tb):
+    """Volume of A ∩ B for a closed surface A and a convex closed surface
+    B, both with outward normals, computed from the surfaces alone: A's
+    triangles clipped to B's planes, plus the caps B cuts from A, whose
+    boundaries are the cut edges and the parts of B's edges inside A."""
+    center = vb.mean(axis=0)
+    va, vb = va - center, vb - center
+    tb = tb[triangle_areas(vb, tb) > 0]
+    full = ta
+    extent = max(float(np.ptp(vb, axis=0).max(initial=0.0)), 1e-30)
+    normal, offset, plane = _planes(vb, tb, 1e-9 * extent)
+    # drop A triangles outside any plane; clip the rest
+    corners = va[ta]                                        # (T, 3, 3)
+    side = corners @ normal.T - offset                      # (T, 3, K)
+    ta = ta[~(side > 0).all(axis=1).any(axis=1)]
+    polys = va[ta]
+    labels = np.full((len(ta), 3), -1)
+    counts = np.full(len(ta), 3)
+    for k in range(len(normal)):
+        cut = (polys @ normal[k] - offset[k] > 0).any(axis=1)
+        if not cut.any():
+            continue
+        clipped = _clip(polys[cut], labels[cut], counts[cut],
+                        normal[k], offset[k], k)
+        width = max(polys.shape[1], clipped[0].shape[1])
+        grow = lambda x, fill: np.concatenate(
+            [x, np.full(x.shape[:1] + (width - x.shape[1],) + x.shape[2:],
+                        fill)], axis=1)
+        polys, labels = grow(polys, 0.0), grow(labels, -1)
+        polys[cut], labels[cut] = (grow(clipped[0], 0.0),
+                                   grow(clipped[1], -1))
+        counts[cut] = clipped[2]
+    M = polys.shape[1]
+    j = np.arange(M)
+    valid = j[None] < counts[:, None]
+    nxt = np.where(j[None] + 1 < counts[:, None], j[None] + 1, 0)
+    q = np.take_along_axis(polys, nxt[..., None], axis=1)
+    fan = (np.einsum("ni,nmi->nm", polys[:, 0], np.cross(polys, q))
+           * valid).sum()
+    # caps: cut edges reversed, about a point on their plane
+    on = (labels >= 0) & valid
+    origin = normal * offset[:, None]
+    k = labels[on]
+    caps = np.einsum("ni,ni->n", origin[k],
+                     np.cross(q[on], polys[on])).sum()
+    # ... closed by B's feature edges (between two planes) inside A
+    ea = np.concatenate([tb[:, [0, 1]], tb[:, [1, 2]], tb[:, [2, 0]]])
+    ep = np.tile(plane, 3)
+    key = {(int(u), int(w)): f for (u, w), f in zip(ea, ep)}
+    near = full[(va[full].max(axis=1) >= vb.min(axis=0) - 1e-9 * extent).all(1)
+              & (va[full].min(axis=1) <= vb.max(axis=0) + 1e-9 * extent).all(1)]
+    edges = [(u, w, f, key[(w, u)]) for (u, w), f in key.items()
+             if u < w and key.get((w, u), f) != f]
+    segs, faces = [], []
+    if edges:
+        u, w, f, g = (np.array(x) for x in zip(*edges))
+        seg, t = _segment_hits(vb[u], vb[w], va, near)
+        order = np.lexsort((t, seg))
+        seg, t = seg[order], t[order]
+        for e in range(len(u)):
+            cut = np.concatenate([[0.0], t[seg == e], [1.0]])
+            p, d = vb[u[e]], vb[w[e]] - vb[u[e]]
+            for t0, t1 in zip(cut[:-1], cut[1:]):
+                if t1 > t0:
+                    segs.append((p + t0 * d, p + t1 * d))
+                    faces.append((f[e], g[e]))
+    if segs:
+        segs = np.array(segs)
+        mid = segs.mean(axis=1)
+        keep = inside(mid, va, full)
+        segs, faces = segs[keep], np.array(faces, dtype=int)[keep]
+        cross = np.cross(segs[:, 0], segs[:, 1])
+        caps += (np.einsum("ni,ni->n", origin[faces[:, 0]], cross)
+                 - np.einsum("ni,ni->n", origin[faces[:, 1]], cross)).sum()
+    return float(fan + caps) / 6.0
@@ -0,0 +1,277 @@
+# ============================================================================
+# meshopt.py — KHR_mesh_quantization + EXT_meshopt_compression post-export
+# Rewrites a GLB written by build.export() (Draco or plain) with quantized
+# vertex attributes and meshopt-compressed buffer views, which decode far
+# faster on the client than Draco:
+#   - triangles reordered for the vertex cache, vertices for fetch order
+#   - POSITION as unsigned shorts on a POSITION_BITS grid over the mesh
+#     bounds; the grid's offset and uniform scale move into the node
+#     transform (a child node if the mesh node has children)
+#   - NORMAL as normalized bytes, TEXCOORD_0 as normalized unsigned shorts
+#     when the UVs lie in [0, 1] (floats otherwise)
+#   - every attribute and the indices in their own buffer view, encoded with
+#     the meshopt vertex/index codecs into the BIN chunk; the uncompressed
+#     views point at a data-less fallback buffer as the extension requires
+#
+# choose() encodes both ways and keeps whichever has the lower delivery
+# cost (draco_bench.cost: bytes over BANDWIDTH plus decode time), counting
+# the gzip-compressed size the web server actually sends. The
+# catalogue driver runs it per asset with --codec auto; the uncompressed
+# source comes from build.export() writing <RAW_ENV dir>/<name>.glb.
+# Runs under plain Python and needs the meshoptimizer package.
+# ============================================================================
+import copy
+import gzip
+import time
+
+import numpy as np
+
+from . import instancing
+from .draco_bench import DECODE_REPEATS, cost, decode_seconds as draco_seconds
+from .glb import DRACO, INSTANCING, MESHOPT, Glb, node_matrix, trs_matrices
+
+RAW_ENV       = "VOLTEC_MESH_RAW"
+QUANTIZATION  = "KHR_mesh_quantization"
+POSITION_BITS = 14
+
+_ARRAY_BUFFER, _ELEMENT_ARRAY_BUFFER = 34962, 34963
+
+
+def _meshoptimizer():
+    try:
+        import meshoptimizer
+    except ImportError as exc:
+        raise ImportError("the meshopt export path needs meshoptimizer "
+                          "(pip install meshoptimizer)") from exc
+    return meshoptimizer
+
+
+class _Writer:
+    """Compressed BIN chunk plus the matching fallback buffer layout."""
+
+    def __init__(self):
+        self.bin = bytearray()
+        self.fallback = 0
+        self.views = []
+        self.accessors = []
+
+    def _view(self, data, raw_length, stride, count, mode, target):
+        self.bin += b"\0" * (-len(self.bin) % 4)
+        self.fallback += -self.fallback % 4
+        ext = {"buffer": 0, "byteOffset": len(self.bin),
+               "byteLength": len(data), "byteStride": stride,
+               "count": count, "mode": mode}
+        view = {"buffer": 1, "byteOffset": self.fallback,
+                "byteLength": raw_length, "extensions": {MESHOPT: ext}}
+        if target:
+            view["target"] = target
+        if mode == "ATTRIBUTES":
+            view["byteStride"] = stride
+        self.bin += data
+        self.fallback += raw_length
+        self.views.append(view)
+        return len(self.views) - 1
+
+    def attribute(self, values, component, gltf_type, normalized=False,
+                  bounds=False, target=_ARRAY_BUFFER):
+        """Accessor for (N, k) `values`, rows padded to 4-byte strides."""
+        mo = _meshoptimizer()
+        count, k = values.shape
+        stride = -(-values.itemsize * k // 4) * 4
+        rows = np.zeros((count, stride), dtype=np.uint8)
+        rows[:, :values.itemsize * k] = np.ascontiguousarray(values) \
+            .view(np.uint8).reshape(count, -1)
+        data = mo.encode_vertex_buffer(rows, count, stride)
+        acc = {"bufferView": self._view(data, count * stride, stride, count,
+                                        "ATTRIBUTES", target),
+               "componentType": component, "count": count, "type": gltf_type}
+        if normalized:
+            acc["normalized"] = True
+        if bounds:
+            acc["min"] = values.min(0).tolist()
+            acc["max"] = values.max(0).tolist()
+        self.accessors.append(acc)
+        return len(self.accessors) - 1
+
+    def indices(self, tris, vertex_count):
+        mo = _meshoptimizer()
+        flat = np.ascontiguousarray(tris.ravel(), dtype=np.uint32)
+        size = 2 if vertex_count <= 0xFFFF else 4
+        data = mo.encode_index_buffer(flat, len(flat), vertex_count)
+        self.accessors.append({
+            "bufferView": self._view(data, len(flat) * size, size, len(flat),
+                                     "TRIANGLES", _ELEMENT_ARRAY_BUFFER),
+            "componentType": 5123 if size == 2 else 5125,
+            "count": len(flat), "type": "SCALAR"})
+        return len(self.accessors) - 1
+
+
+def _optimize(arrays):
+    """Reorder triangles for the vertex cache and vertices for fetch."""
+    mo = _meshoptimizer()
+    n = len(arrays["POSITION"])
+    flat = np.ascontiguousarray(arrays["indices"].ravel(), dtype=np.uint32)
+    cache = np.empty_like(flat)
+    mo.optimize_vertex_cache(cache, flat, len(flat), n)
+    remap = np.empty(n, dtype=np.uint32)
+    used = mo.optimize_vertex_fetch_remap(remap, cache, len(flat), n)
+    out = {"indices": remap[cache].reshape(-1, 3)}
+    order = np.empty(used, dtype=np.int64)
+    keep = remap != 0xFFFFFFFF
+    order[remap[keep]] = np.nonzero(keep)[0]
+    for name, values in arrays.items():
+        if name != "indices":
+            out[name] = values[order]
+    return out
+
+
+def _dequantize_nodes(gltf, mesh, offset, scale, instances):
+    """Apply the position grid's offset and scale to every node of `mesh`.
+    For an instanced node they go into each instance transform instead
+    (`instances`: node index → TRANSLATION/ROTATION/SCALE arrays)."""
+    for n, node in enumerate(list(gltf.get("nodes", []))):
+        if node.get("mesh") != mesh:
+            continue
+        if n in instances:
+            inst = instances[n]
+            count = len(next(iter(inst.values())))
+            trs = [inst.get(k, np.tile(d, (count, 1))) for k, d in (
+                ("TRANSLATION", (0.0, 0.0, 0.0)),
+                ("ROTATION", (0.0, 0.0, 0.0, 1.0)),
+                ("SCALE", (1.0, 1.0, 1.0)))]
+            inst["TRANSLATION"] = trs[0] + trs_matrices(*trs)[:, :3, :3] \
+                @ offset
+            inst["SCALE"] = trs[2] * scale
+            continue
+        if node.get("children"):
+            child = {"name": node.get("name", ""), "mesh": mesh}
+            del node["mesh"]
+            gltf["nodes"].append(child)
+            node["children"].append(len(gltf["nodes"]) - 1)
+            node = child
+        if "matrix" in node:
+            dq = np.eye(4)
+            dq[:3, :3] *= scale
+            dq[:3, 3] = offset
+            node["matrix"] = (node_matrix(node) @ dq).T.ravel().tolist()
+            continue
+        local = node_matrix(node)
+        s = np.asarray(node.get("scale", (1, 1, 1)), dtype=np.float64)
+        node["translation"] = (local[:3, 3] + local[:3, :3] @ offset).tolist()
+        node["scale"] = (s * scale).tolist()
+
+
+def encode(doc, position_bits=POSITION_BITS, primitives=None):
+    """New Glb with every primitive of `doc` quantized and meshopt
+    compressed; materials, nodes and the rest of the document are kept.
+    `primitives` maps (mesh, primitive) to replacement arrays in the form
+    Glb.primitive() returns, e.g. a simplified LOD."""
+    gltf = copy.deepcopy(doc.gltf)
+    out = _Writer()
+    levels = (1 << position_bits) - 1
+    primitives = primitives or {}
+    instances = {}
+    for n, node in enumerate(gltf.get("nodes", [])):
+        ext = node.get("extensions", {}).get(INSTANCING)
+        if ext:
+            instances[n] = {k: doc.accessor(i).astype(np.float64)
+                            for k, i in ext["attributes"].items()}
+    for m, mesh in enumerate(gltf.get("meshes", [])):
+        prims = [_optimize(primitives.get((m, p)) or doc.primitive(m, p))
+                 for p in range(len(mesh["primitives"]))]
+        pos = np.vstack([a["POSITION"] for a in prims]).astype(np.float64)
+        lo = pos.min(0)
+        scale = max(float(np.ptp(pos, axis=0).max()), 1e-12) / levels
+        for prim, arrays in zip(mesh["primitives"], prims):
+            q = np.rint((arrays["POSITION"] - lo) / scale).astype(np.uint16)
+            attrs = {"POSITION": out.attribute(q, 5123, "VEC3", bounds=True)}
+            if "NORMAL" in arrays:
+                nrm = np.clip(np.rint(arrays["NORMAL"] * 127), -127, 127)
+                attrs["NORMAL"] = out.attribute(nrm.astype(np.int8), 5120,
+                                                "VEC3", normalized=True)
+            if "TEXCOORD_0" in arrays:
+                uv = arrays["TEXCOORD_0"]
+                if uv.min(initial=0.0) >= 0.0 and uv.max(initial=0.0) <= 1.0:
+                    attrs["TEXCOORD_0"] = out.attribute(
+                        np.rint(uv * 65535).astype(np.uint16), 5123, "VEC2",
+                        normalized=True)
+                else:
+                    attrs["TEXCOORD_0"] = out.attribute(
+                        uv.astype(np.float32), 5126, "VEC2")
+            prim["attributes"] = attrs
+            prim["indices"] = out.indices(arrays["indices"],
+                                          len(arrays["POSITION"]))
+            prim.pop("extensions", None)
+        _dequantize_nodes(gltf, m, lo, scale, instances)
+    for n, inst in instances.items():
+        gltf["nodes"][n]["extensions"][INSTANCING]["attributes"] = {
+            k: out.attribute(v.astype(np.float32), 5126,
+                             "VEC4" if k == "ROTATION" else "VEC3",
+                             target=None)
+            for k, v in inst.items()}
+    gltf["accessors"] = out.accessors
+    gltf["bufferViews"] = out.views
+    gltf["buffers"] = [{"byteLength": len(out.bin)},
+                       {"byteLength": out.fallback,
+                        "extensions": {MESHOPT: {"fallback": True}}}]
+    used = [e for e in gltf.get("extensionsUsed", []) if e != DRACO]
+    gltf["extensionsUsed"] = used + [QUANTIZATION, MESHOPT]
+    required = [e for e in gltf.get("extensionsRequired", []) if e != DRACO]
+    gltf["extensionsRequired"] = required + [QUANTIZATION, MESHOPT]
+    return Glb(gltf, bytes(out.bin))
+
+
+def decode_seconds(doc, repeats=DECODE_REPEATS):
+    """Best-of-`repeats` time to decompress every meshopt buffer view."""
+    views = [i for i, bv in enumerate(doc.gltf.get("bufferViews", []))
+             if MESHOPT in bv.get("extensions", {})]
+    best = float("inf")
+    for _ in range(repeats):
+        doc._decoded.clear()
+        t0 = time.perf_counter()
+        for i in views:
+            doc.view(i)
+        best = min(best, time.perf_counter() - t0)
+    return best if views else 0.0
+
+
+def wire_bytes(data):
+    """Size on the wire with gzip, as the site serves the GLBs."""
+    return len(gzip.compress(data, 9))
+
+
+def choose(source, draco_path, codec="auto", instance=False):
+    """Pick the codec for one asset and leave its GLB at `draco_path`.
+
+    `source` is the uncompressed export, `draco_path` the Draco GLB that
+    build.export() wrote. With codec "auto" the meshopt encoding replaces
+    it only if its cost is lower; "meshopt" always replaces it. With
+    `instance`, repeated parts are instanced first (instancing.py) and an
+    asset that has any always ships meshopt encoded. Returns the
+    measurements and the codec kept."""
+    with open(draco_path, "rb") as f:
+        draco = f.read()
+    doc, row = Glb.read(source), {}
+    if instance:
+        instanced, report = instancing.instance(doc)
+        if instanced is not None:
+            doc = instanced
+            row["instanced"] = report
+    data = encode(doc).to_bytes()
+    for name, blob, seconds in (
+            ("draco", draco, draco_seconds(Glb.from_bytes(draco))),
+            ("meshopt", data, decode_seconds(Glb.from_bytes(data)))):
+        row[f"{name}_bytes"] = len(blob)
+        row[f"{name}_wire_bytes"] = wire_bytes(blob)
+        row[f"{name}_decode_seconds"] = seconds
+    keep_meshopt = codec == "meshopt" or "instanced" in row or (
+        codec == "auto"
+        and cost({"bytes": row["meshopt_wire_bytes"],
+                  "decode_seconds": row["meshopt_decode_seconds"]})
+        < cost({"bytes": row["draco_wire_bytes"],
+                "decode_seconds": row["draco_decode_seconds"]}))
+    if keep_meshopt:
+        with open(draco_path, "wb") as f:
+            f.write(data)
+    row["codec"] = "meshopt" if keep_meshopt else "draco"
+    return row
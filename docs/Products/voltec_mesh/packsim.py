@@ -0,0 +1,325 @@
+# ============================================================================
+# packsim.py — Charge/discharge simulation of a V-Cell pack
+# Sizing a pack (how many cells in series and in parallel, what C-rate)
+# should not need the engine. cell() reads one V-Cell from its sidecars:
+#   - open-circuit voltage: cathode minus anode [electrochemical]
+#     .open_circuit_voltage (the electrodes by [material.custom].role)
+#   - capacity: the smaller electrode capacity_ah
+#   - resistance: the internal_resistance of every layer in the current
+#     path (electrodes, electrolyte, terminals, housing) in series
+#   - coulombic efficiency: the product over those layers
+# and Pack holds every cell of a series × parallel pack as (S, P) arrays:
+# capacity and resistance drawn around the sidecar values with
+# CAPACITY_SPREAD / RESISTANCE_SPREAD (relative σ) and the starting SOC
+# with SOC_SPREAD, so weak cells show up as they would in a real pack.
+#
+# OCV follows the two-plateau Na-S curve (OCV_CURVE, fractions of the
+# sidecar OCV over SOC). The P cells of a group share one terminal
+# voltage, so each step solves it exactly: with conductances g = 1/R,
+#   V = (Σ g·OCV - I) / Σ g,   i_k = g_k (OCV_k - V)
+# and the current splits by resistance and SOC, as in a real group. SOC is
+# Coulomb-counted per cell, charge scaled by the coulombic efficiency.
+#
+# cycle() starts the pack with its mean SOC at the top of SOC_WINDOW (or
+# the sidecar SOC if lower), discharges at constant current until the
+# emptiest cell reaches the bottom of the window or a group falls to
+# VOLTAGE_LIMITS[0], then charges at the same current until the pack holds
+# the charge it started with, the last step shortened to land on it. A
+# group that reaches VOLTAGE_LIMITS[1] is held there (constant voltage);
+# charge also ends if that current tapers to TAPER or a cell is full.
+# Discharged over charged energy is the round-trip efficiency only when
+# the charge closed the cycle; otherwise none is reported.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.packsim                     # 96s104p at 1C
+#   python -m voltec_mesh.packsim 12s4p -C 0.5 --dt 5 --csv cycle.csv
+# ============================================================================
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from . import sidecar
+
+CELL_PRODUCT = os.path.join(sidecar.PRODUCTS_DIR, "V-Cell")
+TOPOLOGY     = "96s104p"
+SOC_WINDOW   = (0.10, 0.95)   # V-Cell operating range (EustressEngine spec)
+VOLTAGE_LIMITS = (0.70, 1.08)  # group cut-off / charge voltage, × cell OCV
+TAPER        = 0.05           # end of the CV phase, fraction of CC current
+CAPACITY_SPREAD   = 0.02
+RESISTANCE_SPREAD = 0.05
+SOC_SPREAD        = 0.005
+SEED = 0
+
+# (SOC, OCV / sidecar OCV): lower plateau Na2S4 -> Na2S, upper plateau
+# S8 -> Na2S4 at the sidecar OCV over the last quarter of the capacity
+OCV_CURVE = np.array([
+    (0.00, 0.76), (0.05, 0.80), (0.15, 0.83), (0.65, 0.85),
+    (0.75, 0.93), (0.80, 0.98), (0.95, 1.00), (1.00, 1.03)])
+
+_TOPOLOGY_RE = re.compile(r"^(\d+)s(\d+)p$", re.IGNORECASE)
+
+
+def cell(paths=None):
+    """{ocv, capacity_ah, resistance, efficiency, soc} of one cell from the
+    V-Cell sidecars with an [electrochemical] table; see the module header."""
+    paths = sidecar.discover([CELL_PRODUCT]) if paths is None else paths
+    layers = {}
+    for path in paths:
+        data = sidecar.load(path)
+        chem = data.get("electrochemical")
+        if chem:
+            role = data.get("material", {}).get("custom", {}).get("role")
+            layers[role or sidecar.name(path)] = chem
+    missing = [r for r in ("anode", "cathode") if r not in layers]
+    if missing:
+        raise ValueError(f"no [electrochemical] {' or '.join(missing)} "
+                         f"among the sidecars")
+    anode, cathode = layers["anode"], layers["cathode"]
+    efficiency = 1.0
+    for chem in layers.values():
+        efficiency *= chem.get("coulombic_efficiency", 1.0)
+    return {
+        "ocv": cathode["open_circuit_voltage"] - anode["open_circuit_voltage"],
+        "capacity_ah": min(anode["capacity_ah"], cathode["capacity_ah"]),
+        "resistance": sum(c.get("internal_resistance", 0.0)
+                          for c in layers.values()),
+        "efficiency": efficiency,
+        "soc": min(anode.get("state_of_charge", 1.0),
+                   cathode.get("state_of_charge", 1.0)),
+    }
+
+
+def ocv(soc, nominal):
+    """Open-circuit voltage at `soc` (any shape) for a cell whose sidecar
+    OCV is `nominal`."""
+    return nominal * np.interp(soc, OCV_CURVE[:, 0], OCV_CURVE[:, 1])
+
+
+def parse_topology(text):
+    """(series, parallel) from "96s104p"."""
+    match = _TOPOLOGY_RE.match(text.strip())
+    if match is None or min(map(int, match.groups())) < 1:
+        raise ValueError(f"not a topology such as 96s104p: {text!r}")
+    return int(match.group(1)), int(match.group(2))
+
+
+class Pack:
+    """Every cell of a `series` × `parallel` pack as (S, P) arrays; see the
+    module header. Current is positive on discharge."""
+
+    def __init__(self, params, series, parallel, seed=SEED,
+                 capacity_spread=CAPACITY_SPREAD,
+                 resistance_spread=RESISTANCE_SPREAD, soc_spread=SOC_SPREAD):
+        rng = np.random.default_rng(seed)
+        shape = (series, parallel)
+        self.params = params
+        self.capacity = params["capacity_ah"] * np.clip(
+            rng.normal(1.0, capacity_spread, shape), 0.5, 1.5)
+        self.resistance = params["resistance"] * np.clip(
+            rng.normal(1.0, resistance_spread, shape), 0.5, 1.5)
+        self.soc = np.clip(params["soc"] + rng.normal(0.0, soc_spread, shape),
+                           0.0, 1.0)
+        self.conductance = 1.0 / self.resistance
+        self.total_conductance = self.conductance.sum(axis=1)
+        self._ocv = None
+
+    @property
+    def cells(self):
+        return self.soc.size
+
+    @property
+    def nominal_current(self):
+        """Pack current at 1C (A)."""
+        return self.params["capacity_ah"] * self.soc.shape[1]
+
+    def stored(self):
+        """Charge held by all cells (Ah)."""
+        return float(np.einsum("ij,ij->", self.soc, self.capacity))
+
+    def set_soc(self, mean):
+        """Shift every cell's SOC so the pack mean is `mean`, keeping the
+        cell-to-cell spread."""
+        self.soc += mean - self.soc.mean()
+        np.clip(self.soc, 0.0, 1.0, out=self.soc)
+        self._ocv = None
+
+    def cell_ocv(self):
+        """(S, P) open-circuit voltages at the current SOC."""
+        if self._ocv is None:
+            self._ocv = ocv(self.soc, self.params["ocv"])
+        return self._ocv
+
+    def groups(self):
+        """(a, b) with group terminal voltages a - b·I at pack current I."""
+        a = (self.cell_ocv() * self.conductance).sum(axis=1) \
+            / self.total_conductance
+        return a, 1.0 / self.total_conductance
+
+    def currents(self, current):
+        """(group voltages, cell currents) at pack current `current`."""
+        a, b = self.groups()
+        volts = a - b * current
+        return volts, self.conductance * (self.cell_ocv() - volts[:, None])
+
+    def drain(self, amps):
+        """(S, P) charge (Ah per second) the cells lose at cell currents
+        `amps`; charging currents count at the coulombic efficiency."""
+        return np.where(amps < 0, amps * self.params["efficiency"],
+                        amps) / 3600.0
+
+    def advance(self, amps, dt):
+        """Coulomb-count `dt` seconds at cell currents `amps`."""
+        np.clip(self.soc - self.drain(amps) * dt / self.capacity, 0.0, 1.0,
+                out=self.soc)
+        self._ocv = None
+
+    def step(self, current, dt):
+        """Advance `dt` seconds at pack current `current`; returns (group
+        voltages, cell currents)."""
+        volts, amps = self.currents(current)
+        self.advance(amps, dt)
+        return volts, amps
+
+
+def _run(pack, current, dt, history, phase, target=None):
+    """Step at `current` until the SOC window or a voltage limit is reached;
+    on charge the upper voltage limit is then held until the current tapers
+    to TAPER, and the pack stops at `target` Ah stored. Returns the phase
+    totals."""
+    charging = current < 0
+    low, high = (lim * pack.params["ocv"] for lim in VOLTAGE_LIMITS)
+    totals = {"seconds": 0.0, "ah": 0.0, "wh": 0.0, "heat_wh": 0.0,
+              "cv_seconds": 0.0}
+    elapsed = history[-1][0] if history else 0.0
+    for _ in range(int(48 * 3600 / dt)):
+        if (pack.soc.max() >= 1.0) if charging \
+                else (pack.soc.min() <= SOC_WINDOW[0]):
+            break
+        a, b = pack.groups()
+        amps = current
+        if charging:
+            amps = max(current, float(((a - high) / b).max()))
+            if abs(amps) < abs(current) * TAPER:
+                break
+        elif (a - b * amps).min() <= low:
+            break
+        volts, cells = pack.currents(amps)
+        step = dt
+        if target is not None:
+            gain = -float(pack.drain(cells).sum())
+            step = min(dt, (target - pack.stored()) / gain)
+        pack.advance(cells, step)
+        pack_v = float(volts.sum())
+        elapsed += step
+        totals["seconds"] += step
+        totals["cv_seconds"] += step if amps != current else 0.0
+        totals["ah"] += abs(amps) * step / 3600.0
+        totals["wh"] += abs(pack_v * amps) * step / 3600.0
+        totals["heat_wh"] += float(np.einsum("ij,ij,ij->", cells, cells,
+                                             pack.resistance)) * step / 3600.0
+        history.append((elapsed, phase, pack_v, amps, float(pack.soc.min()),
+                        float(pack.soc.max()), float(volts.min()),
+                        float(volts.max())))
+        if step < dt:
+            break
+    return totals
+
+
+def cycle(pack, c_rate=1.0, dt=1.0):
+    """Discharge then charge (CC-CV) `pack` through SOC_WINDOW; returns
+    (summary, history) with one history row (time, phase, pack V, pack A,
+    min/max cell SOC, min/max group V) per step."""
+    pack.set_soc(min(pack.params["soc"], SOC_WINDOW[1]))
+    start = pack.stored()
+    current = c_rate * pack.nominal_current
+    history = []
+    t0 = time.perf_counter()
+    discharge = _run(pack, current, dt, history, "discharge")
+    soc_spread = float(np.ptp(pack.soc))
+    charge = _run(pack, -current, dt, history, "charge", target=start)
+    closed = abs(pack.stored() - start) <= 1e-9 * start
+    summary = {
+        "cells": pack.cells, "series": pack.soc.shape[0],
+        "parallel": pack.soc.shape[1], "current": current,
+        "discharge": discharge, "charge": charge, "soc_spread": soc_spread,
+        "stored": (start, pack.stored()), "steps": len(history),
+        "round_trip": discharge["wh"] / charge["wh"]
+                      if closed and charge["wh"] else None,
+        "seconds": time.perf_counter() - t0,
+    }
+    return summary, history
+
+
+def write_csv(path, history):
+    with open(path, "w") as f:
+        f.write("time_s,phase,pack_v,pack_a,soc_min,soc_max,group_v_min,"
+                "group_v_max\n")
+        for row in history:
+            f.write(f"{row[0]:g},{row[1]}," +
+                    ",".join(f"{v:.6g}" for v in row[2:]) + "\n")
+
+
+def report(params, summary):
+    d, c = summary["discharge"], summary["charge"]
+    lines = [
+        f"cell: OCV {params['ocv']:.3f} V, {params['capacity_ah']:g} Ah, "
+        f"{params['resistance'] * 1000:.3f} mΩ, coulombic efficiency "
+        f"{params['efficiency']:.4f}",
+        f"pack: {summary['series']}s{summary['parallel']}p "
+        f"({summary['cells']} cells), {summary['current']:.0f} A",
+        f"  discharge  {d['seconds'] / 3600:6.2f} h  {d['ah']:9.1f} Ah  "
+        f"{d['wh'] / 1000:9.2f} kWh  heat {d['heat_wh'] / 1000:7.3f} kWh  "
+        f"SOC spread at cut-off {summary['soc_spread'] * 100:.2f}%",
+        f"  charge     {c['seconds'] / 3600:6.2f} h  {c['ah']:9.1f} Ah  "
+        f"{c['wh'] / 1000:9.2f} kWh  heat {c['heat_wh'] / 1000:7.3f} kWh  "
+        f"(CV {c['cv_seconds'] / 60:.0f} min)",
+    ]
+    if summary["round_trip"] is not None:
+        lines.append(f"  round-trip energy efficiency "
+                     f"{summary['round_trip'] * 100:.2f}%")
+    else:
+        start, end = summary["stored"]
+        lines.append(f"  charge stopped at {end:.1f} of {start:.1f} Ah "
+                     f"stored; cycle not closed, no round-trip efficiency")
+    lines.append(f"{summary['steps']} steps in {summary['seconds']:.2f} s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.packsim",
+        description="Simulate a discharge/charge cycle of a V-Cell pack.")
+    parser.add_argument("topology", nargs="?", default=TOPOLOGY,
+                        help="cells in series and parallel, e.g. "
+                             "%(default)s")
+    parser.add_argument("-C", "--c-rate", type=float, default=1.0,
+                        help="discharge and charge current in C")
+    parser.add_argument("--dt", type=float, default=1.0,
+                        help="time step in seconds")
+    parser.add_argument("--seed", type=int, default=SEED,
+                        help="seed of the cell-to-cell variation")
+    parser.add_argument("--csv", default=None,
+                        help="write the per-step history to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        series, parallel = parse_topology(args.topology)
+        params = cell()
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.c_rate <= 0 or args.dt <= 0:
+        parser.error("--c-rate and --dt must be positive")
+    pack = Pack(params, series, parallel, seed=args.seed)
+    summary, history = cycle(pack, args.c_rate, args.dt)
+    print(report(params, summary))
+    if args.csv:
+        write_csv(args.csv, history)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# ============================================================================
+# primitives.py — Operator-free primitive meshes
+# Cylinders, cones, boxes, hex prisms and tori built as NumPy arrays and
+# written straight into bpy.data.meshes with foreach_set, so no bpy.ops call,
+# context lookup, undo push or transform_apply is needed per primitive.
+#
+# Vertex placement and face winding follow Blender's own primitive operators
+# (first ring vertex on +Y, rings running clockwise seen from +Z) and the
+# size is baked into the mesh while location and rotation stay on the object,
+# exactly as the operators leave them. Baking location/rotation as well would
+# round world-space vertices to float32 and break the exact coplanar contacts
+# the EXACT boolean solver relies on, so `transform()` is only for meshes
+# built directly in place, such as merged cutter arrays.
+# ============================================================================
+from functools import lru_cache
+
+import numpy as np
+
+# Cube corner i sits at (±x, ±y, ±z) with bits (x, y, z) = (i>>2, i>>1, i) & 1
+_BOX_CORNERS = np.array([[(i >> 2) & 1, (i >> 1) & 1, i & 1]
+                         for i in range(8)], dtype=np.float64) - 0.5
+_BOX_FACES = np.array([[0, 1, 3, 2], [2, 3, 7, 6], [6, 7, 5, 4],
+                       [4, 5, 1, 0], [2, 6, 4, 0], [7, 3, 1, 5]])
+
+
+def polys(*blocks):
+    """Concatenate face blocks of (M, k) indices into flat corner indices and
+    per-face sizes, the layout `mesh_object()` takes."""
+    blocks = [np.asarray(b, dtype=np.int64).reshape(len(b), -1) for b in blocks]
+    corners = np.concatenate([b.ravel() for b in blocks])
+    sizes = np.concatenate([np.full(len(b), b.shape[1]) for b in blocks])
+    return corners, sizes
+
+
+@lru_cache(maxsize=None)
+def _unit_ring(segs):
+    """(segs, 2) float32 unit circle, taken once per segment count from
+    bmesh's own cone builder: Blender folds every angle into the first
+    octant and rounds through sinf/cosf, which NumPy does not reproduce to
+    the last bit."""
+    import bpy  # noqa: F401 (registers bmesh)
+    import bmesh
+
+    bm = bmesh.new()
+    bmesh.ops.create_cone(bm, segments=segs, radius1=1.0, radius2=1.0,
+                          depth=2.0)
+    co = np.array([v.co[:2] for v in bm.verts], dtype=np.float32)[::2]
+    bm.free()
+    return co
+
+
+def ring(r, z, segs):
+    """`segs` points of radius `r` at height `z`, first on +Y, clockwise."""
+    xy = np.float32(r) * _unit_ring(segs)
+    return np.column_stack([xy, np.full(segs, z, dtype=np.float32)])
+
+
+def cone_arrays(r1, r2, depth, segs):
+    """Frustum along Z centered on the origin: bottom radius `r1`, top radius
+    `r2`, n-gon caps. A zero radius collapses that end to a single apex."""
+    if segs < 3 or depth <= 0 or r1 < 0 or r2 < 0 or r1 == r2 == 0:
+        raise ValueError("cone needs segs >= 3, depth > 0 and one radius > 0")
+    k = np.arange(segs)
+    nxt = np.roll(k, -1)
+    if r1 > 0 and r2 > 0:
+        # Interleaved bottom/top pairs, the operator's vertex order
+        verts = np.stack([ring(r1, -depth / 2, segs),
+                          ring(r2, depth / 2, segs)], axis=1).reshape(-1, 3)
+        b, t = 2 * k, 2 * k + 1
+        sides = np.column_stack([b, t, t[nxt], b[nxt]])
+    elif r2 == 0:
+        verts = np.vstack([ring(r1, -depth / 2, segs), [[0, 0, depth / 2]]])
+        b, t = k, np.full(segs, segs)
+        sides = np.column_stack([b, t, b[nxt]])
+    else:
+        verts = np.vstack([[[0, 0, -depth / 2]], ring(r2, depth / 2, segs)])
+        b, t = np.zeros(segs, dtype=np.int64), k + 1
+        sides = np.column_stack([b, t, t[nxt]])
+    # Operator face order: the top cap (bottom cap if the top is an apex)
+    # goes before the last two sides, starting from ring vertex 1, and the
+    # bottom cap of a frustum comes last. The EXACT solver triangulates the
+    # n-gon caps from their first corner, so this order is kept as is.
+    top_cap = np.roll(t[::-1], 2)[None, :] if r2 > 0 else b[None, :]
+    blocks = [sides[:segs - 2], top_cap, sides[segs - 2:]]
+    if r1 > 0 and r2 > 0:
+        blocks.append(b[None, :])
+    return verts, polys(*blocks)
+
+
+def cylinder_arrays(r, depth, segs):
+    return cone_arrays(r, r, depth, segs)
+
+
+def box_arrays(sx, sy, sz):
+    """Box with full dimensions sx × sy × sz centered on the origin."""
+    return _BOX_CORNERS * (sx, sy, sz), polys(_BOX_FACES)
+
+
+def torus_arrays(major_r, minor_r, major_segs, minor_segs):
+    """Torus around Z; the tube cross-section starts on the outer equator.
+    Rounded through float32 the way the torus operator's mathutils math is."""
+    from mathutils import Matrix
+
+    major_r, minor_r = np.float32([major_r, minor_r]).tolist()
+    i, j = np.divmod(np.arange(major_segs * minor_segs), minor_segs)
+    phi = 2 * np.pi * np.arange(minor_segs) / minor_segs
+    rho = (major_r + np.cos(phi) * minor_r).astype(np.float32)
+    rot = np.array([Matrix.Rotation(k / major_segs * 2 * np.pi, 2).col[0][:]
+                    for k in range(major_segs)], dtype=np.float32)
+    verts = np.column_stack([rot[i] * rho[j, None],
+                             (np.sin(phi) * minor_r).astype(np.float32)[j]])
+    a = i * minor_segs + j
+    nxt_i = (i + 1) % major_segs * minor_segs
+    nxt_j = (j + 1) % minor_segs
+    faces = np.column_stack([a, nxt_i + j, nxt_i + nxt_j,
+                             i * minor_segs + nxt_j])
+    return verts, polys(faces)
+
+
+def euler_matrix(rot):
+    """3×3 matrix of an XYZ Euler rotation (Blender's default order)."""
+    (cx, cy, cz), (sx, sy, sz) = np.cos(rot), np.sin(rot)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+def transform(verts, loc=(0, 0, 0), rot=(0, 0, 0)):
+    """Rotate `verts` about the origin, then translate by `loc`."""
+    if any(rot):
+        verts = verts @ euler_matrix(np.asarray(rot, dtype=np.float64)).T
+    return verts + np.asarray(loc, dtype=np.float64)
+
+
+def mesh_object(name, verts, faces, loc=(0, 0, 0), rot=(0, 0, 0)):
+    """Link a mesh object built from `verts` (N, 3) and `faces`, either
+    (corners, sizes) from `polys()` or an (M, k) array, into the active
+    collection, placed at `loc` with XYZ Euler rotation `rot`."""
+    import bpy
+
+    corners, sizes = faces if isinstance(faces, tuple) else polys(faces)
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set(
+        "co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    mesh.loops.add(len(corners))
+    mesh.loops.foreach_set("vertex_index", corners.astype(np.int32))
+    mesh.polygons.add(len(sizes))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    mesh.polygons.foreach_set("loop_start", starts.astype(np.int32))
+    mesh.update(calc_edges=True)
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = loc
+    obj.rotation_euler = rot
+    bpy.context.collection.objects.link(obj)
+    return obj
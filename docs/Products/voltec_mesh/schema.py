@@ -0,0 +1,392 @@
+# ============================================================================
+# schema.py — Validate the .glb.toml sidecars against the instance format
+# The sidecars follow the EustressEngine instance format (see
+# V-Cell/EustressEngine_Requirements.md, "Instance File Structure"):
+# [asset], [transform], [properties] and [metadata] always, [material] and
+# [thermodynamic] on an AdvancedPart, [electrochemical] where it applies,
+# and the [physics] table massprops.py generates.
+# FIELDS lists every known key with its kind and SI range; compile_schema()
+# turns it into one check function per key once, at import, so checking a
+# sidecar is a dictionary walk. On top of the per-key checks:
+#   - [transform].rotation must be a unit quaternion (within QUAT_TOL)
+#   - [asset].mesh and every [asset].lods mesh must exist on disk
+#   - [asset].lods screen_size falls strictly from level to level
+#   - yield strength <= ultimate strength, kinetic <= static friction
+#   - [properties].class_name matches [metadata].class_name
+# and as warnings, for drift the engine tolerates:
+#   - a mesh or [properties].name that differs from the sidecar's name
+#     (VCell_Terminal_Positive.glb.toml -> VCell_TerminalPositive.glb)
+#   - a colour alpha that disagrees with 1 - transparency
+#
+# catalogue.py checks the sidecars before building and stops on errors
+# (--no-validate skips it); GLBs not built yet only warn there, and the
+# mesh paths are checked again once the build is done.
+#
+# Usage (from docs/Products; plain Python):
+#   python -m voltec_mesh.schema                  # every sidecar
+#   python -m voltec_mesh.schema V-Cell -q        # errors only
+# ============================================================================
+import argparse
+import datetime
+import math
+import os
+import sys
+import time
+
+from . import sidecar
+
+ERROR, WARNING = "error", "warning"
+QUAT_TOL  = 1e-3
+ALPHA_TOL = 0.01
+CLASSES   = {"Part": (), "AdvancedPart": ("material", "thermodynamic")}
+TABLES    = ("asset", "transform", "properties", "metadata")
+
+# table: {key: (kind, low, high, required)}; bounds are inclusive, in SI
+FIELDS = {
+    "asset": {
+        "mesh":  ("mesh", None, None, True),
+        "scene": ("str", None, None, False),
+        "lods":  ("lods", None, None, False),
+        "draco": ("draco", None, None, False),
+    },
+    "transform": {
+        "position": ("vec3", None, None, True),
+        "rotation": ("quat", None, None, True),
+        "scale":    ("vec3", 1e-9, None, True),
+    },
+    "properties": {
+        "name":         ("str", None, None, False),
+        "class_name":   ("class", None, None, False),
+        "color":        ("rgba", 0.0, 1.0, True),
+        "transparency": ("number", 0.0, 1.0, True),
+        "reflectance":  ("number", 0.0, 1.0, False),
+        "cast_shadow":  ("bool", None, None, False),
+        "can_collide":  ("bool", None, None, False),
+        "anchored":     ("bool", None, None, False),
+    },
+    "metadata": {
+        "class_name":    ("class", None, None, True),
+        "archivable":    ("bool", None, None, False),
+        "created":       ("datetime", None, None, True),
+        "last_modified": ("datetime", None, None, True),
+    },
+    "material": {
+        "name":                 ("str", None, None, True),
+        "young_modulus":        ("number", 1e5, 2e12, True),     # Pa
+        "poisson_ratio":        ("number", -1.0, 0.5, True),
+        "yield_strength":       ("number", 0.0, 1e10, True),     # Pa
+        "ultimate_strength":    ("number", 0.0, 1e10, True),     # Pa
+        "fracture_toughness":   ("number", 0.0, 1e9, True),      # Pa·√m
+        "hardness":             ("number", 0.0, 1e4, True),      # HV
+        "thermal_conductivity": ("number", 0.0, 5e3, True),      # W/(m·K)
+        "specific_heat":        ("number", 1.0, 3e4, True),      # J/(kg·K)
+        "thermal_expansion":    ("number", -1e-4, 1e-3, True),   # 1/K
+        "melting_point":        ("number", 1.0, 5e3, True),      # K
+        "density":              ("number", 1.0, 2.5e4, True),    # kg/m³
+        "friction_static":      ("number", 0.0, 2.0, True),
+        "friction_kinetic":     ("number", 0.0, 2.0, True),
+        "restitution":          ("number", 0.0, 1.0, True),
+        "custom":               ("table", None, None, False),
+    },
+    "thermodynamic": {
+        "temperature":     ("number", 1e-3, 1e4, True),          # K
+        "pressure":        ("number", 0.0, 1e9, True),           # Pa
+        "volume":          ("number", 1e-12, 1e4, True),         # m³
+        "internal_energy": ("number", None, None, False),        # J
+        "entropy":         ("number", None, None, False),        # J/K
+        "enthalpy":        ("number", None, None, False),        # J
+        "moles":           ("number", 0.0, None, False),         # mol
+    },
+    "electrochemical": {
+        "open_circuit_voltage": ("number", -6.0, 6.0, False),    # V
+        "capacity_ah":          ("number", 0.0, 1e6, False),     # Ah
+        "internal_resistance":  ("number", 0.0, 1e3, False),     # Ω
+        "coulombic_efficiency": ("number", 0.0, 1.0, False),
+        "state_of_charge":      ("number", 0.0, 1.0, False),
+        "cycle_count":          ("int", 0, None, False),
+    },
+    "physics": {  # generated by massprops.py
+        "volume":            ("number", 0.0, None, True),        # m³
+        "mass":              ("number", 0.0, None, False),       # kg
+        "center_of_mass":    ("vec3", None, None, True),         # m
+        "inertia":           ("mat3", None, None, False),        # kg·m²
+        "principal_moments": ("vec3", 0.0, None, False),         # kg·m²
+        "closed":            ("bool", None, None, True),
+    },
+}
+
+
+# --- Compiling -------------------------------------------------------------
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) \
+        and math.isfinite(value)
+
+
+def _range(low, high):
+    def check(value):
+        if low is not None and value < low:
+            return f"{value:g} is below {low:g}"
+        if high is not None and value > high:
+            return f"{value:g} is above {high:g}"
+        return None
+    return check
+
+
+def _vector(size, low, high):
+    in_range = _range(low, high)
+
+    def check(value):
+        if not (isinstance(value, list) and len(value) == size
+                and all(_is_number(v) for v in value)):
+            return f"expected {size} numbers"
+        return next(filter(None, map(in_range, value)), None)
+    return check
+
+
+def _matrix(size, low, high):
+    row = _vector(size, low, high)
+
+    def check(value):
+        if not (isinstance(value, list) and len(value) == size):
+            return f"expected {size} rows of {size} numbers"
+        return next(filter(None, map(row, value)), None)
+    return check
+
+
+_FOUR_NUMBERS = _vector(4, None, None)
+
+
+def _quaternion(value):
+    problem = _FOUR_NUMBERS(value)
+    if problem:
+        return problem
+    norm = math.sqrt(sum(v * v for v in value))
+    if abs(norm - 1.0) > QUAT_TOL:
+        return f"quaternion norm is {norm:.6g}, not 1"
+    return None
+
+
+def _datetime(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return None
+    try:
+        datetime.datetime.fromisoformat(str(value))
+    except ValueError:
+        return f"{value!r} is not an ISO 8601 date"
+    return None
+
+
+def _draco(value):
+    if not 0 <= value.get("level", 0) <= 10:
+        return f"Draco level {value['level']} is outside 0-10"
+    bits = [value[k] for k in ("position", "normal", "texcoord") if k in value]
+    if any(not 1 <= b <= 30 for b in bits):
+        return "quantization bits must be 1-30"
+    return None
+
+
+def _lods(value):
+    sizes = [lod["screen_size"] for lod in value if "screen_size" in lod]
+    if any(b >= a for a, b in zip(sizes, sizes[1:])):
+        return f"screen_size must fall strictly from level to level, got {sizes}"
+    return None
+
+
+def _typed(kind, test, then=None):
+    def check(value):
+        if not test(value):
+            return f"expected {kind}, got {type(value).__name__}"
+        return then(value) if then else None
+    return check
+
+
+def _kind_check(kind, low, high):
+    """Check function for one FIELDS kind; returns a message or None."""
+    if kind == "number":
+        return _typed("a number", _is_number, _range(low, high))
+    if kind == "int":
+        return _typed("an integer", lambda v: isinstance(v, int)
+                      and not isinstance(v, bool), _range(low, high))
+    if kind in ("str", "mesh"):
+        return _typed("a string", lambda v: isinstance(v, str) and v)
+    if kind == "bool":
+        return _typed("true or false", lambda v: isinstance(v, bool))
+    if kind == "class":
+        return _typed(f"one of {', '.join(CLASSES)}",
+                      lambda v: isinstance(v, str) and v in CLASSES)
+    if kind == "vec3":
+        return _vector(3, low, high)
+    if kind == "rgba":
+        return _vector(4, low, high)
+    if kind == "mat3":
+        return _matrix(3, low, high)
+    if kind == "quat":
+        return _quaternion
+    if kind == "datetime":
+        return _datetime
+    if kind == "table":
+        return _typed("a table", lambda v: isinstance(v, dict))
+    if kind == "lods":
+        return _typed("a list of tables", lambda v: isinstance(v, list)
+                      and all(isinstance(x, dict) and "mesh" in x
+                              for x in v), _lods)
+    if kind == "draco":
+        return _typed("a table of level and quantization bits",
+                      lambda v: isinstance(v, dict) and v.keys()
+                      <= {"level", "position", "normal", "texcoord"}
+                      and all(isinstance(x, int) and not isinstance(x, bool)
+                              for x in v.values()), _draco)
+    raise ValueError(f"unknown field kind {kind!r}")
+
+
+def compile_schema(fields):
+    """{table: ([(key, check)], required keys)} from a FIELDS mapping."""
+    return {table: ([(key, _kind_check(kind, low, high))
+                     for key, (kind, low, high, _) in keys.items()],
+                    [key for key, spec in keys.items() if spec[3]])
+            for table, keys in fields.items()}
+
+
+_COMPILED = compile_schema(FIELDS)
+
+
+# --- Checking --------------------------------------------------------------
+def _mesh_issues(path, data, missing=ERROR):
+    issues = []
+    asset = data.get("asset", {})
+    name = sidecar.name(path)
+    if isinstance(asset.get("mesh"), str):
+        if sidecar.mesh_file(path, data) is None:
+            issues.append((missing, "asset.mesh",
+                           f"{asset['mesh']} not found on disk"))
+        stem = os.path.splitext(os.path.basename(asset["mesh"]))[0]
+        if stem != name:
+            issues.append((WARNING, "asset.mesh",
+                           f"mesh {stem}.glb does not match the sidecar "
+                           f"name {name}"))
+    v1 = os.path.dirname(os.path.abspath(path))
+    glb = sidecar.mesh_file(path, data)
+    for lod in asset.get("lods", []) if isinstance(asset.get("lods"),
+                                                   list) else []:
+        mesh = lod.get("mesh", "") if isinstance(lod, dict) else ""
+        local = [os.path.join(v1, mesh)]
+        if glb:
+            local.append(os.path.join(os.path.dirname(glb),
+                                      os.path.basename(mesh)))
+        if not any(os.path.exists(p) for p in local):
+            issues.append((missing, "asset.lods",
+                           f"{mesh} not found on disk"))
+    return issues
+
+
+def _cross_issues(path, data):
+    issues = []
+    mat = data.get("material", {})
+    for low, high in (("yield_strength", "ultimate_strength"),
+                      ("friction_kinetic", "friction_static")):
+        if _is_number(mat.get(low)) and _is_number(mat.get(high)) \
+                and mat[low] > mat[high]:
+            issues.append((ERROR, f"material.{low}",
+                           f"{mat[low]:g} exceeds {high} {mat[high]:g}"))
+    props, meta = data.get("properties", {}), data.get("metadata", {})
+    if "class_name" in props and props["class_name"] != meta.get("class_name"):
+        issues.append((ERROR, "properties.class_name",
+                       f"{props['class_name']!r} differs from "
+                       f"metadata.class_name {meta.get('class_name')!r}"))
+    if "name" in props and props["name"] != sidecar.name(path):
+        issues.append((WARNING, "properties.name",
+                       f"{props['name']!r} differs from the sidecar name"))
+    color, transparency = props.get("color"), props.get("transparency")
+    if (isinstance(color, list) and len(color) == 4 and _is_number(color[3])
+            and _is_number(transparency)
+            and abs(color[3] - (1.0 - transparency)) > ALPHA_TOL):
+        issues.append((WARNING, "properties.color",
+                       f"alpha {color[3]:g} disagrees with transparency "
+                       f"{transparency:g}"))
+    return issues
+
+
+def validate(path, data=None, meshes=True):
+    """[(level, "table.key", message)] for the sidecar at `path`. With
+    `meshes` False a missing GLB is only a warning (before a build)."""
+    if data is None:
+        try:
+            data = sidecar.load(path)
+        except (OSError, ValueError) as exc:
+            return [(ERROR, "", f"cannot parse: {exc}")]
+    issues = []
+    cls = data.get("metadata", {}).get("class_name")
+    required = TABLES + CLASSES.get(cls, ())
+    for table in required:
+        if not isinstance(data.get(table), dict):
+            issues.append((ERROR, table, f"missing [{table}]"))
+    for table, (checks, needed) in _COMPILED.items():
+        values = data.get(table)
+        if not isinstance(values, dict):
+            continue
+        for key in needed:
+            if key not in values:
+                issues.append((ERROR, f"{table}.{key}", "missing"))
+        for key, check in checks:
+            if key in values:
+                problem = check(values[key])
+                if problem:
+                    issues.append((ERROR, f"{table}.{key}", problem))
+    return (issues + _mesh_issues(path, data, ERROR if meshes else WARNING)
+            + _cross_issues(path, data))
+
+
+def check(paths, meshes=True):
+    """{sidecar path: issues} for every path with at least one issue."""
+    out = {}
+    for path in paths:
+        issues = validate(path, meshes=meshes)
+        if issues:
+            out[path] = issues
+    return out
+
+
+def errors(results):
+    return sum(level == ERROR for issues in results.values()
+               for level, _, _ in issues)
+
+
+def report(results, quiet=False):
+    """Text of check() results, warnings left out when `quiet`."""
+    lines = []
+    for path, issues in results.items():
+        shown = [i for i in issues if not quiet or i[0] == ERROR]
+        for level, field, message in shown:
+            lines.append(f"{sidecar.name(path)}: {level}: "
+                         f"{field + ': ' if field else ''}{message}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.schema",
+        description="Validate the .glb.toml sidecars.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="print errors only")
+    args = parser.parse_args(argv)
+
+    paths = sidecar.discover(args.products)
+    if not paths:
+        parser.error("no sidecars found")
+    t0 = time.perf_counter()
+    results = check(paths)
+    seconds = time.perf_counter() - t0
+    text = report(results, args.quiet)
+    if text:
+        print(text)
+    n_err = errors(results)
+    n_warn = sum(len(i) for i in results.values()) - n_err
+    print(f"{len(paths)} sidecars checked in {seconds * 1000:.1f} ms: "
+          f"{n_err} errors, {n_warn} warnings")
+    return 1 if n_err else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+# ============================================================================
+# sidecar.py — Read and update the .glb.toml sidecars next to each product
+# Every component has <Product>/V1/<Component>.glb.toml describing the
+# engine asset: [asset] (mesh path, scene), [transform], [properties],
+# [metadata], [material] and the engineering tables. [asset].mesh is either
+# relative to V1 ("meshes/VCell_Housing.glb") or an engine asset path
+# ("assets/meshes/products/V-Incinerator/…glb"); mesh_file() maps both to
+# the GLB under V1/meshes.
+#
+# The files are hand-written and commented, so set_key() edits the text in
+# place: it replaces (or appends) one key of one table and leaves every
+# other line, comment and blank line untouched.
+# ============================================================================
+import glob
+import math
+import os
+import re
+import tomllib
+
+PRODUCTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIDECAR_GLOB = os.path.join("*", "V1", "*.glb.toml")
+
+_HEADER_RE = re.compile(r"^\s*\[\[?\s*([^\]]+?)\s*\]\]?\s*(#.*)?$")
+_KEY_RE    = r"^\s*{}\s*="
+
+
+def discover(products=()):
+    """Sidecar paths of the given product directories (default: all)."""
+    if products:
+        patterns = [os.path.join(os.path.abspath(p), "V1", "*.glb.toml")
+                    for p in products]
+    else:
+        patterns = [os.path.join(PRODUCTS_DIR, SIDECAR_GLOB)]
+    return sorted(p for pat in patterns for p in glob.glob(pat))
+
+
+def by_product(paths):
+    """{V1 directory: [sidecar paths]} in discovery order."""
+    out = {}
+    for path in paths:
+        out.setdefault(os.path.dirname(os.path.abspath(path)), []).append(path)
+    return out
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def name(path):
+    """Component name of a sidecar, e.g. "VCell_Housing"."""
+    return os.path.basename(path)[:-len(".glb.toml")]
+
+
+def mesh_file(path, data=None):
+    """Local GLB that [asset].mesh of sidecar `path` refers to, or None."""
+    data = load(path) if data is None else data
+    mesh = data.get("asset", {}).get("mesh")
+    if not mesh:
+        return None
+    v1 = os.path.dirname(os.path.abspath(path))
+    for candidate in (os.path.join(v1, mesh),
+                      os.path.join(v1, "meshes", os.path.basename(mesh))):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def sibling_mesh(data, filename):
+    """Mesh path for `filename` written the way [asset].mesh is, so a file
+    next to the GLB gets the same prefix ("meshes/…" or "assets/…")."""
+    mesh = data.get("asset", {}).get("mesh", "")
+    head = mesh.rsplit("/", 1)[0] if "/" in mesh else ""
+    return f"{head}/{filename}" if head else filename
+
+
+# --- Writing ---------------------------------------------------------------
+def format_value(value):
+    """TOML text of a str, bool, number, list or dict (as an inline table).
+    Lists of dicts are written one table per line."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            raise ValueError(f"cannot write {value} to a sidecar")
+        text = repr(value)
+        return text if any(c in text for c in ".en") else text + ".0"
+    if isinstance(value, str):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    if isinstance(value, dict):
+        return "{ " + ", ".join(f"{k} = {format_value(v)}"
+                                for k, v in value.items()) + " }"
+    if isinstance(value, (list, tuple)):
+        if value and all(isinstance(v, dict) for v in value):
+            return "[\n" + "".join(f"  {format_value(v)},\n"
+                                   for v in value) + "]"
+        return "[" + ", ".join(format_value(v) for v in value) + "]"
+    raise TypeError(f"cannot write {type(value).__name__} to a sidecar")
+
+
+def _table_span(lines, table):
+    """(start, end) line range of the body of [table]; end is exclusive and
+    excludes trailing blank lines. None if the table is missing."""
+    start = None
+    for i, line in enumerate(lines):
+        m = _HEADER_RE.match(line)
+        if not m:
+            continue
+        if start is not None:
+            end = i
+            break
+        if m.group(1) == table:
+            start = i + 1
+    else:
+        end = len(lines)
+    if start is None:
+        return None
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return start, end
+
+
+def _value_end(lines, i):
+    """Index past the last line of the value starting on line `i` (multi-
+    line arrays run until their brackets balance)."""
+    depth = 0
+    for j in range(i, len(lines)):
+        text = re.sub(r'"(\\.|[^"\\])*"', '""', lines[j]).split("#", 1)[0]
+        depth += text.count("[") + text.count("{")
+        depth -= text.count("]") + text.count("}")
+        if depth <= 0:
+            return j + 1
+    return len(lines)
+
+
+def set_key(text, table, key, value):
+    """`text` with `key` of [table] set to `value`; the table is appended
+    at the end if it does not exist. `value` None removes the key."""
+    lines = text.splitlines()
+    new = [] if value is None else f"{key} = {format_value(value)}" \
+        .splitlines()
+    span = _table_span(lines, table)
+    if span is None:
+        if value is None:
+            return text
+        while lines and not lines[-1].strip():
+            lines.pop()
+        lines += ["", f"[{table}]"] + new
+        return "\n".join(lines) + "\n"
+    start, end = span
+    key_re = re.compile(_KEY_RE.format(re.escape(key)))
+    for i in range(start, end):
+        if key_re.match(lines[i]):
+            lines[i:_value_end(lines, i)] = new
+            break
+    else:
+        lines[end:end] = new
+    return "\n".join(lines) + "\n"
+
+
+def update(path, table, key, value):
+    """Set one key in the sidecar at `path`; returns whether it changed."""
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    out = set_key(text, table, key, value)
+    if out == text:
+        return False
+    tomllib.loads(out)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(out)
+    return True
@@ -0,0 +1,257 @@
+# ============================================================================
+# stream.py — Coarse-first progressive delivery of a product's meshes
+# A product set such as V-Pump only appears after every component GLB has
+# been downloaded and decoded. write() lays the product out as one stream
+# file, <Prefix>_V1.stream, that a viewer reads front to back:
+#   - chunk 0, the proxy: every component at its coarsest LOD (lod.py)
+#   - one refinement chunk per finer level, holding only the components
+#     that have a mesh of that level; the last chunk carries the full
+#     LOD0 meshes
+# Every chunk is a self-contained GLB built like bundle.py builds the
+# product bundle: root nodes named after the sidecars, so a viewer renders
+# chunk 0 and then swaps each component's node when its refinement lands.
+# <Prefix>_V1.stream.json records each chunk's level, byte offset, length,
+# components and triangle count for HTTP range requests.
+#
+# measure() serves the output directory with RangeHandler (a local stand-in
+# for a range-capable CDN), fetches the chunks with Range headers, decodes
+# them and reports when each becomes renderable at BANDWIDTH, next to the
+# baseline of fetching and decoding every component GLB whole.
+#
+# Usage (from docs/Products; run lod first so the sidecars list LODs):
+#   python -m voltec_mesh.stream V-Pump               # write the stream
+#   python -m voltec_mesh.stream V-Pump --measure     # ... and time it
+# ============================================================================
+import argparse
+import functools
+import http.server
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.request
+
+from . import bundle, sidecar
+from .draco_bench import BANDWIDTH
+from .glb import Glb
+
+FULL = 0
+
+
+def stream_name(sidecars):
+    """<Prefix>_V1.stream for the sidecars of one product."""
+    return bundle.bundle_name(sidecars)[:-len(".glb")] + ".stream"
+
+
+def _levels(path, data):
+    """{level: (GLB path, mesh as written in the sidecar)} of one
+    component, LOD0 included; levels whose file is missing are left out."""
+    v1 = os.path.dirname(os.path.abspath(path))
+    glb = sidecar.mesh_file(path, data)
+    if glb is None:
+        return {}
+    out = {FULL: (glb, data["asset"]["mesh"])}
+    for lod in data["asset"].get("lods", []):
+        local = os.path.join(os.path.dirname(glb),
+                             os.path.basename(lod["mesh"]))
+        if not os.path.exists(local):
+            local = os.path.join(v1, lod["mesh"])
+        if os.path.exists(local):
+            out[lod["level"]] = (local, lod["mesh"])
+    return out
+
+
+def plan(sidecars):
+    """[(level, [(sidecar path, data, GLB, mesh), ...]), ...] coarse first:
+    each component joins the first chunk at its coarsest level and every
+    later chunk for which it has a finer mesh."""
+    comps = []
+    for path in sidecars:
+        data = sidecar.load(path)
+        levels = _levels(path, data)
+        if levels:
+            comps.append((path, data, levels))
+    if not comps:
+        return []
+    order = sorted({lv for _, _, levels in comps for lv in levels},
+                   reverse=True)
+    chunks = []
+    for i, level in enumerate(order):
+        members = []
+        for path, data, levels in comps:
+            if i == 0:
+                lv = max(levels)
+            elif level in levels and level < max(levels):
+                lv = level
+            else:
+                continue
+            members.append((path, data) + levels[lv])
+        if members:
+            chunks.append((level, members))
+    return chunks
+
+
+def write(sidecars, out_dir=None):
+    """Write the stream and its manifest for one product; returns the
+    manifest dict."""
+    v1 = os.path.dirname(os.path.abspath(sidecars[0]))
+    out_dir = out_dir or os.path.join(v1, "meshes")
+    name = stream_name(sidecars)
+    chunks, offset = [], 0
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, name), "wb") as f:
+        for level, members in plan(sidecars):
+            doc = bundle.merge(members, f"{name[:-len('.stream')]}_LOD{level}")
+            data = doc.to_bytes()
+            f.write(data)
+            triangles = sum(len(a["indices"]) for _, _, a in doc.primitives())
+            chunks.append({"level": level, "offset": offset,
+                           "length": len(data), "triangles": triangles,
+                           "components": [sidecar.name(m[0])
+                                          for m in members]})
+            offset += len(data)
+    manifest = {"stream": name, "bytes": offset, "chunks": chunks}
+    with open(os.path.join(out_dir, name + ".json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+# --- Measurement -----------------------------------------------------------
+class RangeHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler that honours single `Range: bytes=a-b` requests
+    with 206 Partial Content, as a CDN would."""
+
+    def log_message(self, *args):
+        pass
+
+    def send_head(self):
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)",
+                             self.headers.get("Range", ""))
+        path = self.translate_path(self.path)
+        if match is None or not os.path.isfile(path):
+            return super().send_head()
+        size = os.path.getsize(path)
+        start = int(match.group(1))
+        end = min(int(match.group(2) or size - 1), size - 1)
+        if start > end:
+            self.send_error(416)
+            return None
+        f = open(path, "rb")
+        f.seek(start)
+        self.send_response(206)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.end_headers()
+        self._remaining = end - start + 1
+        return f
+
+    def copyfile(self, source, outputfile):
+        remaining = getattr(self, "_remaining", None)
+        if remaining is None:
+            return super().copyfile(source, outputfile)
+        while remaining > 0:
+            block = source.read(min(remaining, 1 << 16))
+            if not block:
+                break
+            outputfile.write(block)
+            remaining -= len(block)
+
+
+def _decode(data):
+    """Seconds to parse a GLB and decode every primitive."""
+    t0 = time.perf_counter()
+    doc = Glb.from_bytes(data)
+    for _ in doc.primitives():
+        pass
+    return time.perf_counter() - t0
+
+
+def _fetch(url, start=None, length=None):
+    req = urllib.request.Request(url)
+    if start is not None:
+        req.add_header("Range", f"bytes={start}-{start + length - 1}")
+    with urllib.request.urlopen(req) as resp:
+        return resp.read()
+
+
+def measure(out_dir, manifest, parts):
+    """Serve `out_dir` locally and time the stream against fetching the
+    component GLBs in `parts` whole. Network time is simulated at
+    BANDWIDTH; decode time is measured. Returns (stream rows, baseline)."""
+    root = os.path.commonpath([out_dir] + [os.path.dirname(p) for p in parts])
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(RangeHandler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        url = base + os.path.relpath(os.path.join(out_dir, manifest["stream"]),
+                                     root).replace(os.sep, "/")
+        rows, received, clock = [], 0, 0.0
+        for chunk in manifest["chunks"]:
+            data = _fetch(url, chunk["offset"], chunk["length"])
+            if len(data) != chunk["length"]:
+                raise IOError(f"range request returned {len(data)} bytes, "
+                              f"expected {chunk['length']}")
+            received += len(data)
+            clock = max(clock, received / BANDWIDTH) + _decode(data)
+            rows.append(dict(chunk, ready_seconds=clock))
+        received, decode = 0, 0.0
+        for path in parts:
+            data = _fetch(base + os.path.relpath(path, root)
+                          .replace(os.sep, "/"))
+            received += len(data)
+            decode += _decode(data)
+        baseline = {"bytes": received,
+                    "ready_seconds": received / BANDWIDTH + decode}
+    finally:
+        server.shutdown()
+    return rows, baseline
+
+
+def table(name, rows, baseline):
+    lines = [f"{name}: {'chunk':>5} {'level':>5} {'KB':>8} {'tris':>7} "
+             f"{'ready s':>8}"]
+    pad = " " * (len(name) + 1)
+    for i, r in enumerate(rows):
+        lines.append(f"{pad} {i:5d} {r['level']:5d} {r['length']/1024:8.1f} "
+                     f"{r['triangles']:7d} {r['ready_seconds']:8.2f}")
+    lines.append(f"{pad} whole GLBs: {baseline['bytes']/1024:.1f} KB, ready "
+                 f"after {baseline['ready_seconds']:.2f} s at "
+                 f"{BANDWIDTH * 8 / 1e6:.0f} Mbit/s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.stream",
+        description="Write coarse-first streams of the product meshes.")
+    parser.add_argument("products", nargs="*",
+                        help="product directories (default: all)")
+    parser.add_argument("-o", "--out", default=None,
+                        help="directory for the streams (default: each "
+                             "product's V1/meshes)")
+    parser.add_argument("--measure", action="store_true",
+                        help="time the stream over a local range server")
+    args = parser.parse_args(argv)
+
+    by_product = sidecar.by_product(sidecar.discover(args.products))
+    if not by_product:
+        parser.error("no sidecars found")
+    for v1, paths in by_product.items():
+        out_dir = os.path.abspath(args.out or os.path.join(v1, "meshes"))
+        manifest = write(paths, out_dir)
+        print(f"{os.path.join(out_dir, manifest['stream'])}: "
+              f"{len(manifest['chunks'])} chunks, "
+              f"{manifest['bytes']/1024:.1f} KB")
+        if args.measure:
+            parts = [p for p in (sidecar.mesh_file(s) for s in paths) if p]
+            rows, baseline = measure(out_dir, manifest, parts)
+            print(table(manifest["stream"], rows, baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+# ============================================================================
+# thermal.py — Lumped thermal RC network of a stacked V-Cell module
+# How hot the middle of a long stack gets, and how close that is to the
+# sodium melting point, decides how many cells a module can hold at a given
+# C-rate. stack() reads each layer of a cell from the V-Cell sidecars
+# ([material].thermal_conductivity, specific_heat, density, melting_point)
+# and its thickness and face from the mesh scripts' constants (resolved
+# with cache.constants(), no Blender needed), following STACK:
+#   frame | pad, base, anode collector, anode, electrolyte, cathode,
+#           cathode collector, lid | × cells | pad | frame
+# Network makes one node per layer (capacitance ρ·cp·t·A) joined to the
+# next by the two half-thickness resistances t / (2·k·A) in series, and
+# assembles the conductance matrix as a scipy.sparse matrix. Cooling is a
+# conductance to COOLANT_T: H_SIDE over each housing's edge on the cold
+# plate (split between base and lid) and H_END over each end plate.
+#
+# Heat is I²R in the layers the current passes: each layer takes its
+# [electrochemical].internal_resistance share at the C-rate of the sidecar
+# capacity (packsim.cell()); short= adds the power of an internal short to
+# the electrolyte of the middle cell. simulate() steps backward Euler,
+#   (C/dt + G) T' = C/dt T + q + g·T_coolant
+# factorizing C/dt + G once (scipy.sparse.linalg.splu) and solving every
+# step and every scenario (one column each) with the same factors.
+#
+# Usage (from docs/Products; needs SciPy):
+#   python -m voltec_mesh.thermal                     # 100 cells at 1C
+#   python -m voltec_mesh.thermal 2000 -C 1 2 3 --short 0 20 --seconds 1800
+# ============================================================================
+import argparse
+import ast
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+from . import cache, packsim, sidecar
+
+SCRIPTS_DIR = os.path.join(packsim.CELL_PRODUCT, "V1", "meshes", "scripts")
+COOLANT_T = 298.15   # K
+H_SIDE    = 1000.0   # W/(m²·K), housing edge on a liquid cold plate
+H_END     = 10.0     # W/(m²·K), end plate in still air
+
+# (layer, sidecar, script, thickness constants summed, face constants)
+STACK = (
+    ("pad",         "VCell_ThermalPad_AlN", "VCell_ThermalPad", ("T",),
+     ("L", "W")),
+    ("base",        "VCell_Housing", "VCell_Housing", ("WALL",), ("L", "W")),
+    ("anode_cc",    "VCell_AlHexLattice", "VCell_Anode", ("AL_T",),
+     ("L", "W")),
+    ("anode",       "VCell_Anode_Na", "VCell_Anode", ("NA_T",), ("L", "W")),
+    ("electrolyte", "VCell_Electrolyte_ScNASICON", "VCell_Electrolyte",
+     ("T",), ("L", "W")),
+    ("cathode",     "VCell_Cathode_SulfurVACNT", "VCell_Cathode",
+     ("VACNT_T", "S_T"), ("L", "W")),
+    ("cathode_cc",  "VCell_AlHexLattice", "VCell_Cathode", ("AL_T",),
+     ("L", "W")),
+    ("lid",         "VCell_Housing", "VCell_Housing", ("WALL",), ("L", "W")),
+)
+FRAME = ("frame", "VCell_CompressionFrame", "VCell_CompressionFrame",
+         ("PLATE_T",), ("PLATE_L", "PLATE_W"))
+# housing edge on the cold plate: length × height of the housing
+COOLED = ("VCell_Housing", ("L", "H"), ("base", "lid"))
+
+
+def _constants(script):
+    with open(os.path.join(SCRIPTS_DIR, script + ".py"),
+              encoding="utf-8") as f:
+        return cache.constants(ast.parse(f.read()))
+
+
+def stack(product=packsim.CELL_PRODUCT):
+    """(cell layers, frame layer): dicts with name, sidecar, thickness, area,
+    conductivity, specific_heat, density, melting_point, temperature and
+    resistance, from the sidecars and scripts named in STACK; plus the
+    cold-plate area per cell under "cooled_area" on the cell list's layers
+    listed in COOLED."""
+    sidecars = {sidecar.name(p): sidecar.load(p)
+                for p in sidecar.discover([product])}
+    scripts = {}
+
+    def layer(name, component, script, thickness, face):
+        if component not in sidecars:
+            raise ValueError(f"no sidecar {component} for layer {name}")
+        if script not in scripts:
+            scripts[script] = _constants(script)
+        consts = scripts[script]
+        missing = [c for c in thickness + face if c not in consts]
+        if missing:
+            raise ValueError(f"{script}.py does not define "
+                             f"{', '.join(missing)}")
+        data = sidecars[component]
+        mat = data.get("material", {})
+        return {
+            "name": name, "sidecar": component,
+            "thickness": sum(consts[c] for c in thickness),
+            "area": consts[face[0]] * consts[face[1]],
+            "conductivity": mat["thermal_conductivity"],
+            "specific_heat": mat["specific_heat"],
+            "density": mat["density"],
+            "melting_point": mat.get("melting_point", np.inf),
+            "temperature": data.get("thermodynamic", {}).get("temperature"),
+            "resistance": data.get("electrochemical", {})
+                              .get("internal_resistance", 0.0),
+        }
+
+    layers = [layer(*spec) for spec in STACK]
+    component, face, cooled = COOLED
+    consts = _constants(next(s[2] for s in STACK if s[1] == component))
+    for lay in layers:
+        lay["cooled_area"] = consts[face[0]] * consts[face[1]] / len(cooled) \
+            if lay["name"] in cooled else 0.0
+    frame = layer(*FRAME)
+    frame["cooled_area"] = 0.0
+    return layers, frame
+
+
+class Network:
+    """Nodes, capacitances and sparse conductance matrix of a `cells`-cell
+    stack; see the module header. Node 0 and the last node are the end
+    plates; cell c's layer l is node 1 + c·L + l."""
+
+    def __init__(self, layers, frame, cells, h_side=H_SIDE, h_end=H_END,
+                 coolant=COOLANT_T):
+        from scipy import sparse
+
+        self.layers, self.frame, self.cells = layers, frame, cells
+        self.coolant = coolant
+        chain = [frame] + layers * cells + [layers[0], frame]
+        self.size = len(chain)
+        t = np.array([n["thickness"] for n in chain])
+        area = np.array([n["area"] for n in chain])
+        k = np.array([n["conductivity"] for n in chain])
+        self.capacitance = np.array(
+            [n["density"] * n["specific_heat"] for n in chain]) * t * area
+        self.melting = np.array([n["melting_point"] for n in chain])
+        half = t / (2.0 * k * area)
+        link = 1.0 / (half[:-1] + half[1:])
+        self.boundary = h_side * np.array([n["cooled_area"] for n in chain])
+        self.boundary[[0, -1]] += h_end * area[[0, -1]]
+        i = np.arange(self.size - 1)
+        diag = np.zeros(self.size)
+        np.add.at(diag, i, link)
+        np.add.at(diag, i + 1, link)
+        diag += self.boundary
+        self.conductance = sparse.csc_matrix(
+            (np.concatenate([diag, -link, -link]),
+             (np.concatenate([np.arange(self.size), i, i + 1]),
+              np.concatenate([np.arange(self.size), i + 1, i]))),
+            shape=(self.size, self.size))
+        self.initial = np.array([coolant if n["temperature"] is None
+                                 else n["temperature"] for n in chain])
+
+    def cell_nodes(self):
+        """(cells, layers) node indices of the cell layers."""
+        return 1 + np.arange(self.cells * len(self.layers)) \
+            .reshape(self.cells, len(self.layers))
+
+    def heat(self, current, short=0.0):
+        """(nodes,) heat in W at pack current `current` through every cell,
+        plus `short` W in the middle cell's electrolyte."""
+        q = np.zeros(self.size)
+        per_cell = current ** 2 * np.array([l["resistance"]
+                                            for l in self.layers])
+        q[self.cell_nodes()] = per_cell
+        if short:
+            middle = self.cell_nodes()[self.cells // 2]
+            q[middle[[l["name"] for l in self.layers].index("electrolyte")]] \
+                += short
+        return q
+
+    def steady(self, q):
+        """Steady-state temperatures for heat `q` ((nodes,) or (nodes, k))."""
+        from scipy.sparse.linalg import splu
+
+        rhs = q + (self.boundary * self.coolant).reshape(
+            (-1,) + (1,) * (q.ndim - 1))
+        return splu(self.conductance).solve(rhs)
+
+
+def simulate(net, q, seconds, dt=1.0):
+    """Backward-Euler transient from net.initial under heat `q` (nodes, k);
+    returns {"final", "peak"} temperatures (nodes, k) and "melt" (k,), the
+    first time a node reached its melting point (NaN if none did)."""
+    from scipy.sparse import diags
+    from scipy.sparse.linalg import splu
+
+    c = (net.capacitance / dt)[:, None]
+    lu = splu((diags(net.capacitance / dt) + net.conductance).tocsc())
+    source = q + (net.boundary * net.coolant)[:, None]
+    temps = np.repeat(net.initial[:, None], q.shape[1], axis=1)
+    peak = temps.copy()
+    melt = np.full(q.shape[1], np.nan)
+    for n in range(int(round(seconds / dt))):
+        temps = lu.solve(c * temps + source)
+        np.maximum(peak, temps, out=peak)
+        hit = np.isnan(melt) & (temps >= net.melting[:, None]).any(axis=0)
+        melt[hit] = (n + 1) * dt
+    return {"final": temps, "peak": peak, "melt": melt}
+
+
+def margins(net, temps):
+    """(margin K, layer name, cell) of the node closest to its melting point
+    in each column of `temps`; negative once melted."""
+    nodes = net.cell_nodes()
+    gap = (net.melting[:, None] - temps)[nodes]          # (cells, layers, k)
+    flat = gap.reshape(-1, gap.shape[2])
+    where = flat.argmin(axis=0)
+    cells, layers = np.unravel_index(where, nodes.shape)
+    return [(float(flat[w, j]), net.layers[l]["name"], int(c))
+            for j, (w, c, l) in enumerate(zip(where, cells, layers))]
+
+
+def write_csv(path, net, result, scenarios):
+    """Final and peak temperature of every cell layer in every scenario."""
+    nodes = net.cell_nodes()
+    with open(path, "w") as f:
+        f.write("c_rate,short_w,cell,layer,final_k,peak_k\n")
+        for j, (c_rate, short) in enumerate(scenarios):
+            for cell, row in enumerate(nodes):
+                for lay, node in zip(net.layers, row):
+                    f.write(f"{c_rate:g},{short:g},{cell},{lay['name']},"
+                            f"{result['final'][node, j]:.3f},"
+                            f"{result['peak'][node, j]:.3f}\n")
+
+
+def table(net, result, steady, scenarios):
+    nodes = net.cell_nodes()
+    names = [l["name"] for l in net.layers]
+    lines = [f"{'C':>4} {'short W':>7}  " + " ".join(f"{n[:11]:>11}"
+                                                    for n in names)
+             + f"  {'margin':>22} {'melts at':>9} {'steady':>8}"]
+    for j, (c_rate, short) in enumerate(scenarios):
+        peak = result["peak"][nodes, j].max(axis=0)
+        margin, layer, cell = margins(net, result["peak"][:, [j]])[0]
+        melt = result["melt"][j]
+        lines.append(
+            f"{c_rate:4g} {short:7g}  " + " ".join(f"{t:11.2f}" for t in peak)
+            + f"  {margin:7.1f} K {layer:>8}@{cell:<4d} "
+            + (f"{melt:8.0f}s" if np.isfinite(melt) else f"{'-':>9}")
+            + f" {steady[nodes, j].max():8.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m voltec_mesh.thermal",
+        description="Simulate the layer temperatures of a V-Cell stack.")
+    parser.add_argument("cells", nargs="?", type=int, default=100,
+                        help="cells in the stack (default: %(default)s)")
+    parser.add_argument("-C", "--c-rate", type=float, nargs="+",
+                        default=[1.0], help="C-rates to sweep")
+    parser.add_argument("--short", type=float, nargs="+", default=[0.0],
+                        help="internal-short power (W) in the middle cell")
+    parser.add_argument("--seconds", type=float, default=3600.0,
+                        help="simulated time")
+    parser.add_argument("--dt", type=float, default=1.0,
+                        help="time step in seconds")
+    parser.add_argument("--h-side", type=float, default=H_SIDE,
+                        help="cold-plate coefficient, W/(m²·K)")
+    parser.add_argument("--h-end", type=float, default=H_END,
+                        help="end-plate coefficient, W/(m²·K)")
+    parser.add_argument("--coolant", type=float, default=COOLANT_T,
+                        help="coolant temperature, K")
+    parser.add_argument("--csv", default=None,
+                        help="write every cell's layer temperatures here")
+    args = parser.parse_args(argv)
+
+    if args.cells < 1 or args.dt <= 0 or args.seconds <= 0:
+        parser.error("cells, --dt and --seconds must be positive")
+    try:
+        layers, frame = stack()
+        capacity = packsim.cell()["capacity_ah"]
+    except (ValueError, KeyError) as exc:
+        parser.error(str(exc))
+    t0 = time.perf_counter()
+    net = Network(layers, frame, args.cells, args.h_side, args.h_end,
+                  args.coolant)
+    scenarios = list(itertools.product(args.c_rate, args.short))
+    q = np.stack([net.heat(c * capacity, s) for c, s in scenarios], axis=1)
+    steady = net.steady(q)
+    result = simulate(net, q, args.seconds, args.dt)
+    seconds = time.perf_counter() - t0
+    print(f"peak layer temperature (K) over {args.seconds:g} s, "
+          f"{args.cells} cells, coolant {args.coolant:g} K")
+    print(table(net, result, steady, scenarios))
+    print(f"{net.size} nodes × {len(scenarios)} scenarios, "
+          f"{int(round(args.seconds / args.dt))} steps in {seconds:.2f} s")
+    if args.csv:
+        write_csv(args.csv, net, result, scenarios)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
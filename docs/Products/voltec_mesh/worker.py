@@ -0,0 +1,185 @@
+# ============================================================================
+# worker.py — Long-lived headless Blender workers for the catalogue build
+# A worker is one `blender --background` process running this file. It reads
+# one JSON job per line on stdin ({"script": path}), runs the script as
+# __main__ in the warm interpreter, and answers with a single line prefixed
+# by PREFIX on stdout. Everything else the script prints lands on stdout
+# between the request and the answer and becomes that job's log.
+#
+# Between jobs the worker only clears the instrument records; the scene is
+# reset by the script's own clean_scene() (read_factory_settings with
+# use_empty=True), and already-imported modules (voltec_mesh, numpy, the glTF
+# exporter) stay loaded. After MAX_JOBS jobs the worker retires and exits;
+# `Worker` starts a fresh process on its next job, which caps memory growth.
+#
+# The parent side (`Worker`) runs under plain Python; see catalogue.py
+# --warm.
+# ============================================================================
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+PREFIX   = "@@voltec-worker "
+MAX_JOBS = 8
+WORKER_SCRIPT = os.path.abspath(__file__)
+PRODUCTS_DIR  = os.path.dirname(os.path.dirname(WORKER_SCRIPT))
+
+
+# --- Blender side ----------------------------------------------------------
+def _send(**msg):
+    sys.stdout.flush()
+    sys.stdout.write(PREFIX + json.dumps(msg) + "\n")
+    sys.stdout.flush()
+
+
+def _run_job(job):
+    """Run one script as __main__; the error text, or None on success."""
+    import runpy
+    try:
+        runpy.run_path(job["script"], run_name="__main__")
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            return f"SystemExit({exc.code!r})"
+    except Exception:
+        text = traceback.format_exc()
+        print(text, file=sys.stderr)
+        return text
+    return None
+
+
+def serve(max_jobs=MAX_JOBS):
+    """Job loop run inside Blender: one JSON request per stdin line, one
+    PREFIX answer per job, exit after `max_jobs` jobs or on EOF."""
+    from voltec_mesh import instrument
+
+    _send(event="ready", pid=os.getpid())
+    done = 0
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        instrument.reset()
+        path = list(sys.path)
+        t0 = time.perf_counter()
+        error = _run_job(job)
+        seconds = time.perf_counter() - t0
+        sys.path[:] = path
+        sys.stderr.flush()
+        done += 1
+        retire = done >= max_jobs
+        _send(event="done", seconds=seconds, error=error, jobs=done,
+              retire=retire)
+        if retire:
+            break
+
+
+def _blender_args():
+    argv = sys.argv
+    return argv[argv.index("--") + 1:] if "--" in argv else []
+
+
+# --- Parent side -----------------------------------------------------------
+class WorkerError(RuntimeError):
+    pass
+
+
+class Worker:
+    """One warm Blender process, started on first use and restarted after it
+    retires, crashes or times out. `run()` is not thread-safe; give each
+    build thread its own Worker."""
+
+    def __init__(self, blender, env=None, threads=0, max_jobs=MAX_JOBS):
+        self.blender = blender
+        self.env = env
+        self.threads = threads
+        self.max_jobs = max_jobs
+        self.proc = None
+        self.lines = None
+        self.starts = 0
+
+    def _reader(self, proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def start(self, timeout=120):
+        cmd = [self.blender, "--background", "--factory-startup"]
+        if self.threads:
+            cmd += ["--threads", str(self.threads)]
+        cmd += ["--python", WORKER_SCRIPT, "--",
+                "--max-jobs", str(self.max_jobs)]
+        self.proc = subprocess.Popen(
+            cmd, env=self.env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, text=True, errors="replace", bufsize=1)
+        self.lines = queue.Queue()
+        threading.Thread(target=self._reader, args=(self.proc, self.lines),
+                         daemon=True).start()
+        self.starts += 1
+        startup = []
+        msg = self._answer(startup, time.perf_counter() + timeout)
+        if msg is None or msg.get("event") != "ready":
+            self.stop()
+            raise WorkerError("Blender worker did not start:\n"
+                              + "".join(startup[-20:]))
+
+    def _answer(self, log, deadline):
+        """Collect output lines into `log` up to the next PREFIX answer.
+        None on EOF or once `deadline` (perf_counter, None: never) passes."""
+        while True:
+            wait = None if deadline is None else \
+                max(0.0, deadline - time.perf_counter())
+            try:
+                line = self.lines.get(timeout=wait)
+            except queue.Empty:
+                return None
+            if line is None:
+                return None
+            if line.startswith(PREFIX):
+                return json.loads(line[len(PREFIX):])
+            log.append(line)
+
+    def run(self, script, timeout=None):
+        """Build `script` and return (answer dict, output text). A crashed or
+        timed-out worker is killed and the answer carries the error."""
+        if self.proc is None or self.proc.poll() is not None:
+            self.start()
+        log = []
+        self.proc.stdin.write(json.dumps({"script": script}) + "\n")
+        self.proc.stdin.flush()
+        msg = self._answer(log, None if timeout is None
+                           else time.perf_counter() + timeout)
+        if msg is None:
+            timed_out = self.proc.poll() is None
+            if timed_out:
+                self.proc.kill()
+            self.stop()
+            msg = {"event": "done", "retire": True, "error":
+                   "timed out" if timed_out else "worker exited"}
+        elif msg.get("retire"):
+            self.stop()
+        return msg, "".join(log)
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    sys.path.insert(0, PRODUCTS_DIR)
+    parser = argparse.ArgumentParser(prog="worker.py")
+    parser.add_argument("--max-jobs", type=int, default=MAX_JOBS)
+    serve(parser.parse_args(_blender_args()).max_jobs)